@@ -0,0 +1,157 @@
+"""
+Mixed order workload on the configured backend (user-048): run it once on the default
+SQLite file and once with BENCH_DATABASE_URL pointing at PostgreSQL to compare them.
+
+--threads worker threads pick operations in the proportions of a busy lunch hour (mostly
+board views, some placements and claims) and do the database work of the matching
+handler; one more thread drains the outbox every 100 ms with a fake bot. Claims pick
+random open orders, so some lose to a concurrent claim; those must fail cleanly.
+
+Usage:
+    python -m benchmarks.backends [--seconds 10] [--threads 4]
+"""
+import sys
+import time
+import random
+import asyncio
+import argparse
+import threading
+import statistics
+from collections import defaultdict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
+
+from benchmarks.common import reset_tables, seed_orders, backend, MEALS, LOCATIONS
+from models.database import session_scope, SGT
+from models.order_model import Order, OrderEvent
+from models.order_queries import open_orders, claimable_order
+from models.order_status import OPEN, CLAIMED
+from models.outbox import enqueue_channel_post, enqueue_channel_edit
+from models.stats import record_order_placed, record_order_claimed
+from tasks import drain_outbox
+from views.order_view import format_order_listing, format_order_message
+
+WORKLOAD = [("board", 0.7), ("place", 0.15), ("claim", 0.15)]
+
+class FakeBot:
+    def __init__(self):
+        self.message_ids = iter(range(1, 10 ** 9))
+
+    async def send_message(self, chat_id, text, parse_mode=None, reply_markup=None):
+        return SimpleNamespace(message_id=next(self.message_ids))
+
+    async def edit_message_text(self, *args, **kwargs):
+        return True
+
+def board(rng, user_id):
+    with session_scope(user_id=user_id) as session:
+        return [format_order_listing(order) for order in open_orders(session)[:30]]
+
+def place(rng, user_id):
+    now = datetime.now(SGT)
+    earliest = now + timedelta(minutes=rng.randint(30, 240))
+    with session_scope(user_id=user_id) as session:
+        order = Order(
+            order_text=rng.choice(MEALS), location=rng.choice(LOCATIONS),
+            earliest_pickup_time=earliest, latest_pickup_time=earliest + timedelta(minutes=30),
+            details="", delivery_fee="2", user_id=user_id, order_placed_time=now
+        )
+        session.add(order)
+        session.flush()
+        session.add(OrderEvent.for_order(order, None, actor_id=user_id, at=now))
+        record_order_placed(session, order)
+        enqueue_channel_post(session, order, format_order_message(order, "Claim Status: available"))
+        session.commit()
+
+def claim(rng, user_id):
+    """Returns False if the order was claimed by someone else first."""
+    with session_scope(user_id=user_id) as session:
+        candidates = session.execute(
+            select(Order.id).where(Order.has_status(OPEN)).order_by(Order.id.desc()).limit(20)
+        ).scalars().all()
+        if not candidates:
+            return True
+        order = claimable_order(session, rng.choice(candidates))
+        if order is None:
+            return False
+        order.runner_id = user_id
+        order.order_claimed_time = datetime.now(SGT)
+        order.transition_to(CLAIMED, actor_id=user_id, at=order.order_claimed_time)
+        record_order_claimed(session, order)
+        enqueue_channel_edit(session, order, format_order_message(order, "Claim Status: claimed"))
+        try:
+            session.commit()
+        except StaleDataError:
+            session.rollback()
+            return False
+        return True
+
+OPERATIONS = {"board": board, "place": place, "claim": claim}
+
+def worker(seed, deadline, latencies, outcomes, errors):
+    rng = random.Random(seed)
+    names, weights = zip(*WORKLOAD)
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            result = OPERATIONS[name](rng, rng.randint(1, 2000))
+        except Exception as e:
+            errors[type(e).__name__] += 1
+            continue
+        latencies[name].append((time.perf_counter() - start) * 1000)
+        if name == "claim" and result is False:
+            outcomes["claims lost to a concurrent claim"] += 1
+
+def drainer(deadline, latencies, errors):
+    bot = FakeBot()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            asyncio.run(drain_outbox.drain_outbox(bot))
+        except Exception as e:
+            errors[type(e).__name__] += 1
+        latencies["drain"].append((time.perf_counter() - start) * 1000)
+        time.sleep(0.1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--open-orders", type=int, default=200)
+    args = parser.parse_args()
+
+    reset_tables()
+    seed_orders(args.open_orders, history_count=args.open_orders * 20)
+    # The channel budget would defer almost every post; it is not what is measured here.
+    drain_outbox.channel_budget.allow = lambda key: True
+    print(f"backend={backend()} threads={args.threads} seconds={args.seconds}", file=sys.stderr)
+
+    latencies, outcomes, errors = defaultdict(list), defaultdict(int), defaultdict(int)
+    deadline = time.perf_counter() + args.seconds
+    threads = [threading.Thread(target=worker, args=(seed, deadline, latencies, outcomes, errors)) for seed in range(args.threads)]
+    threads.append(threading.Thread(target=drainer, args=(deadline, latencies, errors)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = sum(len(latencies[name]) for name in OPERATIONS)
+    print(f"{total / args.seconds:8.1f} operations/s")
+    for name, samples in latencies.items():
+        samples.sort()
+        p95 = samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+        print(f"{name:<6} {len(samples):6d} ops  median {statistics.median(samples):7.1f} ms  p95 {p95:7.1f} ms")
+    for name, count in {**outcomes, **errors}.items():
+        print(f"{name}: {count}")
+
+    with session_scope() as session:
+        # Every claim event must belong to exactly one claim of its order.
+        rows = session.query(OrderEvent.order_id).filter(OrderEvent.to_status == CLAIMED).all()
+        assert len(rows) == len({order_id for order_id, in rows}), "an order was claimed twice"
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Outbound Bot API send throughput with PTB's default requests versus build_send_request() (user-042).
+
+The bot talks to a fake Bot API server on localhost that answers every method after
+--latency-ms, standing in for the round trip to api.telegram.org. Messages are sent
+concurrently, the way a burst of order notifications is, so throughput is bounded by
+how many requests the connection pool lets through at once.
+
+Usage:
+    python -m benchmarks.bot_sends [--messages 500] [--latency-ms 20]
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+from telegram import Bot
+from telegram.request import HTTPXRequest
+
+from utils.bot_requests import build_send_request, BOT_CONNECTION_POOL_SIZE
+
+TOKEN = "123:bench"
+MESSAGE = {"message_id": 1, "date": 0, "chat": {"id": 1, "type": "private"}, "text": "ok"}
+ME = {"id": 123, "is_bot": True, "first_name": "bench", "username": "bench_bot"}
+
+async def serve_bot_api(reader, writer, latency: float):
+    # Minimal HTTP/1.1 with keep-alive; enough for httpx and the two methods used here.
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            headers = dict(line.split(": ", 1) for line in header_lines if ": " in line)
+            length = int(headers.get("Content-Length", headers.get("content-length", 0)))
+            if length:
+                await reader.readexactly(length)
+            await asyncio.sleep(latency)
+            result = ME if request_line.split()[1].endswith("/getMe") else MESSAGE
+            body = json.dumps({"ok": True, "result": result}).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+async def send_burst(request, base_url: str, messages: int) -> float:
+    """Sends `messages` messages at once and returns the time taken in seconds."""
+    bot = Bot(TOKEN, base_url=base_url, request=request)
+    async with bot:
+        start = time.perf_counter()
+        await asyncio.gather(*(bot.send_message(chat_id=1, text=f"order {i}") for i in range(messages)))
+        return time.perf_counter() - start
+
+async def run(args):
+    server = await asyncio.start_server(
+        lambda reader, writer: serve_bot_api(reader, writer, args.latency_ms / 1000), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}/bot"
+    print(f"messages={args.messages} latency={args.latency_ms} ms", file=sys.stderr)
+    variants = (
+        # The scheduler's own Bot(token=TOKEN) before user-042: one connection. Its default
+        # 1 s pool timeout would fail most of the burst, so it is lifted to measure throughput.
+        ("Bot() (pool 1)", lambda: HTTPXRequest(pool_timeout=None)),
+        # What ApplicationBuilder gives the application's bot by default.
+        ("builder (pool 256)", lambda: HTTPXRequest(connection_pool_size=256)),
+        (f"send pool ({BOT_CONNECTION_POOL_SIZE})", build_send_request),
+    )
+    async with server:
+        for name, make_request in variants:
+            elapsed = await send_burst(make_request(), base_url, args.messages)
+            print(f"{name:<18} {elapsed:6.2f} s  {args.messages / elapsed:7.1f} messages/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Shared setup for the scripts in benchmarks/. Import it before anything from models:
+the engine is built at import time, and benchmarks must never run against the
+DATABASE_URL of a deployment. BENCH_DATABASE_URL picks the database to run against;
+by default each run gets a fresh SQLite file.
+"""
+import os
+import time
+import random
+import statistics
+import tempfile
+from datetime import datetime, timedelta
+
+if not os.getenv("BENCH_DATABASE_URL"):
+    # Set in the environment so that worker processes use the same file.
+    os.environ["BENCH_DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+os.environ.pop("REPLICA_DATABASE_URL", None)
+
+from sqlalchemy import insert
+
+from models.database import Base, engine, session_scope, SGT, create_tables
+from models.order_model import Order
+from models.order_status import OPEN, CLAIMED, COMPLETED, EXPIRED
+import models.order_search  # noqa: F401  (registers the search index DDL)
+
+MEALS = ["chicken rice", "nasi lemak", "kaya toast", "laksa", "mee goreng", "bubble tea", "fish soup", "prata"]
+DETAILS = ["no spicy", "extra chilli", "less ice", "no egg", "add cheese", "sauce on the side", "", "large"]
+LOCATIONS = ["SCIS", "SOE", "LKCSB", "SOA", "SOSS", "YPHSL", "Li Ka Shing Library", "Connexion"]
+
+def reset_tables():
+    Base.metadata.drop_all(bind=engine)
+    create_tables()
+
+def seed_orders(open_count: int, history_count: int = 0, seed: int = 1):
+    """Inserts `open_count` open orders over the next two days plus `history_count` finished ones."""
+    rng = random.Random(seed)
+    now = datetime.now(SGT)
+    rows = []
+    for i in range(open_count + history_count):
+        is_open = i < open_count
+        earliest = now + timedelta(minutes=rng.randint(5, 2 * 24 * 60)) if is_open else now - timedelta(days=rng.randint(1, 365))
+        rows.append(dict(
+            order_text=f"{rng.choice(MEALS)} x{rng.randint(1, 3)}",
+            location=rng.choice(LOCATIONS),
+            earliest_pickup_time=earliest,
+            latest_pickup_time=earliest + timedelta(minutes=rng.choice([15, 30, 60, 120])),
+            details=rng.choice(DETAILS),
+            delivery_fee=str(rng.randint(1, 5)),
+            status=OPEN if is_open else rng.choice([COMPLETED, EXPIRED]),
+            user_id=rng.randint(1, 2000),
+            runner_id=None if is_open else rng.randint(2001, 2500),
+            completed=False,
+            order_placed_time=earliest - timedelta(hours=1),
+        ))
+    with session_scope() as session:
+        for start in range(0, len(rows), 5000):
+            session.execute(insert(Order), rows[start:start + 5000])
+
+def measure(fn, repeat: int, warmup: int = 3):
+    """Runs `fn` and returns (median, p95) wall time in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+
+def backend() -> str:
+    return engine.dialect.name
@@ -0,0 +1,73 @@
+"""
+Throughput of the update-handling path with 1..N worker processes (user-038).
+
+Updates for synthetic users are partitioned with fleet.worker_for, exactly as the
+ingress does, and each worker process runs its share through the same work a
+/vieworders or /myorders update does: a session scope, the listing query and the
+MarkdownV2 formatting. Telegram itself is not involved, so this measures how far the
+CPU-bound part scales with cores; it cannot scale beyond the cores of the host.
+
+Usage:
+    python -m benchmarks.fleet_scaling [--updates 1000] [--workers 1,2,4]
+"""
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from types import SimpleNamespace
+
+from benchmarks.common import reset_tables, seed_orders, backend
+
+def _handle_updates(user_ids, ready, go):
+    from models.database import session_scope
+    from models.order_queries import open_orders, orders_placed_by
+    from views.order_view import format_order_listing
+
+    ready.wait()
+    go.wait()
+    for user_id in user_ids:
+        with session_scope(user_id=user_id) as session:
+            if user_id % 2:
+                text = "\n".join(format_order_listing(order) for order in open_orders(session)[:30])
+            else:
+                text = "\n".join(f"{order.id} {order.order_text}" for order in orders_placed_by(session, user_id))
+
+def run(worker_count: int, updates: int) -> float:
+    from fleet import worker_for
+    shares = [[] for _ in range(worker_count)]
+    for user_id in range(1, updates + 1):
+        update = SimpleNamespace(effective_user=SimpleNamespace(id=user_id))
+        shares[worker_for(update, worker_count)].append(user_id)
+
+    context = multiprocessing.get_context("spawn")
+    ready = context.Barrier(worker_count + 1)
+    go = context.Barrier(worker_count + 1)
+    workers = [context.Process(target=_handle_updates, args=(share, ready, go)) for share in shares]
+    for worker in workers:
+        worker.start()
+    ready.wait()  # every worker has imported the app and connected
+    start = time.perf_counter()
+    go.wait()
+    for worker in workers:
+        worker.join()
+    return updates / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--open-orders", type=int, default=200)
+    args = parser.parse_args()
+
+    reset_tables()
+    seed_orders(args.open_orders, history_count=args.open_orders * 5)
+    print(f"backend={backend()} cores={os.cpu_count()} updates={args.updates}", file=sys.stderr)
+    baseline = None
+    for worker_count in (int(count) for count in args.workers.split(",")):
+        throughput = run(worker_count, args.updates)
+        baseline = baseline or throughput
+        print(f"workers={worker_count}  {throughput:8.0f} updates/s  x{throughput / baseline:.2f}")
+
+if __name__ == '__main__':
+    main()
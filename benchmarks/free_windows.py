@@ -0,0 +1,58 @@
+"""
+/free lookups with OpenOrderIndex.overlapping versus a scan of every indexed order (user-049).
+
+The index is loaded from the database like the bot does; each query asks for the orders
+overlapping a random one-hour window in the next two days. Both variants are checked to
+return the same orders.
+
+Usage:
+    python -m benchmarks.free_windows [--open-orders 5000]
+"""
+import sys
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from benchmarks.common import reset_tables, seed_orders, measure, backend
+from models.database import session_scope, SGT
+from utils.open_order_index import OpenOrderIndex
+
+def scan(index, start, end):
+    now = datetime.now(SGT)
+    return [
+        order for order in index._orders
+        if order.earliest_pickup_time <= end and order.latest_pickup_time >= start and order.latest_pickup_time > now
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--open-orders", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    reset_tables()
+    seed_orders(args.open_orders)
+    print(f"backend={backend()} open_orders={args.open_orders} queries={args.queries}", file=sys.stderr)
+
+    index = OpenOrderIndex(ttl_seconds=3600)
+    with session_scope() as session:
+        index.load(session)
+    rng = random.Random(1)
+    now = datetime.now(SGT)
+    windows = []
+    for _ in range(args.queries):
+        start = now + timedelta(minutes=rng.randint(0, 48 * 60))
+        windows.append((start, start + timedelta(hours=1)))
+    for start, end in windows[:50]:
+        assert index.overlapping(None, start, end) == scan(index, start, end)
+
+    for name, lookup in (("scan", lambda start, end: scan(index, start, end)),
+                         ("overlapping", lambda start, end: index.overlapping(None, start, end))):
+        def run():
+            for start, end in windows:
+                lookup(start, end)
+        median, p95 = measure(run, repeat=10, warmup=1)
+        print(f"{name:<12} {median * 1000 / args.queries:7.1f} us per query  p95 {p95 * 1000 / args.queries:7.1f} us")
+
+if __name__ == '__main__':
+    main()
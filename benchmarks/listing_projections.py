@@ -0,0 +1,62 @@
+"""
+Open-board listing with projection rows versus full Order entities (user-039).
+
+Both variants fetch the same open orders and format them with format_order_listing;
+only the row type differs. Peak allocation of the fetch is measured with tracemalloc.
+
+Usage:
+    python -m benchmarks.listing_projections [--open-orders 5000]
+"""
+import sys
+import argparse
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.common import reset_tables, seed_orders, measure, backend
+from models.database import session_scope, SGT
+from models.order_model import Order
+from models.order_queries import open_orders
+from models.order_status import OPEN
+from views.order_view import format_order_listing
+
+def entity_board(session, now):
+    return session.query(Order).filter(
+        Order.has_status(OPEN), Order.latest_pickup_time > now
+    ).order_by(Order.earliest_pickup_time.asc()).all()
+
+def peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--open-orders", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    reset_tables()
+    seed_orders(args.open_orders, history_count=args.open_orders)
+    print(f"backend={backend()} open_orders={args.open_orders}", file=sys.stderr)
+
+    now = datetime.now(SGT)
+    for name, load in (("entities", entity_board), ("projection", open_orders)):
+        def fetch(format_rows=False):
+            # A fresh session per call, like one update, so the identity map starts empty.
+            with session_scope() as session:
+                rows = load(session, now)
+                assert len(rows) == args.open_orders
+                return [format_order_listing(row) for row in rows] if format_rows else rows
+        def listing():
+            return fetch(format_rows=True)
+        fetch_median, _ = measure(fetch, args.repeat)
+        median, p95 = measure(listing, args.repeat)
+        print(
+            f"{name:<11} fetch {fetch_median:7.1f} ms  fetch+format median {median:7.1f} ms  p95 {p95:7.1f} ms  "
+            f"peak {peak_kib(fetch):7.0f} KiB (fetch only)"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Claim-path queries from the prebuilt statements in models/order_queries.py versus
+building them with session.query on every call, as the handlers did before (user-046).
+
+The table is kept small so the time is dominated by per-call overhead (building the
+query, the compiled-cache lookup, result handling) rather than by the database.
+
+Usage:
+    python -m benchmarks.query_building [--calls 2000]
+"""
+import sys
+import argparse
+
+from benchmarks.common import reset_tables, seed_orders, measure, backend
+from models.database import session_scope
+from models.order_model import Order
+from models.order_queries import claimable_order, active_claim_count, orders_claimed_by
+from models.order_status import OPEN, CLAIMED
+
+def claim_path_built(session, order_id, runner_id):
+    order = session.query(Order).filter(Order.id == order_id, Order.has_status(OPEN)).with_for_update().first()
+    active_claims = session.query(Order).filter(Order.runner_id == runner_id, Order.has_status(CLAIMED)).count()
+    claims = session.query(Order.id, Order.order_text).filter(
+        Order.runner_id == runner_id, Order.has_status(CLAIMED)
+    ).all()
+    return order, active_claims, len(claims)
+
+def claim_path_prebuilt(session, order_id, runner_id):
+    order = claimable_order(session, order_id)
+    active_claims = active_claim_count(session, runner_id)
+    claims = orders_claimed_by(session, runner_id)
+    return order, active_claims, len(claims)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--open-orders", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    reset_tables()
+    seed_orders(args.open_orders)
+    print(f"backend={backend()} open_orders={args.open_orders} calls={args.calls}", file=sys.stderr)
+
+    with session_scope() as session:
+        expected = claim_path_built(session, 1, 2001)
+        assert claim_path_prebuilt(session, 1, 2001) == expected
+        for name, claim_path in (("session.query", claim_path_built), ("prebuilt", claim_path_prebuilt)):
+            def run():
+                for i in range(args.calls):
+                    claim_path(session, i % args.open_orders + 1, 2001)
+            median, p95 = measure(run, args.repeat, warmup=1)
+            print(f"{name:<14} {median * 1000 / args.calls:6.1f} us per claim path (3 queries)  p95 {p95 * 1000 / args.calls:6.1f} us")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+/search latency on a large historical orders table (user-040).
+
+Times search_orders (FTS5 on SQLite, the GIN-indexed tsvector on PostgreSQL) against
+the plain substring scan it replaces, over a table that is mostly finished orders.
+
+Usage:
+    python -m benchmarks.search [--open-orders 2000] [--history 200000]
+"""
+import sys
+import argparse
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+from benchmarks.common import reset_tables, seed_orders, measure, backend
+from models.database import session_scope, SGT
+from models.order_model import Order
+from models.order_search import search_orders, _terms
+from models.order_status import OPEN
+
+QUERIES = ["chicken rice", "no spicy", "laksa", "bubble tea less ice", "durian"]
+
+def substring_scan(session, query, limit=10):
+    now = datetime.now(SGT)
+    return session.query(Order.id).filter(
+        Order.has_status(OPEN),
+        Order.latest_pickup_time > now,
+        and_(*(or_(Order.order_text.ilike(f"%{term}%"), Order.details.ilike(f"%{term}%")) for term in _terms(query)))
+    ).order_by(Order.earliest_pickup_time.asc()).limit(limit).all()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--open-orders", type=int, default=2000)
+    parser.add_argument("--history", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    reset_tables()
+    seed_orders(args.open_orders, history_count=args.history)
+    print(f"backend={backend()} open_orders={args.open_orders} history={args.history}", file=sys.stderr)
+
+    for query in QUERIES:
+        with session_scope() as session:
+            hits = len(search_orders(session, query))
+            search_median, search_p95 = measure(lambda: search_orders(session, query), args.repeat)
+            scan_median, _ = measure(lambda: substring_scan(session, query), args.repeat)
+        print(f"{query!r:<24} hits={hits:<3} search median {search_median:6.2f} ms  p95 {search_p95:6.2f} ms  "
+              f"substring scan median {scan_median:6.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+from telegram import Update
+from telegram.ext import CallbackContext
+from models.database import get_read_session
+from models.stats import get_stats
+from utils.utils import is_admin
+
+def _format_duration(seconds) -> str:
+    if seconds is None:
+        return "n/a"
+    if seconds >= 10 ** 9:
+        return "> 1 day"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+async def admin_stats(update: Update, context: CallbackContext):
+    """
+    Handles /adminstats [hours]. Shows operational stats from the hourly rollups.
+    """
+    user_id = update.effective_user.id
+    if not is_admin(user_id):
+        return
+
+    try:
+        hours = int(context.args[0]) if context.args else 24
+    except ValueError:
+        hours = 24
+    hours = min(max(hours, 1), 24 * 90)
+
+    stats = get_stats(get_read_session(user_id), hours)
+    expiry_rate = f"{stats['expiry_rate']:.0%}" if stats['expiry_rate'] is not None else "n/a"
+    locations = "\n".join(f"  {location}: {count}" for location, count in stats['top_locations']) or "  none"
+
+    await update.message.reply_text(
+        f"📊 Stats for the last {hours}h\n\n"
+        f"Placed: {stats['placed']} ({stats['orders_per_hour']:.1f}/h)\n"
+        f"Claimed: {stats['claimed']}\n"
+        f"Expired: {stats['expired']} (expiry rate {expiry_rate})\n\n"
+        f"Time to claim (bucket upper bounds):\n"
+        f"  mean {_format_duration(stats['mean_claim_seconds'])}, "
+        f"p50 ≤ {_format_duration(stats['claim_p50_seconds'])}, "
+        f"p90 ≤ {_format_duration(stats['claim_p90_seconds'])}, "
+        f"p99 ≤ {_format_duration(stats['claim_p99_seconds'])}\n\n"
+        f"Top locations:\n{locations}"
+    )
@@ -0,0 +1,86 @@
+from telegram import Update
+from telegram.ext import CallbackContext
+from models.database import get_session
+from models.moderation import (
+    pending_report_summary, recent_reports, suspend, unsuspend, dismiss_reports,
+    apply_suspensions, is_suspended
+)
+from utils.utils import is_admin
+
+def _target_user_id(context: CallbackContext):
+    try:
+        return int(context.args[0]) if context.args else None
+    except ValueError:
+        return None
+
+async def moderation_queue(update: Update, context: CallbackContext):
+    """
+    Handles /moderation [user_id]. Without an argument lists users with pending
+    reports; with one shows that user's latest reports.
+    """
+    if not is_admin(update.effective_user.id):
+        return
+    session = get_session()
+    target_id = _target_user_id(context)
+
+    if target_id is None:
+        rows = pending_report_summary(session)
+        if not rows:
+            await update.message.reply_text("✅ No pending reports.")
+            return
+        lines = [
+            f"{reported_id}: {reports} reports from {reporters} users{' (suspended)' if is_suspended(reported_id) else ''}"
+            for reported_id, reports, reporters in rows
+        ]
+        await update.message.reply_text(
+            "🛡 Pending reports:\n\n" + "\n".join(lines) +
+            "\n\nUse /moderation <user_id>, /suspend <user_id> [reason], /unsuspend <user_id> or /dismissreports <user_id>."
+        )
+        return
+
+    reports = recent_reports(session, target_id)
+    status = "suspended" if is_suspended(target_id) else "active"
+    lines = [f"[{r.status}] Order {r.order_id} by {r.reporter_id}: {r.reason}" for r in reports] or ["No reports."]
+    await update.message.reply_text(f"👤 User {target_id} ({status})\n\n" + "\n".join(lines))
+
+async def suspend_user(update: Update, context: CallbackContext):
+    """Handles /suspend <user_id> [reason]."""
+    admin_id = update.effective_user.id
+    if not is_admin(admin_id):
+        return
+    target_id = _target_user_id(context)
+    if target_id is None:
+        await update.message.reply_text("Usage: /suspend <user_id> [reason]")
+        return
+    session = get_session()
+    suspend(session, target_id, reason=" ".join(context.args[1:]) or None, suspended_by=admin_id)
+    session.commit()
+    apply_suspensions(suspended=[target_id])
+    await update.message.reply_text(f"🚫 User {target_id} suspended.")
+
+async def unsuspend_user(update: Update, context: CallbackContext):
+    """Handles /unsuspend <user_id>."""
+    if not is_admin(update.effective_user.id):
+        return
+    target_id = _target_user_id(context)
+    if target_id is None:
+        await update.message.reply_text("Usage: /unsuspend <user_id>")
+        return
+    session = get_session()
+    removed = unsuspend(session, target_id)
+    session.commit()
+    apply_suspensions(unsuspended=[target_id])
+    await update.message.reply_text(f"✅ User {target_id} unsuspended." if removed else f"User {target_id} was not suspended.")
+
+async def dismiss_user_reports(update: Update, context: CallbackContext):
+    """Handles /dismissreports <user_id>."""
+    if not is_admin(update.effective_user.id):
+        return
+    target_id = _target_user_id(context)
+    if target_id is None:
+        await update.message.reply_text("Usage: /dismissreports <user_id>")
+        return
+    session = get_session()
+    dismissed = dismiss_reports(session, target_id)
+    session.commit()
+    await update.message.reply_text(f"Dismissed {dismissed} pending reports against user {target_id}.")
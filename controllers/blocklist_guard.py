@@ -0,0 +1,14 @@
+from telegram import Update
+from telegram.ext import CallbackContext, ApplicationHandlerStop
+
+from models.moderation import is_suspended
+from utils import metrics
+
+async def reject_suspended_users(update: Update, context: CallbackContext):
+    """
+    Runs first on every update. Updates from suspended users are dropped after a
+    set lookup, without any database query or reply.
+    """
+    if update.effective_user and is_suspended(update.effective_user.id):
+        metrics.inc("moderation.rejected_updates")
+        raise ApplicationHandlerStop
@@ -5,8 +5,8 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackContext
 from telegram.helpers import escape_markdown
 
-from models.order_model import Order
-from models.database import session_local, SGT
+from models.order_queries import claimable_order, active_claim_count
+from models.database import session_scope, SGT
 from views.order_view import get_order_keyboard, format_order_time, format_order_message
 from views import messages
 from utils.utils import get_main_menu
@@ -48,8 +48,8 @@ async def process_claim_order_by_id(update: Update, context: CallbackContext, us
         )
         return
 
-    with session_local() as session:
-        order = session.query(Order).filter_by(id=order_id, claimed=False).with_for_update().first()
+    with session_scope() as session:
+        order = claimable_order(session, order_id)
         if not order:
             await message.reply_text(
                 messages.CLAIM_FAILED.format(order_id=order_id),
@@ -64,8 +64,10 @@ async def process_claim_order_by_id(update: Update, context: CallbackContext, us
         #         reply_markup=get_main_menu()
         #     )
         #     return
-        active_claims = session.query(Order).filter_by(runner_id=user_id, claimed=True, expired=False).count()
+        active_claims = active_claim_count(session, user_id)
         if active_claims >= 2:
+            # End the transaction first so the claimed row is not locked while replying.
+            session.rollback()
             await message.reply_text(
                 "🚫 You have already claimed 2 active orders. Please cancel one before claiming a new one.",
                 parse_mode="Markdown",
@@ -4,8 +4,8 @@ from utils.utils import get_main_menu
 from views import messages
 from controllers.order_state import user_states
 from controllers.claim_steps.perform_claim import perform_claim
-from models.database import session_local
-from models.order_model import Order
+from models.database import session_scope
+from models.order_queries import claimable_order, active_claim_count
 
 async def handle_claim_confirmation(update: Update, context: CallbackContext):
     user_id = update.effective_user.id
@@ -35,8 +35,8 @@ async def handle_claim_confirmation(update: Update, context: CallbackContext):
         return
 
     # Open session and validate
-    with session_local() as session:
-        order = session.query(Order).filter_by(id=order_id, claimed=False).with_for_update().first()
+    with session_scope() as session:
+        order = claimable_order(session, order_id)
 
         if not order:
             user_states.pop(user_id, None)
@@ -55,8 +55,10 @@ async def handle_claim_confirmation(update: Update, context: CallbackContext):
         #     )
         #     return
 
-        active_claims = session.query(Order).filter_by(runner_id=user_id, claimed=True, expired=False).count()
+        active_claims = active_claim_count(session, user_id)
         if active_claims >= 2:
+            # End the transaction first so the claimed row is not locked while replying.
+            session.rollback()
             await update.message.reply_text(
                 "🚫 You have already claimed 2 active orders.\n\n"
                 "Please cancel one of your existing claims before claiming a new one.",
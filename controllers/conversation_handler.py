@@ -12,6 +12,7 @@ from controllers.order_steps.handle_details import handle_details_input
 from controllers.order_steps.handle_fee import handle_fee_input
 from controllers.order_steps.handle_confirmation import handle_confirmation_input
 from controllers.order_steps.handle_deletion import handle_deletion
+from controllers.order_steps.handle_quick_order import handle_quick_order, is_quick_order
 from controllers.order_management.handle_select_claimed_order import handle_selecting_claimed_order
 from controllers.order_management.delete_order import delete_order
 from controllers.order_management.cancel_claim import cancel_claim
@@ -22,8 +23,15 @@ from controllers.report_issue.save_report_user import save_report_user
 async def start_order(update: Update, context: CallbackContext):
     """
     Initiates the order placement conversation (triggered by /order).
+    If the whole order follows the command, it goes straight to confirmation.
     """
     user_id = update.effective_user.id
+    command_parts = update.message.text.split(None, 1) if update.message and update.message.text else []
+    order_text = command_parts[1] if len(command_parts) > 1 else ""
+    if order_text.strip():
+        await handle_quick_order(update, context, order_text)
+        return
+
     user_states[user_id] = {"state": "awaiting_order_meal"}
     message = update.message if update.message else update.callback_query.message
     await message.reply_text(
@@ -49,7 +57,10 @@ async def handle_conversation(update: Update, context: CallbackContext):
     current_state = user_states[user_id].get("state")
 
     if current_state == "awaiting_order_meal":
-        await handle_meal_input(update, context)
+        if is_quick_order(update.message.text):
+            await handle_quick_order(update, context, update.message.text)
+        else:
+            await handle_meal_input(update, context)
     elif current_state == "awaiting_order_location":
         await handle_location_input(update, context)
     elif current_state == "awaiting_order_earliest_time":
@@ -16,12 +16,19 @@ from controllers.order_state import user_states, user_orders
 from controllers.report_issue.report_issue import handle_report
 from controllers.report_issue.handle_report_user import handle_report_user
 from controllers.report_issue.handle_report_user_reason import handle_report_user_reason
+from controllers.review_steps.complete_order import complete_order
+from controllers.review_steps.handle_rating import handle_rating
 from utils.utils import get_main_menu
 from views.order_view import get_order_keyboard, format_order_message, format_order_time
 from views import messages
-from models.order_model import Order
-from models.database import session_local, SGT
+from models.order_model import Order, OrderEvent
+from models.database import get_session, SGT
 from controllers.start import start
+from models.outbox import enqueue_channel_post
+from models.stats import record_order_placed
+from utils.zones import zone_for_location
+from utils.open_order_index import open_order_index
+from utils.user_view_cache import user_view_cache
 
 async def handle_button(update: Update, context: CallbackContext):
     """
@@ -47,9 +54,21 @@ async def handle_button(update: Update, context: CallbackContext):
             user_handle=query.from_user.username,
             order_placed_time=datetime.now(SGT)
         )
-        session = session_local()
+        _, new_order.channel_id = zone_for_location(new_order.location)
+        session = get_session()
         session.add(new_order)
+        session.flush()
+        session.add(OrderEvent.for_order(new_order, None, actor_id=user_id, at=new_order.order_placed_time))
+        record_order_placed(session, new_order)
+
+        # Queue the channel post in the same transaction as the order.
+        bot_username = context.bot.username
+        reply_markup = get_order_keyboard(bot_username, new_order.id)
+        channel_text = format_order_message(new_order, "Claim Status: ✅ This order is available to claim.")
+        enqueue_channel_post(session, new_order, channel_text, parse_mode="MarkdownV2", reply_markup=reply_markup)
         session.commit()
+        open_order_index.invalidate()
+        user_view_cache.invalidate("orders", user_id)
 
         # Clear user state
         del user_states[user_id]
@@ -67,26 +86,6 @@ async def handle_button(update: Update, context: CallbackContext):
             parse_mode="MarkdownV2",
             reply_markup=get_main_menu()
         )
-
-        bot_username = context.bot.username
-        reply_markup = get_order_keyboard(bot_username, new_order.id)
-        sent_message = await context.bot.send_message(
-            chat_id=os.getenv("CHANNEL_ID"),
-            text=messages.NEW_ORDER.format(
-                order_id=escape_markdown(str(new_order.id), version=2),
-                order_text=escape_markdown(new_order.order_text, version=2),
-                order_location=escape_markdown(new_order.location, version=2),
-                order_time=escape_markdown(format_order_time(new_order), version=2),
-                order_details=escape_markdown(new_order.details, version=2),
-                delivery_fee=escape_markdown(new_order.delivery_fee, version=2),
-                claim_status=escape_markdown("Claim Status: ✅ This order is available to claim.", version=2)
-            ),
-            parse_mode="MarkdownV2",
-            reply_markup=reply_markup
-        )
-        new_order.channel_message_id = sent_message.message_id
-        session.commit()
-        session.close()
         
     elif callback_data.startswith("cancel_order_"):
         user_states.pop(user_id, None)
@@ -104,6 +103,14 @@ async def handle_button(update: Update, context: CallbackContext):
         user_states[user_id] = {"order_id": order_id, "reported_user_handle": reported_user_handle}
         await handle_report_user_reason(update, context, order_id, reported_user_handle)
 
+    elif callback_data.startswith("complete_order_"):
+        order_id = int(callback_data.split("_")[2])
+        await complete_order(update, context, order_id)
+
+    elif callback_data.startswith("rate_runner_"):
+        parts = callback_data.split("_")
+        await handle_rating(update, context, int(parts[2]), int(parts[3]))
+
     
     elif callback_data == 'start':
         await start(update, context)
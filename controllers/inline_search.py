@@ -0,0 +1,35 @@
+import os
+from telegram import Update, InlineQueryResultArticle, InputTextMessageContent
+from telegram.ext import CallbackContext
+
+from models.database import get_read_session
+from utils.open_order_index import open_order_index
+from views.order_view import get_order_keyboard, format_order_message, format_order_time
+
+INLINE_QUERY_CACHE_SECONDS = int(os.getenv("INLINE_QUERY_CACHE_SECONDS", "10"))
+INLINE_QUERY_MAX_RESULTS = 20
+
+async def handle_inline_query(update: Update, context: CallbackContext):
+    """
+    Answers `@bot <text>` with open orders whose meal or location matches the text.
+    Results come from the in-memory open order index, not from a DB query per keystroke.
+    """
+    query = update.inline_query
+    session = get_read_session(update.effective_user.id)
+    orders = open_order_index.search(session, query.query, limit=INLINE_QUERY_MAX_RESULTS)
+
+    bot_username = context.bot.username
+    results = [
+        InlineQueryResultArticle(
+            id=str(order.id),
+            title=f"#{order.id} {order.order_text}",
+            description=f"📍 {order.location} ⏳ {format_order_time(order)} 💸 ${order.delivery_fee}",
+            input_message_content=InputTextMessageContent(
+                format_order_message(order, "Claim Status: ✅ This order is available to claim."),
+                parse_mode="MarkdownV2"
+            ),
+            reply_markup=get_order_keyboard(bot_username, order.id)
+        )
+        for order in orders
+    ]
+    await query.answer(results, cache_time=INLINE_QUERY_CACHE_SECONDS, is_personal=False)
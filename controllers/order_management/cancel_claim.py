@@ -6,10 +6,15 @@ from telegram.ext import CallbackContext
 from telegram.helpers import escape_markdown
 
 from models.order_model import Order
-from models.database import session_local, SGT
+from models.order_status import OPEN, CLAIMED
+from sqlalchemy.orm.exc import StaleDataError
+from models.database import get_session, SGT
 from utils.utils import get_main_menu
 from controllers.order_state import user_states
 from views import messages
+from models.outbox import enqueue_message, enqueue_channel_edit
+from utils.open_order_index import open_order_index
+from utils.user_view_cache import user_view_cache
 from views.order_view import get_order_keyboard, format_order_message, format_order_time
 
 async def cancel_claim(update: Update, context: CallbackContext):
@@ -24,65 +29,65 @@ async def cancel_claim(update: Update, context: CallbackContext):
         await message.reply_text("No claim selected. Please try again.", reply_markup=get_main_menu())
         return
 
-    session = session_local()
-    order = session.query(Order).filter_by(id=order_id, runner_id=user_id, claimed=True).first()
+    session = get_session()
+    order = session.query(Order).filter(Order.id == order_id, Order.runner_id == user_id, Order.has_status(CLAIMED)).with_for_update().first()
     if order:
         now = datetime.now(SGT)
         if order.latest_pickup_time < now:
+            # End the transaction first so the row lock is not held while replying.
+            session.rollback()
             await message.reply_text(
                 "You cannot cancel this claim because the pickup time has already passed.",
                 parse_mode="Markdown",
                 reply_markup=get_main_menu()
             )
             user_states.pop(user_id, None)
-            session.close()
             return
 
         # Update the order to mark it as not claimed.
-        order.claimed = False
+        # Logged before the runner is cleared, so the event keeps who gave the claim up.
+        order.transition_to(OPEN, actor_id=user_id)
         order.runner_id = None
         order.runner_handle = None
         order.order_claimed_time = None
         session.add(order)
-        session.commit()
 
-        # Notify the runner (user canceling the claim)
-        await message.reply_text(
-            f"You have canceled your claim on Order ID {order_id}.",
-            parse_mode="Markdown",
-            reply_markup=get_main_menu()
+        # Queue the orderer notification and the channel update in the same transaction.
+        enqueue_message(
+            session,
+            chat_id=order.user_id,
+            text=f"Sorry, your order (ID: {order_id}) has had its claim canceled by the runner.",
+            parse_mode="Markdown"
         )
-
-        # Notify the orderer that their order's claim was canceled.
-        orderer_id = order.user_id
-        try:
-            await context.bot.send_message(
-                chat_id=orderer_id,
-                text=f"Sorry, your order (ID: {order_id}) has had its claim canceled by the runner.",
-                parse_mode="Markdown"
-            )
-        except Exception as e:
-            logging.warning(f"Failed to notify orderer {orderer_id}: {e}")
-
-        # Update the channel message to reflect that the order is now available.
         bot_username = context.bot.username
         reply_markup = get_order_keyboard(bot_username, order.id)
         edited_text = format_order_message(order, "Claim Status: ✅ This order is available to claim.")
+        enqueue_channel_edit(session, order, edited_text, parse_mode="MarkdownV2", reply_markup=reply_markup)
         try:
-            await context.bot.edit_message_text(
-                chat_id=os.getenv("CHANNEL_ID"),
-                message_id=order.channel_message_id,
-                text=edited_text,
-                parse_mode="MarkdownV2",
-                reply_markup=reply_markup
+            session.commit()
+        except StaleDataError:
+            # Expired or completed between reading it and giving the claim up.
+            session.rollback()
+            user_states.pop(user_id, None)
+            await message.reply_text(
+                "This claim could not be canceled because the order has just changed. Please try again.",
+                reply_markup=get_main_menu()
             )
-        except Exception as e:
-            logging.warning(f"Failed to update channel message for order {order_id}: {e}")
+            return
+        open_order_index.invalidate()
+        user_view_cache.invalidate("claims", user_id)
+
+        # Notify the runner (user canceling the claim)
+        await message.reply_text(
+            f"You have canceled your claim on Order ID {order_id}.",
+            parse_mode="Markdown",
+            reply_markup=get_main_menu()
+        )
     else:
+        session.rollback()
         await message.reply_text(
             "No valid claim found to cancel.",
             parse_mode="Markdown",
             reply_markup=get_main_menu()
         )
-    user_states.pop(user_id, None)
-    session.close()
\ No newline at end of file
+    user_states.pop(user_id, None)
\ No newline at end of file
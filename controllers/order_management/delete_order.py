@@ -1,7 +1,8 @@
 from telegram import Update
 from telegram.ext import CallbackContext
 from models.order_model import Order
-from models.database import session_local
+from models.order_status import CLAIMED
+from models.database import get_session
 from utils.utils import get_main_menu
 from controllers.order_state import user_states
 from views import messages
@@ -17,16 +18,15 @@ async def delete_order(update: Update, context: CallbackContext):
         await message.reply_text("No order selected. Please try again.", reply_markup=get_main_menu())
         return
 
-    session = session_local()
+    session = get_session()
     order = session.query(Order).filter_by(id=order_id).first()
     if order:
-        if order.claimed:
+        if order.status == CLAIMED:
             await message.reply_text(
                 "This order has been claimed. Please contact the runner to cancel your order.",
                 parse_mode="Markdown",
                 reply_markup=get_main_menu()
             )
-            session.close()
             return
         
         user_states[user_id]["state"] = "deleting_order"
@@ -35,5 +35,4 @@ async def delete_order(update: Update, context: CallbackContext):
         await message.reply_text(
             "Invalid Order ID. Please enter a valid Order ID or type /cancel to exit.",
             parse_mode="Markdown"
-        )
-    session.close()
\ No newline at end of file
+        )
\ No newline at end of file
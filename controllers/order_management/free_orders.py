@@ -0,0 +1,65 @@
+import re
+from datetime import datetime
+from telegram import Update
+from telegram.ext import CallbackContext
+from telegram.helpers import escape_markdown
+
+from models.database import get_read_session, SGT
+from controllers.time_validation import validate_strict_time_format
+from utils.open_order_index import open_order_index
+from utils.utils import get_main_menu
+from views import messages
+from views.order_view import format_order_listing
+
+FREE_MAX_RESULTS = 10
+_TIME_ONLY = re.compile(r'^([0-1]?[0-9]):([0-5][0-9])(am|pm)$')
+
+def parse_free_time(text: str, today: datetime):
+    """Parses "12:30pm" (today) or "03-27 12:30pm" into an SGT datetime, or None."""
+    text = text.strip().lower()
+    if _TIME_ONLY.match(text):
+        text = f"{today.strftime('%m-%d')} {text}"
+    return validate_strict_time_format(text)
+
+def parse_free_window(args):
+    """Returns (start, end, location) from the command arguments, or None if they are invalid."""
+    today = datetime.now(SGT)
+    # Accept both "/free 12:00pm 1:00pm" and "/free 03-27 12:00pm 03-27 1:00pm".
+    for consumed in (2, 4):
+        if len(args) < consumed:
+            break
+        half = consumed // 2
+        start = parse_free_time(" ".join(args[:half]), today)
+        end = parse_free_time(" ".join(args[half:consumed]), today)
+        if start and end and end > start:
+            return start, end, " ".join(args[consumed:]).strip().lower()
+    return None
+
+async def handle_free(update: Update, context: CallbackContext):
+    """
+    Handles /free <from> <to> [location]: open orders whose pickup window overlaps the
+    runner's free window, optionally narrowed down to a location.
+    """
+    message = update.message
+    window = parse_free_window(context.args or [])
+    if window is None:
+        await message.reply_text(messages.FREE_USAGE, reply_markup=get_main_menu())
+        return
+    start, end, location = window
+
+    session = get_read_session(update.effective_user.id)
+    orders = open_order_index.overlapping(session, start, end)
+    if location:
+        orders = [o for o in orders if location in (o.location or "").lower()]
+
+    if not orders:
+        await message.reply_text(messages.NO_FREE_ORDERS, parse_mode="MarkdownV2", reply_markup=get_main_menu())
+        return
+
+    window_text = f"{start.strftime('%A %m-%d %I:%M%p')} - {end.strftime('%m-%d %I:%M%p')}"
+    results = "\n".join(format_order_listing(o) for o in orders[:FREE_MAX_RESULTS])
+    await message.reply_text(
+        f"🕒 Orders for *{escape_markdown(window_text, version=2)}*:\n\n{results}",
+        parse_mode="MarkdownV2",
+        reply_markup=get_main_menu()
+    )
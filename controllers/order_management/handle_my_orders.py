@@ -1,8 +1,8 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackContext
 from telegram.helpers import escape_markdown
-from models.order_model import Order
-from models.database import session_local
+from utils.user_view_cache import user_view_cache
+from models.database import get_read_session
 from utils.utils import get_main_menu
 from controllers.order_state import user_states
 from views import messages
@@ -13,9 +13,8 @@ async def handle_my_orders(update: Update, context: CallbackContext):
     """
     user_id = update.effective_user.id if update.message else update.callback_query.from_user.id
     message = update.message if update.message else update.callback_query.message
-    session = session_local()
-    orders = session.query(Order).filter_by(user_id=user_id, expired=False).all()
-    session.close()
+    session = get_read_session(user_id)
+    orders = user_view_cache.orders(session, user_id)
     
     if orders:
         order_list = [
@@ -1,8 +1,8 @@
 from telegram import Update
 from telegram.ext import CallbackContext
 from telegram.helpers import escape_markdown
-from models.database import session_local
-from models.order_model import Order
+from models.database import get_read_session
+from utils.user_view_cache import user_view_cache
 from controllers.order_state import user_states
 from utils.utils import get_main_menu
 
@@ -12,15 +12,14 @@ async def handle_selecting_claimed_order(update: Update, context: CallbackContex
 
     try:
         order_id = int(message.text.strip())
-        session = session_local()
-        order = session.query(Order).filter_by(id=order_id, runner_id=user_id, claimed=True).first()
+        session = get_read_session(user_id)
+        claims = user_view_cache.claims(session, user_id)
 
-        if not order:
+        if not any(claim.id == order_id for claim in claims):
             await message.reply_text(
                 "❌ Invalid or unclaimed Order ID. Please try again.",
                 parse_mode="Markdown"
             )
-            session.close()
             return
 
         user_states[user_id] = {'state': 'canceling_claim', 'selected_order': order_id}
@@ -30,7 +29,6 @@ async def handle_selecting_claimed_order(update: Update, context: CallbackContex
             "Reply with *YES* to confirm or *NO* to abort.",
             parse_mode="Markdown"
         )
-        session.close()
     except ValueError:
         await message.reply_text(
             "❌ Please enter a valid Order ID.",
@@ -0,0 +1,39 @@
+from telegram import Update
+from telegram.ext import CallbackContext
+from telegram.helpers import escape_markdown
+
+from models.database import get_read_session
+from models.order_search import search_orders
+from utils.utils import get_main_menu
+from views import messages
+from views.order_view import format_order_listing
+
+SEARCH_MAX_RESULTS = 10
+
+async def handle_search(update: Update, context: CallbackContext):
+    """
+    Handles /search <words>: open orders whose meal or details contain all the words,
+    ranked by relevance and then pickup time.
+    """
+    message = update.message
+    query = " ".join(context.args or [])
+    if not query.strip():
+        await message.reply_text(messages.SEARCH_USAGE, reply_markup=get_main_menu())
+        return
+
+    session = get_read_session(update.effective_user.id)
+    orders = search_orders(session, query, limit=SEARCH_MAX_RESULTS)
+    if not orders:
+        await message.reply_text(
+            messages.NO_SEARCH_RESULTS.format(query=escape_markdown(query, version=2)),
+            parse_mode="MarkdownV2",
+            reply_markup=get_main_menu()
+        )
+        return
+
+    results = "\n".join(format_order_listing(o) for o in orders)
+    await message.reply_text(
+        f"🔎 Results for *{escape_markdown(query, version=2)}*:\n\n{results}",
+        parse_mode="MarkdownV2",
+        reply_markup=get_main_menu()
+    )
@@ -2,12 +2,12 @@ import os
 from datetime import datetime
 from telegram import Update
 from telegram.ext import CallbackContext
-from telegram.helpers import escape_markdown
 
-from models.order_model import Order
-from models.database import session_local, SGT
+from models.order_queries import open_orders
+from models.database import get_read_session, SGT
 from utils.utils import get_main_menu
 from views import messages
+from views.order_view import format_order_listing
 
 async def view_orders(update: Update, context: CallbackContext):
     """
@@ -15,30 +15,11 @@ async def view_orders(update: Update, context: CallbackContext):
     """
     message = update.message if update.message else update.callback_query.message
     now = datetime.now(SGT)
-    session = session_local()
-    orders = session.query(Order).filter(
-        Order.claimed == False,
-        Order.expired == False,
-        Order.latest_pickup_time > now
-    ).order_by(Order.earliest_pickup_time.asc()).all()
-    session.close()
+    session = get_read_session(update.effective_user.id)
+    orders = open_orders(session, now)
 
     if orders:
-        order_list = []
-        for o in orders:
-            time_str = (
-                f"{o.earliest_pickup_time.astimezone(SGT).strftime('%A %m-%d %I:%M%p')} - "
-                f"{o.latest_pickup_time.astimezone(SGT).strftime('%m-%d %I:%M%p')}"
-            )
-            order_text = (
-                f"📌 *Order ID:* {escape_markdown(str(o.id), version=2)}\n"
-                f"🍽 *Meal:* {escape_markdown(o.order_text, version=2)}\n"
-                f"📍 *Location:* {escape_markdown(o.location, version=2)}\n"
-                f"⏳ *Time:* {escape_markdown(time_str, version=2)}\n"
-                f"ℹ️ *Details:* {escape_markdown(o.details, version=2)}\n"
-                f"💸 *Delivery Fee:* ${escape_markdown(o.delivery_fee, version=2)}\n"
-            )
-            order_list.append(order_text)
+        order_list = [format_order_listing(o) for o in orders]
 
         for i in range(0, len(order_list), 10):
             chunk = "\n".join(order_list[i:i+10])
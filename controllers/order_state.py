@@ -1,5 +1,6 @@
 # controllers/order_state.py
+from utils.tenants import TenantDict
 
-# Global dictionaries to store user state and temporary order data.
-user_states = {}  # e.g. { user_id: { 'state': 'awaiting_order_meal', ... } }
-user_orders = {}  # e.g. { user_id: { 'meal': ..., 'location': ..., etc. } }
\ No newline at end of file
+# User state and temporary order data, kept separately for each tenant (campus bot).
+user_states = TenantDict()  # e.g. { user_id: { 'state': 'awaiting_order_meal', ... } }
+user_orders = TenantDict()  # e.g. { user_id: { 'meal': ..., 'location': ..., etc. } }
@@ -4,10 +4,15 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackContext
 from telegram.helpers import escape_markdown
 from models.order_model import Order
-from models.database import session_local
+from models.order_status import OPEN, CLAIMED, CANCELLED
+from models.database import session_scope
 from utils.utils import get_main_menu
 from views.order_view import get_order_keyboard
 from controllers.order_state import user_states
+from models.outbox import enqueue_channel_edit
+from sqlalchemy.orm.exc import StaleDataError
+from utils.open_order_index import open_order_index
+from utils.user_view_cache import user_view_cache
 
 async def handle_deletion(update: Update, context: CallbackContext):
     user_id = update.effective_user.id
@@ -15,10 +20,13 @@ async def handle_deletion(update: Update, context: CallbackContext):
     response = message.text.strip().lower()
     order_id = user_states[user_id].get('selected_order')
 
-    with session_local() as session:
-        order = session.query(Order).filter_by(id=order_id).first()
+    with session_scope() as session:
+        order = session.query(Order).filter_by(id=order_id).with_for_update().first()
+        # Every branch that replies without writing ends the transaction first, so the
+        # row lock is never held while waiting on Telegram.
 
         if not order:
+            session.rollback()
             await message.reply_text(
                 "Invalid Order ID. Please enter a valid Order ID or type /cancel to exit.",
                 parse_mode="Markdown"
@@ -26,31 +34,42 @@ async def handle_deletion(update: Update, context: CallbackContext):
             user_states.pop(user_id, None)
             return
 
-        if response == 'yes':
-            order.expired = True
-            session.commit()
-
-            bot_username = context.bot.username
-            escaped_order_id = escape_markdown(str(order.id), version=2)
+        if response == 'yes' and order.status != OPEN:
+            # Claimed (or expired) since the user picked it.
+            claimed = order.status == CLAIMED
+            session.rollback()
             await message.reply_text(
-                "✅ Your order has been successfully canceled",
-                parse_mode="Markdown",
+                "This order has been claimed. Please contact the runner to cancel your order."
+                if claimed else "This order is no longer active.",
                 reply_markup=get_main_menu()
             )
 
-            if order.channel_message_id:
-                try:
-                    cancel_msg = f"📌 *Order ID:* {escaped_order_id}\n🗑 *This order has been canceled by the user\\.*"
-                    await context.bot.edit_message_text(
-                        chat_id=os.getenv("CHANNEL_ID"),
-                        message_id=order.channel_message_id,
-                        text=cancel_msg,
-                        parse_mode="MarkdownV2"
-                    )
-                except Exception as e:
-                    logging.warning(f"Failed to edit deleted order message: {e}")
+        elif response == 'yes':
+            order.transition_to(CANCELLED, actor_id=user_id)
+            escaped_order_id = escape_markdown(str(order.id), version=2)
+            cancel_msg = f"📌 *Order ID:* {escaped_order_id}\n🗑 *This order has been canceled by the user\\.*"
+            enqueue_channel_edit(session, order, cancel_msg, parse_mode="MarkdownV2")
+            try:
+                session.commit()
+            except StaleDataError:
+                # Claimed or expired between reading it and cancelling it.
+                session.rollback()
+                await message.reply_text(
+                    "This order was claimed or expired before it could be canceled.",
+                    reply_markup=get_main_menu()
+                )
+            else:
+                open_order_index.invalidate()
+                user_view_cache.invalidate("orders", user_id)
+
+                await message.reply_text(
+                    "✅ Your order has been successfully canceled",
+                    parse_mode="Markdown",
+                    reply_markup=get_main_menu()
+                )
 
         elif response == 'no':
+            session.rollback()
             await message.reply_text(
                 "❌ Order deletion canceled",
                 parse_mode="Markdown",
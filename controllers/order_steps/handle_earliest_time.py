@@ -1,27 +1,17 @@
 from telegram import Update
 from telegram.ext import CallbackContext
-from datetime import datetime, timedelta
 from utils.utils import get_cancel_keyboard
 from views import messages
 from controllers.order_state import user_states, user_orders
-from controllers.time_validation import validate_strict_time_format
-from models.database import SGT
+from controllers.order_validation import validate_earliest_time
 
 async def handle_earliest_time_input(update: Update, context: CallbackContext):
     user_id = update.effective_user.id
     text = update.message.text.strip()
-    earliest_dt = validate_strict_time_format(text)
-    if not earliest_dt:
+    earliest_dt, error = validate_earliest_time(text)
+    if error:
         await update.message.reply_text(
-            "Invalid time format. Please use MM-DD HH:MMam/pm.",
-            parse_mode="Markdown",
-            reply_markup=get_cancel_keyboard(user_id)
-        )
-        return False
-    now = datetime.now(SGT)
-    if earliest_dt < now or earliest_dt > now + timedelta(days=7):
-        await update.message.reply_text(
-            "Earliest pickup time must be in the future and within the next 7 days.",
+            error,
             parse_mode="Markdown",
             reply_markup=get_cancel_keyboard(user_id)
         )
@@ -34,4 +24,4 @@ async def handle_earliest_time_input(update: Update, context: CallbackContext):
         parse_mode="Markdown",
         reply_markup=get_cancel_keyboard(user_id)
     )
-    return True
\ No newline at end of file
+    return True
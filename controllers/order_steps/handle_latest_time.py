@@ -1,26 +1,17 @@
 from telegram import Update
 from telegram.ext import CallbackContext
-from datetime import timedelta
-from utils.utils import get_main_menu, get_cancel_keyboard
+from utils.utils import get_cancel_keyboard
 from views import messages
 from controllers.order_state import user_states, user_orders
-from controllers.time_validation import validate_strict_time_format
+from controllers.order_validation import validate_latest_time
 
 async def handle_latest_time_input(update: Update, context: CallbackContext):
     user_id = update.effective_user.id
     text = update.message.text.strip()
-    latest_dt = validate_strict_time_format(text)
-    if not latest_dt:
+    latest_dt, error = validate_latest_time(text, user_orders[user_id]['earliest_dt'])
+    if error:
         await update.message.reply_text(
-            "Invalid time format. Please use MM-DD HH:MMam/pm.",
-            parse_mode="Markdown",
-            reply_markup=get_main_menu(user_id)
-        )
-        return False
-    earliest_dt = user_orders[user_id]['earliest_dt']
-    if latest_dt <= earliest_dt or latest_dt - earliest_dt > timedelta(hours=3):
-        await update.message.reply_text(
-            "Latest pickup time must be after the earliest time and within 3 hours.",
+            error,
             parse_mode="Markdown",
             reply_markup=get_cancel_keyboard(user_id)
         )
@@ -33,4 +24,4 @@ async def handle_latest_time_input(update: Update, context: CallbackContext):
         parse_mode="Markdown",
         reply_markup=get_cancel_keyboard(user_id)
     )
-    return True
\ No newline at end of file
+    return True
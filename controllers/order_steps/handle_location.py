@@ -3,18 +3,20 @@ from telegram.ext import CallbackContext
 from utils.utils import get_cancel_keyboard
 from views import messages
 from controllers.order_state import user_states, user_orders
+from controllers.order_validation import validate_location
 
 async def handle_location_input(update: Update, context: CallbackContext):
     user_id = update.effective_user.id
     text = update.message.text.strip()
-    if not text or len(text) > 100:
+    location, error = validate_location(text)
+    if error:
         await update.message.reply_text(
-            messages.ORDER_TOO_LONG.format(max_length=100, order_length=len(text)),
+            error,
             parse_mode="Markdown",
             reply_markup=get_cancel_keyboard(user_id)
         )
         return False
-    user_orders.setdefault(user_id, {})['location'] = text
+    user_orders.setdefault(user_id, {})['location'] = location
     user_states[user_id]['state'] = 'awaiting_order_earliest_time'
     await update.message.reply_text(
         messages.ORDER_INSTRUCTIONS_EARLIEST_TIME,
@@ -3,22 +3,24 @@ from telegram.ext import CallbackContext
 from utils.utils import get_cancel_keyboard
 from views import messages
 from controllers.order_state import user_states, user_orders
+from controllers.order_validation import validate_meal
 
 async def handle_meal_input(update: Update, context: CallbackContext):
     user_id = update.effective_user.id
     text = update.message.text.strip()
-    if not text or len(text) > 100:
+    meal, error = validate_meal(text)
+    if error:
         await update.message.reply_text(
-            messages.ORDER_TOO_LONG.format(max_length=100, order_length=len(text)),
+            error,
             parse_mode="Markdown",
             reply_markup=get_cancel_keyboard(user_id)
         )
         return False
-    user_orders.setdefault(user_id, {})['meal'] = text
+    user_orders.setdefault(user_id, {})['meal'] = meal
     user_states[user_id]['state'] = 'awaiting_order_location'
     await update.message.reply_text(
         messages.ORDER_INSTRUCTIONS_LOCATION,
         parse_mode="Markdown",
         reply_markup=get_cancel_keyboard(user_id)
     )
-    return True
\ No newline at end of file
+    return True
@@ -0,0 +1,80 @@
+import re
+from telegram import Update
+from telegram.ext import CallbackContext
+from utils.utils import get_cancel_keyboard
+from views import messages
+from controllers.order_state import user_states, user_orders
+from controllers.order_validation import (
+    validate_meal, validate_location, validate_earliest_time, validate_latest_time,
+    validate_details, validate_fee
+)
+from controllers.order_steps.handle_confirmation import handle_confirmation_input
+
+# Accepted labels for each field of a single-message order.
+FIELD_ALIASES = {
+    'meal': 'meal', 'food': 'meal',
+    'location': 'location', 'loc': 'location',
+    'earliest': 'earliest', 'from': 'earliest',
+    'latest': 'latest', 'to': 'latest',
+    'details': 'details', 'info': 'details', 'notes': 'details',
+    'fee': 'fee', 'delivery fee': 'fee',
+}
+REQUIRED_FIELDS = ('meal', 'location', 'earliest', 'latest', 'fee')
+
+_LINE_PATTERN = re.compile(r'^\s*([A-Za-z ]+?)\s*:\s*(.*?)\s*$')
+
+def parse_quick_order(text: str) -> dict:
+    """
+    Parses "Label: value" lines into order fields. Returns an empty dict
+    if the text does not look like a single-message order.
+    """
+    fields = {}
+    for line in text.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if not match:
+            continue
+        field = FIELD_ALIASES.get(match.group(1).lower())
+        if field:
+            fields[field] = match.group(2)
+    return fields
+
+def is_quick_order(text: str) -> bool:
+    fields = parse_quick_order(text)
+    return 'meal' in fields and 'fee' in fields
+
+async def handle_quick_order(update: Update, context: CallbackContext, text: str):
+    """
+    Validates a whole order sent in one message and jumps straight to confirmation.
+    All problems are reported in a single reply.
+    """
+    user_id = update.effective_user.id
+    fields = parse_quick_order(text)
+    fields.setdefault('details', 'none')
+
+    errors = [f"Missing *{field}*." for field in REQUIRED_FIELDS if not fields.get(field)]
+    order = {}
+    if not errors:
+        order['meal'], meal_error = validate_meal(fields['meal'])
+        order['location'], location_error = validate_location(fields['location'])
+        order['earliest_dt'], earliest_error = validate_earliest_time(fields['earliest'])
+        latest_error = None
+        if order['earliest_dt']:
+            order['latest_dt'], latest_error = validate_latest_time(fields['latest'], order['earliest_dt'])
+        order['details'], details_error = validate_details(fields['details'])
+        order['delivery_fee'], fee_error = validate_fee(fields['fee'])
+        errors = [e for e in (meal_error, location_error, earliest_error, latest_error, details_error, fee_error) if e]
+
+    if errors:
+        await update.message.reply_text(
+            "\n".join(errors) + "\n\n" + messages.QUICK_ORDER_FORMAT,
+            parse_mode="Markdown",
+            reply_markup=get_cancel_keyboard(user_id)
+        )
+        return False
+
+    order['earliest_input'] = fields['earliest']
+    order['latest_input'] = fields['latest']
+    user_orders[user_id] = order
+    user_states[user_id] = {'state': 'awaiting_order_confirmation'}
+    await handle_confirmation_input(update, context)
+    return True
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from controllers.time_validation import validate_strict_time_format
+from models.database import SGT
+from views import messages
+
+# Validation rules for the order fields, shared by the step-by-step flow and the
+# single-message order. Each validator returns (value, error_message).
+
+MAX_MEAL_LENGTH = 100
+MAX_LOCATION_LENGTH = 100
+MAX_DETAILS_LENGTH = 500
+MAX_FEE_LENGTH = 4
+MIN_FEE = 1.0
+MAX_FEE = 5.0
+
+def validate_meal(text: str):
+    if not text or len(text) > MAX_MEAL_LENGTH:
+        return None, messages.ORDER_TOO_LONG.format(max_length=MAX_MEAL_LENGTH, order_length=len(text))
+    return text, None
+
+def validate_location(text: str):
+    if not text or len(text) > MAX_LOCATION_LENGTH:
+        return None, messages.ORDER_TOO_LONG.format(max_length=MAX_LOCATION_LENGTH, order_length=len(text))
+    return text, None
+
+def validate_earliest_time(text: str):
+    earliest_dt = validate_strict_time_format(text)
+    if not earliest_dt:
+        return None, "Invalid time format. Please use MM-DD HH:MMam/pm."
+    now = datetime.now(SGT)
+    if earliest_dt < now or earliest_dt > now + timedelta(days=7):
+        return None, "Earliest pickup time must be in the future and within the next 7 days."
+    return earliest_dt, None
+
+def validate_latest_time(text: str, earliest_dt: datetime):
+    latest_dt = validate_strict_time_format(text)
+    if not latest_dt:
+        return None, "Invalid time format. Please use MM-DD HH:MMam/pm."
+    if latest_dt <= earliest_dt or latest_dt - earliest_dt > timedelta(hours=3):
+        return None, "Latest pickup time must be after the earliest time and within 3 hours."
+    return latest_dt, None
+
+def validate_details(text: str):
+    if not text or len(text) > MAX_DETAILS_LENGTH:
+        return None, messages.ORDER_DETAILS_TOO_LONG.format(max_length=MAX_DETAILS_LENGTH, order_length=len(text))
+    return text, None
+
+def validate_fee(text: str):
+    if len(text) > MAX_FEE_LENGTH:
+        return None, messages.ORDER_DETAILS_TOO_LONG.format(max_length=MAX_FEE_LENGTH, order_length=len(text))
+    try:
+        fee_amount = float(text)
+    except ValueError:
+        return None, "❌ Please enter a *valid number* for the delivery fee. Example: `1.50`"
+    if fee_amount < MIN_FEE:
+        return None, "💸 Delivery fee must be at least *$1.00*. Please enter a higher amount."
+    if fee_amount > MAX_FEE:
+        return None, "Stop the cap"
+    return text, None
@@ -0,0 +1,120 @@
+import os
+import time
+from collections import OrderedDict
+from telegram import Update
+from telegram.ext import CallbackContext, ApplicationHandlerStop
+
+from utils.rate_limit import TokenBucketLimiter
+from utils import metrics
+from controllers.order_state import user_states
+
+# Per-command budgets as "<requests>/<seconds>": a user may burst up to <requests>
+# calls, refilled evenly over <seconds>. Override with e.g.
+# RATE_LIMITS="vieworders=10/60,order=3/60".
+DEFAULT_RATE_LIMITS = {
+    "vieworders": "6/60",
+    "order": "4/60",
+    "claim": "6/60",
+    "myorders": "6/60",
+    "myclaims": "6/60",
+    "report": "3/300",
+    "inline": "30/60",
+    "search": "10/60",
+    "free": "10/60",
+}
+
+# Callback data of menu buttons that trigger the same work as a command.
+BUTTON_BUDGETS = {
+    "vieworders": "vieworders",
+    "order": "order",
+    "claim": "claim",
+    "myorders": "myorders",
+    "myclaims": "myclaims",
+    "report_issue": "report",
+    "report_user": "report",
+}
+
+# Conversation states in which a plain text reply is charged like the command that asked for it.
+STATE_BUDGETS = {
+    "awaiting_order_id": "claim",
+}
+
+RATE_LIMITED_MESSAGE = "⏳ You're doing that too often. Please wait a moment and try again."
+# A rejected user is told at most once per this many seconds; further rejections are silent.
+RATE_LIMIT_NOTICE_SECONDS = 30
+
+def _parse_rate_limits(raw: str) -> dict:
+    limits = dict(DEFAULT_RATE_LIMITS)
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        name, _, budget = item.partition("=")
+        limits[name.strip()] = budget.strip()
+    return limits
+
+def _build_limiters(limits: dict) -> dict:
+    limiters = {}
+    for name, budget in limits.items():
+        requests, _, seconds = budget.partition("/")
+        limiters[name] = TokenBucketLimiter(float(requests), float(requests) / float(seconds))
+    return limiters
+
+limiters = _build_limiters(_parse_rate_limits(os.getenv("RATE_LIMITS", "")))
+_last_notice = OrderedDict()  # user_id -> monotonic time of the last "too often" reply
+
+for _name, _limiter in limiters.items():
+    metrics.register_gauge("ratelimit.tracked_users", _limiter.__len__, command=_name)
+
+def classify_update(update: Update):
+    """Returns the budget an update is charged to, or None if it is not rate limited."""
+    if update.inline_query:
+        return "inline"
+    if update.callback_query:
+        data = update.callback_query.data or ""
+        if data.startswith("reporting_user_"):
+            return "report"
+        return BUTTON_BUDGETS.get(data)
+    if not (update.message and update.message.text):
+        return None
+    if update.message.text.startswith("/"):
+        command, *args = update.message.text.split()
+        command = command[1:].split("@", 1)[0].lower()
+        if command == "start" and args and args[0].startswith("claim_"):
+            # Deep link from the "Claim" button under a channel post.
+            return "claim"
+        return command if command in limiters else None
+    if update.effective_user:
+        state = user_states.get(update.effective_user.id, {}).get("state")
+        return STATE_BUDGETS.get(state)
+    return None
+
+def _should_notify(user_id) -> bool:
+    now = time.monotonic()
+    last = _last_notice.pop(user_id, None)
+    if last is not None and now - last < RATE_LIMIT_NOTICE_SECONDS:
+        _last_notice[user_id] = last
+        return False
+    _last_notice[user_id] = now
+    if len(_last_notice) > 10000:
+        _last_notice.popitem(last=False)
+    return True
+
+async def enforce_rate_limits(update: Update, context: CallbackContext):
+    """
+    Runs before every other handler. Charges the update to its command's token
+    bucket and stops processing if the user is over budget.
+    """
+    budget = classify_update(update)
+    if budget is None or not update.effective_user:
+        return
+    if limiters[budget].allow(update.effective_user.id):
+        return
+
+    metrics.inc("ratelimit.rejected", command=budget)
+    if update.callback_query:
+        # The query has to be answered anyway; the alert text costs nothing extra.
+        await update.callback_query.answer(RATE_LIMITED_MESSAGE)
+    elif update.inline_query:
+        # Personal, so the empty result is not cached for other users typing the same query.
+        await update.inline_query.answer([], cache_time=5, is_personal=True)
+    elif _should_notify(update.effective_user.id):
+        await update.message.reply_text(RATE_LIMITED_MESSAGE)
+    raise ApplicationHandlerStop
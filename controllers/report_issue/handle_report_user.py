@@ -1,7 +1,7 @@
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import CallbackContext
-from models.database import session_local
-from models.order_model import Order
+from models.database import get_read_session
+from models.order_queries import recent_orders_with_counterparty
 from utils.utils import get_main_menu
 
 async def handle_report_user(update: Update, context: CallbackContext):
@@ -12,29 +12,8 @@ async def handle_report_user(update: Update, context: CallbackContext):
     user_id = update.effective_user.id
     message = update.message if update.message else update.callback_query.message
     
-    session = session_local()
-    orders_as_orderers = session.query(Order).filter(
-        (Order.user_id == user_id) & (Order.runner_id.isnot(None))
-    ).order_by(Order.order_placed_time.desc()).limit(3).all()
-    
-    orders_as_runners = session.query(Order).filter(
-        (Order.runner_id == user_id) 
-    ).order_by(Order.order_placed_time.desc()).limit(3).all()
-    session.close()
-    
-    orders = []
-    for order in orders_as_orderers:
-        orders.append({
-            "id": order.id ,
-            "details": order.order_text,
-            "handle": order.runner_handle
-            })
-    for order in orders_as_runners:
-        orders.append({
-            "id": order.id,
-            "details": order.order_text,
-            "handle": order.user_handle
-        })
+    session = get_read_session(user_id)
+    orders = recent_orders_with_counterparty(session, user_id)
     
     if not orders:
         await message.reply_text(
@@ -46,11 +25,11 @@ async def handle_report_user(update: Update, context: CallbackContext):
     else:
         details_message = "Here are your recent orders:\n\n"
         for order in orders:
-            details_message += f"Order Id: {order['id']}\nDetails: {order['details']}\n\n"
+            details_message += f"Order Id: {order.id}\nDetails: {order.order_text}\n\n"
         details_message += "Please select the user you would like to report: "
         
         keyboard = [[
-            InlineKeyboardButton(f"Order Id: {order['id']} | Handle: {order['handle']}", callback_data=f"reporting_user_{order['id']}_{order['handle']}")
+            InlineKeyboardButton(f"Order Id: {order.id} | Handle: {order.handle}", callback_data=f"reporting_user_{order.id}_{order.handle}")
         ] for order in orders]
     
         reply_markup = InlineKeyboardMarkup(keyboard)
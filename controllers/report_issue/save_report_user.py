@@ -1,32 +1,50 @@
 from telegram import Update
 from telegram.ext import CallbackContext
 from telegram.helpers import escape_markdown
-from models.database import session_local
-from models.order_model import ReportUser, Order
+from models.database import get_session
+from models.order_model import Order
+from models.moderation import record_report, apply_suspensions
+from models.outbox import enqueue_message
 from controllers.order_state import user_states
-from utils.utils import get_main_menu
+from utils.utils import get_main_menu, ADMIN_IDS
 
 async def save_report_user(update: Update, context: CallbackContext):
     user_id = update.effective_user.id
     message = update.message if update.message else update.callback_query.message
     
-    session = session_local()
+    session = get_session()
     
     order_id = user_states[user_id]['order_id']
     order = session.query(Order).filter(Order.id == order_id).first()
-    reported_user_id = order.runner_id if order.user_id == user_id else order.orderer_id
+    if not order or user_id not in (order.user_id, order.runner_id):
+        user_states.pop(user_id, None)
+        await message.reply_text(
+            "❌ This order cannot be reported.",
+            reply_markup=get_main_menu()
+        )
+        return
+
+    reported_user_id = order.runner_id if order.user_id == user_id else order.user_id
     reported_user_handle = order.runner_handle if order.user_id == user_id else order.user_handle
-    
-    new_report = ReportUser(
-            reporter_id=user_id,
-            order_id=order_id,
-            reported_user_id=reported_user_id,
-            reason=message.text,
+    if reported_user_id is None:
+        user_states.pop(user_id, None)
+        await message.reply_text(
+            "❌ There is no other user on this order to report.",
+            reply_markup=get_main_menu()
         )
+        return
     
-    session.add(new_report)
+    suspended = record_report(session, user_id, order_id, reported_user_id, message.text)
+    if suspended:
+        for admin_id in ADMIN_IDS:
+            enqueue_message(
+                session,
+                chat_id=admin_id,
+                text=f"🚫 User {reported_user_id} (@{reported_user_handle}) was suspended automatically. Use /moderation {reported_user_id} to review."
+            )
     session.commit()
-    session.close()
+    if suspended:
+        apply_suspensions(suspended=[reported_user_id])
     
     del user_states[user_id]
     
@@ -43,4 +61,4 @@ async def save_report_user(update: Update, context: CallbackContext):
         report_summary,
         parse_mode="Markdown",
         reply_markup=get_main_menu()
-    )
\ No newline at end of file
+    )
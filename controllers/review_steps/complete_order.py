@@ -0,0 +1,52 @@
+from telegram import Update
+from telegram.ext import CallbackContext
+from models.database import get_session
+from models.order_model import Order
+from models.order_status import CLAIMED, COMPLETED
+from models.outbox import enqueue_message
+from utils.user_view_cache import user_view_cache
+from utils.utils import get_main_menu, get_rating_keyboard
+from views import messages
+
+async def complete_order(update: Update, context: CallbackContext, order_id: int):
+    """
+    Marks a claimed order as received by the orderer, lets the runner know and
+    asks the orderer to rate the runner.
+    """
+    user_id = update.effective_user.id
+    message = update.callback_query.message
+
+    session = get_session()
+    order = session.query(Order).filter(
+        Order.id == order_id, Order.user_id == user_id, Order.has_status(CLAIMED, COMPLETED)
+    ).with_for_update().first()
+    if not order or not order.runner_id:
+        # End the transaction first so the row lock is not held while replying.
+        session.rollback()
+        await message.reply_text(
+            "❌ This order cannot be marked as received.",
+            reply_markup=get_main_menu()
+        )
+        return
+
+    if order.status == CLAIMED:
+        order.transition_to(COMPLETED, actor_id=user_id)
+        enqueue_message(
+            session,
+            chat_id=order.runner_id,
+            text=messages.ORDER_COMPLETION_NOTIFICATION.format(order_id=order.id),
+            parse_mode="Markdown"
+        )
+        runner_id = order.runner_id
+        session.commit()
+        # Completed orders drop out of the runner's active claims.
+        user_view_cache.invalidate("claims", runner_id)
+    else:
+        # Already completed (e.g. the button was pressed twice); nothing to write.
+        session.rollback()
+
+    await message.reply_text(
+        messages.RATE_RUNNER_PROMPT.format(order_id=order_id),
+        parse_mode="Markdown",
+        reply_markup=get_rating_keyboard(order_id)
+    )
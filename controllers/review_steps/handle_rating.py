@@ -0,0 +1,48 @@
+from telegram import Update
+from telegram.ext import CallbackContext
+from sqlalchemy.exc import IntegrityError
+from models.database import get_session
+from models.order_model import Order, RunnerReview
+from models.order_status import COMPLETED
+from models.reviews import record_review
+from utils.utils import get_main_menu
+from views import messages
+
+async def handle_rating(update: Update, context: CallbackContext, order_id: int, rating: int):
+    """
+    Saves the orderer's rating of the runner for a completed order.
+    """
+    user_id = update.effective_user.id
+    message = update.callback_query.message
+
+    if rating < 1 or rating > 5:
+        await message.reply_text("❌ Please pick a rating from 1 to 5.", reply_markup=get_main_menu())
+        return
+
+    session = get_session()
+    order = session.query(Order).filter(Order.id == order_id, Order.user_id == user_id, Order.has_status(COMPLETED)).first()
+    if not order or not order.runner_id:
+        await message.reply_text(
+            "❌ You can only rate runners of orders you have received.",
+            reply_markup=get_main_menu()
+        )
+        return
+
+    if session.query(RunnerReview.id).filter_by(order_id=order_id).first():
+        await message.reply_text(messages.ALREADY_RATED, reply_markup=get_main_menu())
+        return
+
+    try:
+        record_review(session, order, float(rating))
+        session.commit()
+    except IntegrityError:
+        # A second tap (or a duplicate callback) saved its review after our check above.
+        session.rollback()
+        await message.reply_text(messages.ALREADY_RATED, reply_markup=get_main_menu())
+        return
+
+    await message.edit_text(
+        messages.REVIEW_THANKS.format(order_id=order_id, rating=rating),
+        parse_mode="Markdown",
+        reply_markup=get_main_menu()
+    )
@@ -4,7 +4,8 @@ from telegram.ext import CallbackContext
 from telegram.helpers import escape_markdown
 
 from models.order_model import Order
-from models.database import session_local, SGT
+from models.order_status import OPEN
+from models.database import get_read_session, SGT
 from controllers.order_state import user_states
 from utils.utils import get_main_menu
 from views import messages
@@ -24,9 +25,8 @@ async def start(update: Update, context: CallbackContext):
 
     if args and args[0].startswith("claim_"):
         order_id = args[0].split("_")[1]
-        session = session_local()
-        order = session.query(Order).filter_by(id=order_id, claimed=False).first()
-        session.close()
+        session = get_read_session(user_id)
+        order = session.query(Order).filter(Order.id == order_id, Order.has_status(OPEN)).first()
 
         if order:
             user_states[user_id] = {"state": "awaiting_claim_confirmation", "order_id": int(order_id)}
@@ -0,0 +1,111 @@
+"""
+Runs the bot as one update ingress plus WORKER_COUNT worker processes.
+
+The ingress is the only process that polls Telegram. Each update is routed to a
+worker by `effective_user.id`, so a user's conversation state, rate-limit bucket
+and read-your-writes window always live in the same process. Claims are still
+arbitrated by the database. Jobs that act on shared state (expiry, the outbox)
+run only on the worker holding the scheduler lease; per-process caches are
+refreshed by every worker. The "my orders" / "my claims" cache follows the order
+events every worker logs, so a change made elsewhere (an expiry on the leader, a
+claim on another worker) shows up within USER_VIEW_CACHE_SYNC_SECONDS, and within
+USER_VIEW_CACHE_TTL_SECONDS at worst.
+"""
+import os
+import socket
+import asyncio
+import logging
+import multiprocessing
+from datetime import datetime
+from telegram import Bot, Update
+from telegram.error import TelegramError
+
+from models.leader import LeaderElection, LEADER_LEASE_SECONDS
+from tasks.refresh_user_views import refresh_user_views
+from utils.bot_requests import build_get_updates_request
+from utils.tenants import tenant_scope
+from utils.user_view_cache import USER_VIEW_CACHE_SYNC_SECONDS
+
+WORKER_QUEUE_SIZE = int(os.getenv("WORKER_QUEUE_SIZE", "1000"))
+POLL_TIMEOUT_SECONDS = 30
+
+def worker_for(update: Update, worker_count: int) -> int:
+    """Index of the worker that owns the update's user. Updates without a user go to worker 0."""
+    user = update.effective_user
+    return user.id % worker_count if user else 0
+
+async def _run_worker(index: int, tenant, queue, build_application, start_scheduler):
+    app = build_application(tenant, updater=False)
+    election = LeaderElection("scheduler", f"{socket.gethostname()}:{os.getpid()}")
+    async with app:
+        await app.start()
+        await election.renew()
+        scheduler = start_scheduler({tenant.id: app.bot}, leader_only=election.leader_only)
+        scheduler.add_job(election.renew, 'interval', seconds=max(LEADER_LEASE_SECONDS / 3, 1))
+        scheduler.add_job(refresh_user_views, 'interval', seconds=USER_VIEW_CACHE_SYNC_SECONDS, next_run_time=datetime.now())
+        logging.info(f"Worker {index} started (pid {os.getpid()})")
+
+        loop = asyncio.get_running_loop()
+        while True:
+            data = await loop.run_in_executor(None, queue.get)
+            if data is None:
+                break
+            await app.update_queue.put(Update.de_json(data, app.bot))
+
+        scheduler.shutdown(wait=False)
+        await app.stop()
+
+def _worker_main(index: int, tenant, queue, build_application, start_scheduler):
+    with tenant_scope(tenant.id):
+        asyncio.run(_run_worker(index, tenant, queue, build_application, start_scheduler))
+
+async def _ingress(token: str, queues):
+    """Long-polls Telegram and hands each update to its user's worker."""
+    async with Bot(token=token, get_updates_request=build_get_updates_request()) as bot:
+        await bot.delete_webhook()
+        offset = None
+        while True:
+            try:
+                updates = await bot.get_updates(
+                    offset=offset,
+                    timeout=POLL_TIMEOUT_SECONDS,
+                    allowed_updates=Update.ALL_TYPES
+                )
+            except TelegramError as e:
+                logging.warning(f"Polling failed, retrying: {e}")
+                await asyncio.sleep(1)
+                continue
+            for update in updates:
+                offset = update.update_id + 1
+                # Blocks when the worker is behind, which in turn slows down polling.
+                await asyncio.to_thread(queues[worker_for(update, len(queues))].put, update.to_dict())
+
+def run_fleet(tenant, worker_count: int, build_application, start_scheduler):
+    """
+    Starts `worker_count` workers and runs the ingress in this process until interrupted.
+    The fleet serves a single tenant (utils/tenants.py). `build_application(tenant, updater=False)`
+    must return an Application with all handlers added; `start_scheduler({tenant_id: bot},
+    leader_only)` must start and return the worker's scheduler.
+    Cached user listings may lag writes made by other workers by up to
+    USER_VIEW_CACHE_SYNC_SECONDS (see the module docstring).
+    """
+    # Workers are spawned rather than forked so none of them inherits the parent's
+    # database connections or event loop.
+    context = multiprocessing.get_context("spawn")
+    queues = [context.Queue(WORKER_QUEUE_SIZE) for _ in range(worker_count)]
+    workers = [
+        context.Process(target=_worker_main, args=(index, tenant, queue, build_application, start_scheduler), name=f"worker-{index}")
+        for index, queue in enumerate(queues)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        asyncio.run(_ingress(tenant.token, queues))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for queue in queues:
+            queue.put(None)
+        for worker in workers:
+            worker.join(timeout=10)
@@ -1,32 +1,281 @@
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, Sequence, ForeignKey, Float, BigInteger, DateTime
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import create_engine, event, Column, Integer, String, Boolean, Sequence, ForeignKey, Float, BigInteger, DateTime
+from sqlalchemy.engine import make_url
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import relationship, declarative_base, Session, with_loader_criteria
 # from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import logging
 import os
+import time
+import weakref
 from dotenv import load_dotenv
 from datetime import datetime
 import pytz
 
+from utils import metrics
+from utils.tenants import DEFAULT_TENANT_ID, current_tenant, current_tenant_id
+
 # Load environment variables
 load_dotenv()
 
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL')
+# Optional read replica for browsing and history queries
+REPLICA_DATABASE_URL = os.getenv('REPLICA_DATABASE_URL')
+# After a user writes, their reads stay on the primary for this many seconds
+READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', '10'))
+
+# Connection pool configuration
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # seconds, -1 disables recycling
+# Pre-ping costs one extra round-trip per checkout. With a recycle interval shorter
+# than the server's idle timeout it can usually be turned off.
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+
+# Single-node SQLite profile (DATABASE_URL=sqlite:///smuth.db). WAL lets readers run
+# alongside the single writer; synchronous=NORMAL is durable in WAL mode except for the
+# last transactions on power loss; writers wait up to the busy timeout for the lock
+# instead of failing straight away.
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', str(64 * 1024)))
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe("db.pool.checkout_wait_seconds", time.perf_counter() - start)
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def build_engine(url: str):
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        # A local file cannot go away underneath the pool.
+        pool_pre_ping=DB_POOL_PRE_PING and not is_sqlite,
+        # Connections move between the event loop and scheduler threads.
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+    )
+    if is_sqlite:
+        event.listen(engine, "connect", _configure_sqlite)
+    return engine
+
+class TrackedSession(Session):
+    """Session that reports itself as leaked if it is garbage collected without being closed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._open_flag = [True]
+        metrics.inc("db.sessions.opened")
+        weakref.finalize(self, _report_leak, self._open_flag)
+
+    def close(self):
+        if self._open_flag[0]:
+            self._open_flag[0] = False
+            metrics.inc("db.sessions.closed")
+        super().close()
+
+def _report_leak(open_flag):
+    if open_flag[0]:
+        metrics.inc("db.sessions.leaked")
+        logging.warning("A database session was garbage collected without being closed")
 
 # Initialize SQLAlchemy components
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = build_engine(DATABASE_URL)
+replica_engine = build_engine(REPLICA_DATABASE_URL) if REPLICA_DATABASE_URL else None
 Base = declarative_base()
-session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# user_id -> monotonic time of that user's last committed write
+_last_write_at = {}
+
+def _is_replica_safe(clause) -> bool:
+    # Plain SELECTs only: writes, locking reads and raw text always need the primary.
+    return clause is not None and clause.is_select and getattr(clause, "_for_update_arg", None) is None
+
+class RoutingSession(TrackedSession):
+    """
+    Sends plain SELECTs to the replica when the session was created with `use_replica`
+    (see get_read_session). Everything else, and every other session, uses the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if replica_engine is not None and self.info.get("use_replica") and _is_replica_safe(clause):
+            return replica_engine
+        return engine
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_session_wrote(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_user_write(session):
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and user_id is not None:
+        now = time.monotonic()
+        _last_write_at[user_id] = now
+        if len(_last_write_at) > 10000:
+            for uid, written_at in list(_last_write_at.items()):
+                if now - written_at > READ_YOUR_WRITES_SECONDS:
+                    del _last_write_at[uid]
+
+def wrote_recently(user_id) -> bool:
+    written_at = _last_write_at.get(user_id)
+    return written_at is not None and time.monotonic() - written_at < READ_YOUR_WRITES_SECONDS
+
+class TenantScoped:
+    """
+    Mixin for tables holding per-tenant rows. New rows belong to the scoped tenant, and
+    inside a tenant scope every ORM query only sees that tenant's rows (see below).
+    """
+    tenant_id = Column(String, nullable=False, default=lambda: current_tenant().id, server_default=DEFAULT_TENANT_ID, index=True)
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _filter_by_tenant(execute_state):
+    tenant_id = current_tenant_id()
+    if (
+        tenant_id is None
+        or not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+    ):
+        return
+    # tenant_id is a closure variable, so it becomes a bound parameter and the cached
+    # statement is shared by all tenants.
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(TenantScoped, lambda cls: cls.tenant_id == tenant_id, include_aliases=True)
+    )
+
+session_local = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
+metrics.register_gauge("db.pool.checked_out", lambda: engine.pool.checkedout())
+metrics.register_gauge("db.pool.size", lambda: engine.pool.size())
+metrics.register_gauge("db.pool.overflow", lambda: engine.pool.overflow())
+if replica_engine is not None:
+    metrics.register_gauge("db.pool.checked_out", lambda: replica_engine.pool.checkedout(), role="replica")
 
 SGT = pytz.timezone("Asia/Singapore")
 
+class SGTDateTime(TypeDecorator):
+    """
+    Timezone-aware DateTime that behaves the same on every backend. Backends without
+    time zones (SQLite) store the SGT wall time and hand it back as an aware SGT value,
+    so Python-side comparisons and formatting never see naive datetimes.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        # Same instant either way; SQLite keeps only the wall time, which must be SGT.
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(SGT)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = SGT.localize(value)
+        return value
+
+# Session belonging to the update (or job) currently being processed.
+_current_session = ContextVar("current_session", default=None)
+
+@contextmanager
+def session_scope(user_id=None):
+    """
+    Unit of work: commits on success, rolls back on error and always closes.
+    Nested scopes reuse the outer session so a whole update shares one connection.
+    """
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+
+    session = session_local()
+    session.info["user_id"] = user_id
+    token = _current_session.set(session)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        _current_session.reset(token)
+        read_session = session.info.pop("read_session", None)
+        if read_session is not None:
+            read_session.close()
+        session.close()
+
+def clear_current_session():
+    """
+    Makes `session_scope` open its own session in the current context instead of joining
+    the enclosing update's. For tasks that are shared by, or outlive, the update that
+    started them; a task runs in a copy of its creator's context, so the creator keeps its session.
+    """
+    _current_session.set(None)
+
+def get_session():
+    """Returns the session of the current update. Handlers must run inside `session_scope`."""
+    session = _current_session.get()
+    if session is None:
+        raise RuntimeError("No active database session. Wrap the handler with per_update_session.")
+    return session
+
+def get_read_session(user_id=None):
+    """
+    Returns a session for read-only queries of the current update. It reads from the
+    replica, unless there is none or the user wrote within the read-your-writes window,
+    in which case it is the update's own session. The replica session is separate and
+    closed with the update's, so writes through get_session() are never affected by it.
+    """
+    session = get_session()
+    if replica_engine is None or (user_id is not None and wrote_recently(user_id)):
+        metrics.inc("db.reads.routed", target="primary")
+        return session
+    metrics.inc("db.reads.routed", target="replica")
+    read_session = session.info.get("read_session")
+    if read_session is None:
+        read_session = session.info["read_session"] = session_local(info={"use_replica": True})
+    return read_session
+
+def per_update_session(callback):
+    """Wraps a handler or job so it runs inside its own `session_scope`."""
+    @functools.wraps(callback)
+    async def wrapper(*args, **kwargs):
+        user = getattr(args[0], "effective_user", None) if args else None
+        with session_scope(user_id=user.id if user else None):
+            return await callback(*args, **kwargs)
+    return wrapper
+
 # Get a session to interact with the database
 def get_db():
-    db = session_local()
-    try:
+    with session_scope() as db:
         yield db
-    finally:
-        db.close()
 
 def create_tables():
     """Creates all tables in the database if they do not already exist."""
@@ -0,0 +1,66 @@
+import os
+import logging
+import functools
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+from models.database import session_scope, SGT
+from models.order_model import SchedulerLease
+from utils import metrics
+
+LEADER_LEASE_SECONDS = int(os.getenv("LEADER_LEASE_SECONDS", "30"))
+
+def try_acquire_lease(session, name: str, holder: str, lease_seconds: int = LEADER_LEASE_SECONDS) -> bool:
+    """
+    Takes or renews the named lease if it is free, expired or already ours. The
+    check and the update are one conditional UPDATE, so two workers cannot both win.
+    """
+    now = datetime.now(SGT)
+    expires_at = now + timedelta(seconds=lease_seconds)
+    updated = session.query(SchedulerLease).filter(
+        SchedulerLease.name == name,
+        or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now)
+    ).update({SchedulerLease.holder: holder, SchedulerLease.expires_at: expires_at}, synchronize_session=False)
+    if updated:
+        return True
+    if session.get(SchedulerLease, name) is not None:
+        return False
+    try:
+        with session.begin_nested():
+            session.add(SchedulerLease(name=name, holder=holder, expires_at=expires_at))
+    except IntegrityError:
+        # Another worker created the lease first.
+        return False
+    return True
+
+class LeaderElection:
+    """
+    Keeps `is_leader` up to date for one worker. `renew` has to run more often than
+    LEADER_LEASE_SECONDS so the leader never lets its lease lapse while still acting on it.
+    """
+
+    def __init__(self, name: str, holder: str):
+        self.name = name
+        self.holder = holder
+        self.is_leader = False
+
+    async def renew(self):
+        try:
+            with session_scope() as session:
+                is_leader = try_acquire_lease(session, self.name, self.holder)
+        except Exception as e:
+            logging.warning(f"Could not renew the {self.name!r} lease: {e}")
+            is_leader = False
+        if is_leader != self.is_leader:
+            logging.info(f"{self.holder} {'acquired' if is_leader else 'lost'} the {self.name!r} lease")
+            metrics.inc("leader.changes", lease=self.name)
+        self.is_leader = is_leader
+
+    def leader_only(self, job):
+        """Wraps a scheduler job so it only runs while this worker holds the lease."""
+        @functools.wraps(job)
+        async def wrapper(*args, **kwargs):
+            if self.is_leader:
+                return await job(*args, **kwargs)
+        return wrapper
@@ -0,0 +1,86 @@
+import os
+from sqlalchemy import func
+
+from models.order_model import ReportUser, SuspendedUser
+
+# Moderation is shared across tenants. A Telegram account is the same person on every
+# campus bot, so reports from all campuses count towards one threshold and a suspension
+# applies on every bot. That is why report_user and suspended_users have no tenant_id.
+
+# Distinct reporters with pending reports needed to suspend a user automatically.
+MODERATION_REPORT_THRESHOLD = int(os.getenv("MODERATION_REPORT_THRESHOLD", "3"))
+
+# Telegram IDs of suspended users, checked at the start of every update without touching the DB.
+suspended_user_ids = set()
+
+def load_suspended_users(session):
+    """Replaces the in-memory blocklist with the current contents of suspended_users."""
+    user_ids = {user_id for (user_id,) in session.query(SuspendedUser.user_id)}
+    suspended_user_ids.clear()
+    suspended_user_ids.update(user_ids)
+    return suspended_user_ids
+
+def is_suspended(user_id) -> bool:
+    return user_id in suspended_user_ids
+
+def pending_reporter_count(session, reported_user_id) -> int:
+    return session.query(func.count(func.distinct(ReportUser.reporter_id))).filter(
+        ReportUser.reported_user_id == reported_user_id,
+        ReportUser.status == 'pending'
+    ).scalar()
+
+def record_report(session, reporter_id, order_id, reported_user_id, reason) -> bool:
+    """
+    Saves a report and suspends the reported user once MODERATION_REPORT_THRESHOLD
+    distinct users have pending reports against them. Returns True if this report
+    triggered a suspension. The caller commits and then calls `apply_suspensions`.
+    """
+    session.add(ReportUser(
+        reporter_id=reporter_id,
+        order_id=order_id,
+        reported_user_id=reported_user_id,
+        reason=reason,
+    ))
+    session.flush()
+    if session.get(SuspendedUser, reported_user_id):
+        return False
+    reporters = pending_reporter_count(session, reported_user_id)
+    if reporters < MODERATION_REPORT_THRESHOLD:
+        return False
+    suspend(session, reported_user_id, reason=f"Automatic: reported by {reporters} users")
+    return True
+
+def suspend(session, user_id, reason=None, suspended_by=None):
+    if session.get(SuspendedUser, user_id) is None:
+        session.add(SuspendedUser(user_id=user_id, reason=reason, suspended_by=suspended_by))
+    session.query(ReportUser).filter(
+        ReportUser.reported_user_id == user_id,
+        ReportUser.status == 'pending'
+    ).update({ReportUser.status: 'actioned'}, synchronize_session=False)
+
+def unsuspend(session, user_id) -> bool:
+    return session.query(SuspendedUser).filter(SuspendedUser.user_id == user_id).delete() > 0
+
+def dismiss_reports(session, user_id) -> int:
+    return session.query(ReportUser).filter(
+        ReportUser.reported_user_id == user_id,
+        ReportUser.status == 'pending'
+    ).update({ReportUser.status: 'dismissed'}, synchronize_session=False)
+
+def apply_suspensions(suspended=(), unsuspended=()):
+    """Updates the in-memory blocklist after the transaction that changed it has committed."""
+    suspended_user_ids.update(suspended)
+    suspended_user_ids.difference_update(unsuspended)
+
+def pending_report_summary(session, limit: int = 10):
+    """Users with pending reports, most distinct reporters first."""
+    return session.query(
+        ReportUser.reported_user_id,
+        func.count(ReportUser.id),
+        func.count(func.distinct(ReportUser.reporter_id))
+    ).filter(ReportUser.status == 'pending').group_by(ReportUser.reported_user_id) \
+        .order_by(func.count(func.distinct(ReportUser.reporter_id)).desc()).limit(limit).all()
+
+def recent_reports(session, reported_user_id, limit: int = 5):
+    return session.query(ReportUser).filter(ReportUser.reported_user_id == reported_user_id) \
+        .order_by(ReportUser.timestamp.desc()).limit(limit).all()
@@ -1,6 +1,9 @@
-from sqlalchemy import Column, Integer, String, Boolean, Sequence, ForeignKey, Float, BigInteger, DateTime
-from .database import Base, SGT
+from sqlalchemy import Column, Integer, String, Boolean, Sequence, ForeignKey, Float, BigInteger, DateTime, Index, literal
+from sqlalchemy.orm import object_session
+from .database import Base, SGT, SGTDateTime, TenantScoped
+from .order_status import ORDER_STATUSES, OPEN, CLAIMED, COMPLETED, CANCELLED, EXPIRED, check_transition
 from datetime import datetime
+from utils.tenants import DEFAULT_TENANT_ID, current_tenant
 
 # Define the Order model
 class RunnerReview(Base):
@@ -12,42 +15,208 @@ class RunnerReview(Base):
     order_id = Column(Integer, ForeignKey('orders.id'), nullable=False)
     rating = Column(Float, nullable=False)  # Rating from 1 to 5
     comment = Column(String, nullable=True)
+    created_at = Column(SGTDateTime, default=lambda: datetime.now(SGT), index=True)
 
-class Order(Base):
+    __table_args__ = (
+        Index('ix_runner_reviews_order_id', 'order_id', unique=True),  # one review per order
+    )
+
+class RunnerReputation(Base):
+    """Per-runner review aggregate, updated on every review insert so reads never aggregate."""
+    __tablename__ = 'runner_reputation'
+
+    runner_id = Column(BigInteger, primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Float, nullable=False, default=0.0)
+    recent_ratings = Column(String, nullable=False, default='')  # comma-separated, oldest first
+    recent_sum = Column(Float, nullable=False, default=0.0)
+
+    @property
+    def mean_rating(self):
+        return self.rating_sum / self.review_count if self.review_count else None
+
+    @property
+    def recent_mean_rating(self):
+        count = len(self.recent_ratings.split(',')) if self.recent_ratings else 0
+        return self.recent_sum / count if count else None
+
+class Order(TenantScoped, Base):
     __tablename__ = 'orders'
     id = Column(Integer, Sequence('order_id_seq'), primary_key=True)
     order_text = Column(String, nullable=False)
     location = Column(String, nullable=True)
     time = Column(String, nullable=True)
-    earliest_pickup_time = Column(DateTime(timezone=True), nullable=True)
-    latest_pickup_time = Column(DateTime(timezone=True), nullable=True)
+    earliest_pickup_time = Column(SGTDateTime, nullable=True)
+    latest_pickup_time = Column(SGTDateTime, nullable=True)
     details = Column(String, nullable=True)
     delivery_fee = Column(String, nullable=True)
-    claimed = Column(Boolean, default=False)
-    expired = Column(Boolean, default=False)
+    status = Column(String, nullable=False, default=OPEN, server_default=OPEN)  # see models/order_status.py
+    claimed = Column(Boolean, default=False)  # superseded by status
+    expired = Column(Boolean, default=False)  # superseded by status
     user_id = Column(BigInteger, nullable=False)
     runner_id = Column(BigInteger, nullable=True)
     user_handle = Column(String, nullable=True)
     runner_handle = Column(String, nullable=True)
-    completed = Column(Boolean, nullable=False, default=False)
-    order_placed_time = Column(DateTime(timezone=True), default=lambda: datetime.now(SGT))  
-    order_claimed_time = Column(DateTime(timezone=True), nullable=True)
+    completed = Column(Boolean, nullable=False, default=False)  # superseded by status
+    order_placed_time = Column(SGTDateTime, default=lambda: datetime.now(SGT), index=True)
+    order_claimed_time = Column(SGTDateTime, nullable=True)
     channel_message_id = Column(Integer, nullable=True)
+    channel_id = Column(String, nullable=True)  # channel of the zone the order was posted in
+
+    # Only live orders are indexed: the board scans open orders by pickup time and
+    # claim checks count a runner's claimed orders.
+    __table_args__ = (
+        Index(
+            'ix_orders_open_earliest_pickup', 'earliest_pickup_time',
+            postgresql_where=(status == OPEN), sqlite_where=(status == OPEN)
+        ),
+        Index(
+            'ix_orders_claimed_runner', 'runner_id',
+            postgresql_where=(status == CLAIMED), sqlite_where=(status == CLAIMED)
+        ),
+    )
+
+    # Every UPDATE of an order is conditional on the status it was read with
+    # (`... WHERE id = ? AND status = ?`), and a conflicting change raises StaleDataError
+    # at flush. This is what keeps claims, cancellations and expiry correct where
+    # SELECT ... FOR UPDATE is a no-op, as on SQLite.
+    __mapper_args__ = {
+        "version_id_col": status,
+        "version_id_generator": False,
+    }
+
+    @classmethod
+    def has_status(cls, *statuses):
+        """
+        Filter on status with the values written into the SQL, so the planner can
+        match the partial indexes (a bound parameter does not imply their WHERE).
+        """
+        if len(statuses) == 1:
+            return cls.status == literal(statuses[0], literal_execute=True)
+        return cls.status.in_([literal(status, literal_execute=True) for status in statuses])
+
+    def transition_to(self, status: str, actor_id=None, at: datetime = None):
+        """
+        Moves the order to `status`, raising InvalidOrderTransition if that is not allowed,
+        and appends the matching OrderEvent to the order's session.
+        """
+        previous = self.status or OPEN
+        check_transition(previous, status)
+        self.status = status
+        self.claimed = status in (CLAIMED, COMPLETED)
+        self.expired = status in (CANCELLED, EXPIRED)
+        self.completed = status == COMPLETED
+        object_session(self).add(OrderEvent.for_order(self, previous, actor_id=actor_id, at=at))
+
+class OrderEvent(TenantScoped, Base):
+    """
+    Append-only log of order status changes, including placement (from_status is None).
+    Each row carries what the projections in models/order_projections.py need, so they
+    can be rebuilt from this table alone.
+    """
+    __tablename__ = 'order_events'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(Integer, nullable=False, index=True)
+    from_status = Column(String, nullable=True)
+    to_status = Column(String, nullable=False)
+    actor_id = Column(BigInteger, nullable=True)  # Telegram ID of the user who caused it; None for the scheduler
+    runner_id = Column(BigInteger, nullable=True)
+    location = Column(String, nullable=True)
+    occurred_at = Column(SGTDateTime, nullable=False, default=lambda: datetime.now(SGT))
+
+    @classmethod
+    def for_order(cls, order, from_status, actor_id=None, at: datetime = None):
+        return cls(
+            order_id=order.id,
+            from_status=from_status,
+            to_status=order.status,
+            actor_id=actor_id,
+            runner_id=order.runner_id,
+            location=order.location,
+            tenant_id=order.tenant_id,
+            occurred_at=at or datetime.now(SGT)
+        )
     
 class StripeAccount(Base):
     __tablename__ = 'stripe_accounts'
     telegram_id = Column(BigInteger, primary_key=True)
     stripe_account_id = Column(String, nullable=False)
     
+class CheckoutSession(Base):
+    """Stripe checkout session handed out for an order and amount, reused until it expires."""
+    __tablename__ = 'checkout_sessions'
+    order_id = Column(Integer, primary_key=True)
+    amount_cents = Column(Integer, primary_key=True)
+    currency = Column(String, primary_key=True)
+    stripe_session_id = Column(String, nullable=False)
+    url = Column(String, nullable=False)
+    expires_at = Column(SGTDateTime, nullable=False)
+    
 class ReportUser(Base):
+    # Not TenantScoped: moderation is shared across tenants (see models/moderation.py).
     __tablename__ = 'report_user'
     id = Column(Integer, primary_key=True, autoincrement=True)
     reporter_id = Column(BigInteger, nullable=False)
     order_id = Column(Integer, nullable=False)
-    reported_user_id = Column(BigInteger, nullable=False)
+    reported_user_id = Column(BigInteger, nullable=False, index=True)
     reason = Column(String, nullable=False)
-    timestamp = Column(DateTime(timezone=True), default=lambda: datetime.now(SGT))
+    timestamp = Column(SGTDateTime, default=lambda: datetime.now(SGT), index=True)
+    status = Column(String, nullable=False, default='pending', server_default='pending')  # 'pending', 'actioned' or 'dismissed'
+
+class SuspendedUser(Base):
+    __tablename__ = 'suspended_users'
+    user_id = Column(BigInteger, primary_key=True)
+    reason = Column(String, nullable=True)
+    suspended_by = Column(BigInteger, nullable=True)  # admin Telegram ID, NULL when suspended automatically
+    suspended_at = Column(SGTDateTime, default=lambda: datetime.now(SGT))
     
+class OutboxMessage(TenantScoped, Base):
+    __tablename__ = 'outbox_messages'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)  # 'message', 'channel_post' or 'channel_edit'
+    chat_id = Column(String, nullable=True)
+    order_id = Column(Integer, nullable=True)
+    text = Column(String, nullable=False)
+    parse_mode = Column(String, nullable=True)
+    reply_markup = Column(String, nullable=True)  # JSON-serialised InlineKeyboardMarkup
+    status = Column(String, nullable=False, default='pending')  # 'pending', 'sent', 'superseded' or 'failed'
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    created_at = Column(SGTDateTime, default=lambda: datetime.now(SGT))
+    next_attempt_at = Column(SGTDateTime, default=lambda: datetime.now(SGT))
+    sent_at = Column(SGTDateTime, nullable=True)
+
+    __table_args__ = (
+        Index('ix_outbox_messages_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+class OrderStatsHourly(TenantScoped, Base):
+    """Order counts per tenant, hour (SGT) and location, incremented by the place, claim and expire paths."""
+    __tablename__ = 'order_stats_hourly'
+    # Part of the key, so each campus bot has its own rows; the key's index serves the tenant filter.
+    tenant_id = Column(String, primary_key=True, default=lambda: current_tenant().id, server_default=DEFAULT_TENANT_ID)
+    hour = Column(SGTDateTime, primary_key=True)
+    location = Column(String, primary_key=True)
+    placed = Column(Integer, nullable=False, default=0)
+    claimed = Column(Integer, nullable=False, default=0)
+    expired = Column(Integer, nullable=False, default=0)
+    claim_seconds_sum = Column(Float, nullable=False, default=0.0)
+
+class ClaimLatencyHourly(TenantScoped, Base):
+    """Histogram of time-to-claim per tenant and hour; bucket_seconds is the bucket's upper bound."""
+    __tablename__ = 'claim_latency_hourly'
+    tenant_id = Column(String, primary_key=True, default=lambda: current_tenant().id, server_default=DEFAULT_TENANT_ID)
+    hour = Column(SGTDateTime, primary_key=True)
+    bucket_seconds = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class SchedulerLease(Base):
+    """Named lease held by the worker that runs the fleet-wide scheduler jobs."""
+    __tablename__ = 'scheduler_leases'
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(SGTDateTime, nullable=False)
+
 # class ReportBugs(Base):
 #     __tablename__ = 'report_bugs'
 #     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -0,0 +1,159 @@
+import bisect
+from collections import Counter, defaultdict
+from datetime import datetime
+from sqlalchemy import select, insert, func
+
+from models.order_model import Order, OrderEvent, OrderStatsHourly, ClaimLatencyHourly
+from models.order_status import OPEN, CLAIMED, COMPLETED, CANCELLED, EXPIRED
+from models.stats import CLAIM_LATENCY_BUCKETS, OPEN_ENDED_BUCKET, _as_sgt, _hour, _location_key
+from utils.tenants import current_tenant_id
+
+REPLAY_BATCH_SIZE = 10000
+
+# Projections are fed every OrderEvent in id order by `replay`. Each keeps only what
+# it needs, so a replay is one streaming pass in (roughly) constant memory.
+
+class BoardProjection:
+    """
+    Current status of every live (open or claimed) order; `open_order_ids` is the board.
+    Orders are dropped once they reach a final status, so memory follows the live orders
+    rather than the whole history.
+    """
+
+    FINAL_STATUSES = (COMPLETED, CANCELLED, EXPIRED)
+
+    def __init__(self):
+        self.statuses = {}  # order_id -> OPEN or CLAIMED
+        self.last_event_id = 0
+
+    def apply(self, event):
+        self.last_event_id = event.id
+        if event.to_status in self.FINAL_STATUSES:
+            self.statuses.pop(event.order_id, None)
+        else:
+            self.statuses[event.order_id] = event.to_status
+
+    @property
+    def open_order_ids(self):
+        return {order_id for order_id, status in self.statuses.items() if status == OPEN}
+
+    def write(self, session) -> int:
+        """Brings orders.status in line with the log. Returns the number of orders changed."""
+        changed = 0
+        for status in (OPEN, CLAIMED):
+            order_ids = [order_id for order_id, s in self.statuses.items() if s == status]
+            for start in range(0, len(order_ids), 1000):
+                changed += session.query(Order).filter(
+                    Order.id.in_(order_ids[start:start + 1000]), Order.status != status
+                ).update({Order.status: status}, synchronize_session=False)
+        # Final orders are no longer held in memory; the database finds them from each
+        # order's latest replayed event.
+        latest_events = select(func.max(OrderEvent.id)).where(
+            OrderEvent.id <= self.last_event_id
+        ).group_by(OrderEvent.order_id)
+        for status in self.FINAL_STATUSES:
+            order_ids = select(OrderEvent.order_id).where(
+                OrderEvent.id.in_(latest_events), OrderEvent.to_status == status
+            )
+            changed += session.query(Order).filter(
+                Order.id.in_(order_ids), Order.status != status
+            ).update({Order.status: status}, synchronize_session=False)
+        return changed
+
+class RunnerStatsProjection:
+    """Claims, given-up claims and completions per runner."""
+
+    def __init__(self):
+        self.claims = Counter()
+        self.claims_cancelled = Counter()
+        self.completions = Counter()
+
+    def apply(self, event):
+        if event.runner_id is None:
+            return
+        if event.to_status == CLAIMED:
+            self.claims[event.runner_id] += 1
+        elif event.from_status == CLAIMED and event.to_status == OPEN:
+            self.claims_cancelled[event.runner_id] += 1
+        elif event.to_status == COMPLETED:
+            self.completions[event.runner_id] += 1
+
+    def completion_rate(self, runner_id):
+        claims = self.claims[runner_id]
+        return self.completions[runner_id] / claims if claims else None
+
+class RollupProjection:
+    """Rebuilds the hourly rollups that models/stats.py maintains incrementally, per tenant."""
+
+    def __init__(self):
+        self.order_stats = defaultdict(lambda: {"placed": 0, "claimed": 0, "expired": 0, "claim_seconds_sum": 0.0})
+        self.claim_latency = Counter()
+        self.first_hour = None
+        self._placed_at = {}  # order_id -> placement time, dropped once the order is final
+
+    def apply(self, event):
+        occurred_at = _as_sgt(event.occurred_at)
+        hour = _hour(occurred_at)
+        if self.first_hour is None:
+            self.first_hour = hour
+        location = _location_key(event.location)
+        tenant_id = event.tenant_id
+
+        if event.from_status is None:
+            self._placed_at[event.order_id] = occurred_at
+            self.order_stats[(tenant_id, hour, location)]["placed"] += 1
+        elif event.to_status == CLAIMED:
+            placed_at = self._placed_at.get(event.order_id)
+            if placed_at is not None:
+                claim_seconds = max((occurred_at - placed_at).total_seconds(), 0.0)
+                row = self.order_stats[(tenant_id, hour, location)]
+                row["claimed"] += 1
+                row["claim_seconds_sum"] += claim_seconds
+                index = bisect.bisect_left(CLAIM_LATENCY_BUCKETS, claim_seconds)
+                bucket = CLAIM_LATENCY_BUCKETS[index] if index < len(CLAIM_LATENCY_BUCKETS) else OPEN_ENDED_BUCKET
+                self.claim_latency[(tenant_id, hour, bucket)] += 1
+        elif event.to_status == EXPIRED:
+            self.order_stats[(tenant_id, hour, location)]["expired"] += 1
+
+        if event.to_status in (COMPLETED, CANCELLED, EXPIRED):
+            self._placed_at.pop(event.order_id, None)
+
+    def write(self, session):
+        """
+        Replaces the rollup rows from the first replayed hour onwards: every tenant's when
+        replayed outside of a tenant scope, otherwise only the scoped tenant's.
+        """
+        if self.first_hour is None:
+            return
+        scoped_tenant_id = current_tenant_id()
+        for model in (OrderStatsHourly, ClaimLatencyHourly):
+            # Bulk deletes are not tenant-filtered by the session, so the scope is applied here.
+            stale = session.query(model).filter(model.hour >= self.first_hour)
+            if scoped_tenant_id is not None:
+                stale = stale.filter(model.tenant_id == scoped_tenant_id)
+            stale.delete(synchronize_session=False)
+        if self.order_stats:
+            session.execute(insert(OrderStatsHourly), [
+                {"tenant_id": tenant_id, "hour": hour, "location": location, **counts}
+                for (tenant_id, hour, location), counts in self.order_stats.items()
+            ])
+        if self.claim_latency:
+            session.execute(insert(ClaimLatencyHourly), [
+                {"tenant_id": tenant_id, "hour": hour, "bucket_seconds": bucket, "count": count}
+                for (tenant_id, hour, bucket), count in self.claim_latency.items()
+            ])
+
+def replay(session, projections, since_id: int = 0, batch_size: int = REPLAY_BATCH_SIZE) -> int:
+    """Streams the event log in id order through every projection. Returns the number of events."""
+    statement = select(
+        OrderEvent.id, OrderEvent.order_id, OrderEvent.from_status, OrderEvent.to_status,
+        OrderEvent.runner_id, OrderEvent.location, OrderEvent.occurred_at, OrderEvent.tenant_id
+    ).where(OrderEvent.id > since_id).order_by(OrderEvent.id)
+    result = session.execute(statement.execution_options(yield_per=batch_size, stream_results=True))
+    count = 0
+    for events in result.partitions():
+        for event in events:
+            for projection in projections:
+                projection.apply(event)
+        count += len(events)
+    return count
@@ -0,0 +1,87 @@
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import select, func, bindparam
+
+from models.database import SGT
+from models.order_model import Order
+from models.order_status import OPEN, CLAIMED, CANCELLED, EXPIRED
+
+# Read-only listings select only the columns they show and return plain tuples,
+# skipping the identity map and change tracking that full Order entities carry.
+OpenOrder = namedtuple("OpenOrder", [
+    "id", "order_text", "location", "earliest_pickup_time", "latest_pickup_time", "details", "delivery_fee"
+])
+OrderSummary = namedtuple("OrderSummary", ["id", "order_text"])
+ReportableOrder = namedtuple("ReportableOrder", ["id", "order_text", "handle"])
+
+# Hot-path statements are built once at import. Only the bind parameters change
+# between calls, so each execution skips constructing the query and hits the
+# compiled-SQL cache directly.
+_OPEN_ORDERS = select(
+    Order.id, Order.order_text, Order.location, Order.earliest_pickup_time,
+    Order.latest_pickup_time, Order.details, Order.delivery_fee
+).where(
+    Order.has_status(OPEN),
+    Order.latest_pickup_time > bindparam("now")
+).order_by(Order.earliest_pickup_time.asc())
+
+_ORDERS_PLACED_BY = select(Order.id, Order.order_text).where(
+    Order.user_id == bindparam("user_id"),
+    Order.status.notin_((CANCELLED, EXPIRED))
+)
+
+_ORDERS_CLAIMED_BY = select(Order.id, Order.order_text).where(
+    Order.runner_id == bindparam("runner_id"),
+    Order.has_status(CLAIMED)
+)
+
+_CLAIMABLE_ORDER = select(Order).where(
+    Order.id == bindparam("order_id"),
+    Order.has_status(OPEN)
+).with_for_update()
+
+_ACTIVE_CLAIM_COUNT = select(func.count()).select_from(Order).where(
+    Order.runner_id == bindparam("runner_id"),
+    Order.has_status(CLAIMED)
+)
+
+_EXPIRABLE_ORDERS = select(Order).where(
+    Order.has_status(OPEN),
+    Order.latest_pickup_time < bindparam("now")
+).order_by(Order.id).limit(bindparam("limit")).with_for_update(skip_locked=True)
+
+def open_orders(session, now: datetime = None):
+    """Unclaimed, unexpired orders whose pickup window has not passed, soonest first."""
+    rows = session.execute(_OPEN_ORDERS, {"now": now or datetime.now(SGT)}).all()
+    return [OpenOrder(*row) for row in rows]
+
+def orders_placed_by(session, user_id):
+    return [OrderSummary(*row) for row in session.execute(_ORDERS_PLACED_BY, {"user_id": user_id}).all()]
+
+def orders_claimed_by(session, runner_id):
+    return [OrderSummary(*row) for row in session.execute(_ORDERS_CLAIMED_BY, {"runner_id": runner_id}).all()]
+
+def claimable_order(session, order_id):
+    """The open order with this id, locked for the claim; None if it is not open."""
+    return session.execute(_CLAIMABLE_ORDER, {"order_id": order_id}).scalars().first()
+
+def active_claim_count(session, runner_id) -> int:
+    return session.execute(_ACTIVE_CLAIM_COUNT, {"runner_id": runner_id}).scalar_one()
+
+def expirable_orders(session, now: datetime, limit: int):
+    """Up to `limit` open orders past their pickup window, skipping rows other sweepers hold."""
+    return session.execute(_EXPIRABLE_ORDERS, {"now": now, "limit": limit}).scalars().all()
+
+def recent_orders_with_counterparty(session, user_id, limit: int = 3):
+    """
+    The user's last `limit` claimed orders as orderer and last `limit` orders as runner,
+    each with the handle of the other party.
+    """
+    as_orderer = session.query(Order.id, Order.order_text, Order.runner_handle).filter(
+        Order.user_id == user_id,
+        Order.runner_id.isnot(None)
+    ).order_by(Order.order_placed_time.desc()).limit(limit).all()
+    as_runner = session.query(Order.id, Order.order_text, Order.user_handle).filter(
+        Order.runner_id == user_id
+    ).order_by(Order.order_placed_time.desc()).limit(limit).all()
+    return [ReportableOrder(*row) for row in as_orderer + as_runner]
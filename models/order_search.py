@@ -0,0 +1,107 @@
+import re
+from datetime import datetime
+from sqlalchemy import event, text, literal_column, func, and_, or_, Table, Column, Integer, String, MetaData
+
+from models.database import Base, SGT
+from models.order_model import Order
+from models.order_status import OPEN
+from models.order_queries import OpenOrder
+
+# Full-text search over the meal and details of open orders. Only open orders are
+# indexed: most of the table is history, and matching common words across all of it
+# made search slower than scanning the open orders (see benchmarks/search.py).
+#  - PostgreSQL: partial GIN expression index on SEARCH_VECTOR, which the planner uses
+#    as long as queries spell the expression exactly the same way and filter on the
+#    literal open status (Order.has_status).
+#  - SQLite: external-content FTS5 table that triggers keep in step with open orders.
+#  - Anything else falls back to LIKE matching.
+
+SEARCH_VECTOR = "to_tsvector('english', coalesce(order_text, '') || ' ' || coalesce(details, ''))"
+
+_POSTGRES_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_orders_search_open ON orders USING GIN ({SEARCH_VECTOR}) WHERE status = '{OPEN}'",
+    # Earlier index over every order.
+    "DROP INDEX IF EXISTS ix_orders_search",
+]
+
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS orders_fts USING fts5(order_text, details, content='orders', content_rowid='id')",
+    f"""CREATE TRIGGER IF NOT EXISTS orders_fts_open_insert AFTER INSERT ON orders WHEN new.status = '{OPEN}' BEGIN
+        INSERT INTO orders_fts(rowid, order_text, details) VALUES (new.id, new.order_text, new.details);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS orders_fts_open_delete AFTER DELETE ON orders WHEN old.status = '{OPEN}' BEGIN
+        INSERT INTO orders_fts(orders_fts, rowid, order_text, details) VALUES ('delete', old.id, old.order_text, old.details);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS orders_fts_open_update AFTER UPDATE OF order_text, details, status ON orders BEGIN
+        INSERT INTO orders_fts(orders_fts, rowid, order_text, details)
+            SELECT 'delete', old.id, old.order_text, old.details WHERE old.status = '{OPEN}';
+        INSERT INTO orders_fts(rowid, order_text, details)
+            SELECT new.id, new.order_text, new.details WHERE new.status = '{OPEN}';
+    END""",
+]
+
+# Triggers of the earlier index over every order.
+_SQLITE_LEGACY_TRIGGERS = ["orders_fts_insert", "orders_fts_delete", "orders_fts_update"]
+
+_SQLITE_FILL = f"INSERT INTO orders_fts(rowid, order_text, details) SELECT id, order_text, details FROM orders WHERE status = '{OPEN}'"
+
+# Kept out of Base.metadata so create_all does not try to create it as a plain table.
+_orders_fts = Table("orders_fts", MetaData(), Column("rowid", Integer), Column("orders_fts", String))
+
+@event.listens_for(Base.metadata, "after_create")
+def create_search_index(target, connection, **kw):
+    """Creates the search index (and fills it) alongside the regular tables."""
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in _POSTGRES_DDL:
+            connection.execute(text(statement))
+    elif dialect == "sqlite":
+        existed = connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'orders_fts'")).first()
+        legacy = connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'orders_fts_insert'")).first()
+        if legacy:
+            for trigger in _SQLITE_LEGACY_TRIGGERS:
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            connection.execute(text("INSERT INTO orders_fts(orders_fts) VALUES ('delete-all')"))
+        for statement in _SQLITE_DDL:
+            connection.execute(text(statement))
+        if legacy or not existed:
+            connection.execute(text(_SQLITE_FILL))
+
+def _terms(query: str):
+    return re.findall(r"\w+", query.lower())
+
+def search_orders(session, query: str, limit: int = 10, now: datetime = None):
+    """
+    Open orders whose meal or details match every word of `query`, best match first
+    and then soonest pickup.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    now = now or datetime.now(SGT)
+    statement = session.query(
+        Order.id, Order.order_text, Order.location, Order.earliest_pickup_time,
+        Order.latest_pickup_time, Order.details, Order.delivery_fee
+    ).filter(
+        Order.has_status(OPEN),
+        Order.latest_pickup_time > now
+    )
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        vector = literal_column(SEARCH_VECTOR)
+        tsquery = func.plainto_tsquery("english", " ".join(terms))
+        statement = statement.filter(vector.op("@@")(tsquery)) \
+            .order_by(func.ts_rank(vector, tsquery).desc(), Order.earliest_pickup_time.asc())
+    elif dialect == "sqlite":
+        # Each word is quoted so FTS5 operators typed by users are matched literally.
+        match = " ".join(f'"{term}"' for term in terms)
+        statement = statement.join(_orders_fts, _orders_fts.c.rowid == Order.id) \
+            .filter(_orders_fts.c.orders_fts.op("MATCH")(match)) \
+            .order_by(func.bm25(literal_column("orders_fts")), Order.earliest_pickup_time.asc())
+    else:
+        statement = statement.filter(and_(*(
+            or_(Order.order_text.ilike(f"%{term}%"), Order.details.ilike(f"%{term}%")) for term in terms
+        ))).order_by(Order.earliest_pickup_time.asc())
+
+    return [OpenOrder(*row) for row in statement.limit(limit).all()]
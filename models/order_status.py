@@ -0,0 +1,27 @@
+# Lifecycle of an order. `status` is the source of truth; the old claimed/expired/
+# completed booleans are only kept in step for readers that have not moved over yet.
+OPEN = 'open'
+CLAIMED = 'claimed'
+COMPLETED = 'completed'
+CANCELLED = 'cancelled'  # deleted by the orderer
+EXPIRED = 'expired'      # pickup window passed without a runner
+
+ORDER_STATUSES = (OPEN, CLAIMED, COMPLETED, CANCELLED, EXPIRED)
+
+ALLOWED_TRANSITIONS = {
+    OPEN: {CLAIMED, CANCELLED, EXPIRED},
+    CLAIMED: {OPEN, COMPLETED},  # back to open when the runner cancels the claim
+    COMPLETED: set(),
+    CANCELLED: set(),
+    EXPIRED: set(),
+}
+
+class InvalidOrderTransition(ValueError):
+    def __init__(self, current: str, new: str):
+        super().__init__(f"Order cannot go from {current!r} to {new!r}")
+        self.current = current
+        self.new = new
+
+def check_transition(current: str, new: str):
+    if new not in ALLOWED_TRANSITIONS.get(current, ()):
+        raise InvalidOrderTransition(current, new)
@@ -0,0 +1,46 @@
+import os
+from datetime import datetime, timedelta
+
+from models.database import SGT
+from models.order_model import OutboxMessage
+from utils.zones import order_channel_id
+
+# Channel edits wait this long before being sent so that quick successive
+# changes to the same post (e.g. claim then cancel) collapse into one edit.
+CHANNEL_EDIT_DEBOUNCE_SECONDS = float(os.getenv("CHANNEL_EDIT_DEBOUNCE_SECONDS", "2"))
+
+def _serialize_markup(reply_markup):
+    return reply_markup.to_json() if reply_markup else None
+
+def enqueue_message(session, chat_id, text: str, parse_mode: str = None, reply_markup=None):
+    """Queues a private message. It is sent by the outbox drainer after the session commits."""
+    session.add(OutboxMessage(
+        kind='message',
+        chat_id=str(chat_id),
+        text=text,
+        parse_mode=parse_mode,
+        reply_markup=_serialize_markup(reply_markup)
+    ))
+
+def enqueue_channel_post(session, order, text: str, parse_mode: str = None, reply_markup=None):
+    """Queues the channel post of a new order. The drainer stores the resulting message id on the order."""
+    session.add(OutboxMessage(
+        kind='channel_post',
+        chat_id=order_channel_id(order),
+        order_id=order.id,
+        text=text,
+        parse_mode=parse_mode,
+        reply_markup=_serialize_markup(reply_markup)
+    ))
+
+def enqueue_channel_edit(session, order, text: str, parse_mode: str = None, reply_markup=None):
+    """Queues an edit of an order's channel post. Only the latest pending edit per order is sent."""
+    session.add(OutboxMessage(
+        kind='channel_edit',
+        chat_id=order_channel_id(order),
+        order_id=order.id,
+        text=text,
+        parse_mode=parse_mode,
+        reply_markup=_serialize_markup(reply_markup),
+        next_attempt_at=datetime.now(SGT) + timedelta(seconds=CHANNEL_EDIT_DEBOUNCE_SECONDS)
+    ))
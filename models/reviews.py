@@ -0,0 +1,57 @@
+import os
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models.order_model import RunnerReview, RunnerReputation
+
+# Number of most recent ratings that make up the recent-window mean.
+RECENT_REVIEW_WINDOW = int(os.getenv("RECENT_REVIEW_WINDOW", "10"))
+
+def record_review(session, order, rating: float, comment: str = None) -> RunnerReputation:
+    """
+    Inserts a review for the order's runner and folds it into the runner's
+    reputation row in the same transaction. The caller commits.
+    """
+    session.add(RunnerReview(
+        runner_id=order.runner_id,
+        user_id=order.user_id,
+        order_id=order.id,
+        rating=rating,
+        comment=comment
+    ))
+
+    reputation = _locked_reputation(session, order.runner_id)
+    reputation.review_count += 1
+    reputation.rating_sum += rating
+
+    recent = reputation.recent_ratings.split(',') if reputation.recent_ratings else []
+    recent.append(f"{rating:g}")
+    reputation.recent_sum += rating
+    if len(recent) > RECENT_REVIEW_WINDOW:
+        reputation.recent_sum -= float(recent.pop(0))
+    reputation.recent_ratings = ','.join(recent)
+    return reputation
+
+def _locked_reputation(session, runner_id) -> RunnerReputation:
+    """
+    The runner's reputation row, locked until the transaction ends. The row is created
+    first if needed, so two transactions recording a runner's first reviews both find a
+    row to lock instead of both inserting one.
+    """
+    empty = dict(runner_id=runner_id, review_count=0, rating_sum=0.0, recent_ratings='', recent_sum=0.0)
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        session.execute(insert(RunnerReputation).values(**empty).on_conflict_do_nothing(index_elements=['runner_id']))
+        return session.get(RunnerReputation, runner_id, with_for_update=True, populate_existing=True)
+
+    reputation = session.get(RunnerReputation, runner_id, with_for_update=True)
+    if reputation is None:
+        reputation = RunnerReputation(**empty)
+        session.add(reputation)
+    return reputation
+
+def get_reputation(session, runner_id):
+    """Primary-key lookup of a runner's aggregate; None if they have no reviews yet."""
+    if runner_id is None:
+        return None
+    return session.get(RunnerReputation, runner_id)
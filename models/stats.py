@@ -0,0 +1,121 @@
+import bisect
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models.database import SGT
+from models.order_model import OrderStatsHourly, ClaimLatencyHourly
+from utils.tenants import current_tenant
+
+# Upper bounds (seconds) of the time-to-claim histogram buckets. The last bucket is open-ended.
+CLAIM_LATENCY_BUCKETS = [60, 120, 300, 600, 900, 1800, 3600, 7200, 10800, 21600, 86400]
+OPEN_ENDED_BUCKET = 10 ** 9
+
+def _as_sgt(dt: datetime) -> datetime:
+    # Backends without timezone support hand back naive datetimes in SGT.
+    return dt.astimezone(SGT) if dt.tzinfo else SGT.localize(dt)
+
+def _hour(dt: datetime) -> datetime:
+    return _as_sgt(dt).replace(minute=0, second=0, microsecond=0)
+
+def _location_key(location) -> str:
+    return (location or "").strip().lower()[:100]
+
+def _tenant_id(order) -> str:
+    # Placement records the order right after its first flush, so tenant_id is set by then.
+    return order.tenant_id or current_tenant().id
+
+def _increment(session, model, key: dict, **deltas):
+    """Adds `deltas` to the row identified by `key`, creating it if needed, in one statement."""
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = insert(model).values(**key, **deltas)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(key),
+            set_={name: getattr(model.__table__.c, name) + statement.excluded[name] for name in deltas}
+        )
+        session.execute(statement)
+        return
+
+    row = session.get(model, tuple(key.values()), with_for_update=True)
+    if row is None:
+        session.add(model(**key, **deltas))
+    else:
+        for name, delta in deltas.items():
+            setattr(row, name, getattr(row, name) + delta)
+
+def record_order_placed(session, order):
+    _increment(
+        session, OrderStatsHourly,
+        {"tenant_id": _tenant_id(order), "hour": _hour(order.order_placed_time), "location": _location_key(order.location)},
+        placed=1
+    )
+
+def record_order_claimed(session, order):
+    claim_seconds = max((_as_sgt(order.order_claimed_time) - _as_sgt(order.order_placed_time)).total_seconds(), 0.0)
+    hour = _hour(order.order_claimed_time)
+    tenant_id = _tenant_id(order)
+    _increment(
+        session, OrderStatsHourly, {"tenant_id": tenant_id, "hour": hour, "location": _location_key(order.location)},
+        claimed=1, claim_seconds_sum=claim_seconds
+    )
+    index = bisect.bisect_left(CLAIM_LATENCY_BUCKETS, claim_seconds)
+    bucket = CLAIM_LATENCY_BUCKETS[index] if index < len(CLAIM_LATENCY_BUCKETS) else OPEN_ENDED_BUCKET
+    _increment(session, ClaimLatencyHourly, {"tenant_id": tenant_id, "hour": hour, "bucket_seconds": bucket}, count=1)
+
+def record_order_expired(session, order, now: datetime):
+    _increment(
+        session, OrderStatsHourly,
+        {"tenant_id": _tenant_id(order), "hour": _hour(now), "location": _location_key(order.location)},
+        expired=1
+    )
+
+def _percentile(histogram, total, fraction):
+    """Upper bound of the bucket containing the given fraction of claims."""
+    target = total * fraction
+    running = 0
+    for bucket_seconds, count in histogram:
+        running += count
+        if running >= target:
+            return bucket_seconds
+    return None
+
+def get_stats(session, hours: int = 24) -> dict:
+    """
+    Reads the rollups for the last `hours` hours. Only touches pre-aggregated rows, and
+    inside a tenant scope only that tenant's (see TenantScoped).
+    """
+    since = _hour(datetime.now(SGT)) - timedelta(hours=hours - 1)
+
+    placed, claimed, expired, claim_seconds = session.query(
+        func.coalesce(func.sum(OrderStatsHourly.placed), 0),
+        func.coalesce(func.sum(OrderStatsHourly.claimed), 0),
+        func.coalesce(func.sum(OrderStatsHourly.expired), 0),
+        func.coalesce(func.sum(OrderStatsHourly.claim_seconds_sum), 0.0)
+    ).filter(OrderStatsHourly.hour >= since).one()
+
+    top_locations = session.query(
+        OrderStatsHourly.location, func.sum(OrderStatsHourly.placed).label("placed")
+    ).filter(OrderStatsHourly.hour >= since).group_by(OrderStatsHourly.location) \
+        .order_by(func.sum(OrderStatsHourly.placed).desc()).limit(5).all()
+
+    histogram = session.query(
+        ClaimLatencyHourly.bucket_seconds, func.sum(ClaimLatencyHourly.count)
+    ).filter(ClaimLatencyHourly.hour >= since).group_by(ClaimLatencyHourly.bucket_seconds) \
+        .order_by(ClaimLatencyHourly.bucket_seconds).all()
+    claims_in_histogram = sum(count for _, count in histogram)
+
+    return {
+        "hours": hours,
+        "placed": placed,
+        "claimed": claimed,
+        "expired": expired,
+        "orders_per_hour": placed / hours,
+        "expiry_rate": expired / (claimed + expired) if claimed + expired else None,
+        "mean_claim_seconds": claim_seconds / claimed if claimed else None,
+        "claim_p50_seconds": _percentile(histogram, claims_in_histogram, 0.5),
+        "claim_p90_seconds": _percentile(histogram, claims_in_histogram, 0.9),
+        "claim_p99_seconds": _percentile(histogram, claims_in_histogram, 0.99),
+        "top_locations": [(location or "unknown", count) for location, count in top_locations],
+    }
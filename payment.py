@@ -1,11 +1,15 @@
 import os
 import re
+import asyncio
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import stripe 
 from flask import Flask, request
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from models.database import *
+from models.database import clear_current_session
+from models.order_model import CheckoutSession
 
 load_dotenv()
 
@@ -13,7 +17,13 @@ app = Flask(__name__)
 
 stripe.api_key = os.getenv('STRIPE_SECRET_KEY')
 
-def create_checkout_session(amount: int, currency: str, user_id): 
+# A stored checkout session is only handed out again if it stays valid at least this long.
+CHECKOUT_REUSE_MARGIN_SECONDS = int(os.getenv("CHECKOUT_REUSE_MARGIN_SECONDS", "300"))
+
+# (order_id, amount_cents, currency) -> task creating or loading that checkout session
+_checkout_inflight = {}
+
+def create_checkout_session(amount: int, currency: str, user_id, order_id=None): 
     success_url = f"https://t.me/smuth_delivery?start=payment_success_{user_id}"  # Unique for the user
     cancel_url = f"https://t.me/smuth_delivery?start=payment_cancel_{user_id}"
     
@@ -32,14 +42,64 @@ def create_checkout_session(amount: int, currency: str, user_id):
         mode = 'payment',
         success_url = success_url,
         cancel_url = cancel_url,
+        client_reference_id = str(order_id) if order_id is not None else None,
     )
+    return checkout_session
+
+async def _load_or_create_checkout_url(order_id: int, amount_cents: int, currency: str, user_id) -> str:
+    # Shared by every caller waiting for this key, so it must not write through (or commit)
+    # the session of whichever update started it. The tenant scope is kept.
+    clear_current_session()
+    now = datetime.now(SGT)
+    with session_scope() as session:
+        stored = session.query(CheckoutSession).filter(
+            CheckoutSession.order_id == order_id,
+            CheckoutSession.amount_cents == amount_cents,
+            CheckoutSession.currency == currency,
+            CheckoutSession.expires_at > now + timedelta(seconds=CHECKOUT_REUSE_MARGIN_SECONDS)
+        ).first()
+        if stored:
+            return stored.url
+
+    # The Stripe client is blocking, so it runs off the event loop.
+    checkout_session = await asyncio.to_thread(create_checkout_session, amount_cents, currency, user_id, order_id)
+    with session_scope() as session:
+        session.merge(CheckoutSession(
+            order_id=order_id,
+            amount_cents=amount_cents,
+            currency=currency,
+            stripe_session_id=checkout_session.id,
+            url=checkout_session.url,
+            expires_at=datetime.fromtimestamp(checkout_session.expires_at, SGT)
+        ))
     return checkout_session.url
 
-async def send_payment_link(update, context, amount):
+async def get_checkout_url(order_id: int, amount_cents: int, currency: str, user_id) -> str:
+    """
+    Returns a checkout URL for the order and amount, reusing a stored session while it
+    is valid. Concurrent calls for the same key share one lookup/creation.
+    """
+    key = (order_id, amount_cents, currency)
+    task = _checkout_inflight.get(key)
+    if task is None:
+        task = asyncio.get_running_loop().create_task(
+            _load_or_create_checkout_url(order_id, amount_cents, currency, user_id)
+        )
+        _checkout_inflight[key] = task
+        task.add_done_callback(lambda _: _checkout_inflight.pop(key, None))
+    # Shielded so one caller giving up does not cancel the creation for the others.
+    return await asyncio.shield(task)
+
+async def send_payment_link(update, context, order_id: int, amount: str):
     currency = 'sgd'
     user_id = update.message.from_user.id
-    
-    checkout_url = create_checkout_session(amount, currency, user_id)
+
+    valid, amount_cents = validate_and_convert_amount(amount)
+    if not valid:
+        await update.message.reply_text("❌ Please enter a valid amount of at least $1.00.")
+        return
+
+    checkout_url = await get_checkout_url(order_id, amount_cents, currency, user_id)
     
     keyboard = [[InlineKeyboardButton("Pay Now", url=checkout_url)]]
     reply_markup = InlineKeyboardMarkup(keyboard)
@@ -74,9 +74,8 @@ async def get_email(update, context):
                     stripe_account_id = account['id']
                 )
                 
-                session = session_local()
-                session.add(newStripeAccount)
-                session.commit()
+                with session_scope() as session:
+                    session.add(newStripeAccount)
                 
             else:
                 await update.message.reply_text("There was an error generating your onboarding link.")
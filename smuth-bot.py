@@ -1,8 +1,11 @@
 import os
-from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, CallbackQueryHandler, filters
+import asyncio
+import logging
+from datetime import datetime
+from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, CallbackQueryHandler, InlineQueryHandler, TypeHandler, filters
 from dotenv import load_dotenv
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from telegram import Bot
+from telegram import Update
 from controllers.start import start
 from controllers.conversation_handler import start_order, handle_conversation
 from controllers.claim_steps.handle_claim import handle_claim
@@ -10,40 +13,146 @@ from controllers.help_command import help_command
 from controllers.order_management.handle_my_claims import handle_my_claims
 from controllers.order_management.handle_my_orders import handle_my_orders
 from controllers.order_management.view_orders import view_orders
+from controllers.order_management.search_orders import handle_search
+from controllers.order_management.free_orders import handle_free
 from controllers.handle_button import handle_button
+from controllers.inline_search import handle_inline_query
+from controllers.admin.admin_stats import admin_stats
+from controllers.rate_limit_guard import enforce_rate_limits
+from controllers.blocklist_guard import reject_suspended_users
+from controllers.admin.moderation import moderation_queue, suspend_user, unsuspend_user, dismiss_user_reports
 from tasks.expire_orders import expire_old_orders
-from models.database import create_tables
+from tasks.report_metrics import report_metrics
+from models.database import create_tables, per_update_session, session_scope
+from models.moderation import load_suspended_users
+from tasks.drain_outbox import drain_outbox
+from tasks.refresh_blocklist import refresh_blocklist
+from fleet import run_fleet
+from utils.bot_requests import build_send_request, build_get_updates_request
+from utils.tenants import TENANTS, tenant_scope, tenant_labels, is_multi_tenant, per_tenant
+from utils import metrics
 
 load_dotenv()
 
-TOKEN = os.getenv("TELEGRAM_TOKEN")
-bot = Bot(token=TOKEN)
+METRICS_INTERVAL_MINUTES = int(os.getenv("METRICS_INTERVAL_MINUTES", "15"))
+OUTBOX_DRAIN_SECONDS = float(os.getenv("OUTBOX_DRAIN_SECONDS", "2"))
+# Number of worker processes behind a single polling ingress; 1 runs everything in this process.
+WORKER_COUNT = int(os.getenv("WORKER_COUNT", "1"))
 
-def main():
-    app = ApplicationBuilder().token(TOKEN).build()
-
-    # Register command handlers.
-    app.add_handler(CommandHandler("start", start))
-    app.add_handler(CommandHandler("order", start_order))
-    app.add_handler(CommandHandler("vieworders", view_orders))
-    app.add_handler(CommandHandler("claim", handle_claim))
-    app.add_handler(CommandHandler("myorders", handle_my_orders))
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s", level=logging.INFO)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Outgoing Bot API calls of every tenant share one connection pool; the URL carries the token.
+_send_request = None
+
+def _shared_send_request():
+    global _send_request
+    if _send_request is None:
+        _send_request = build_send_request()
+    return _send_request
+
+async def count_update(update: Update, context):
+    metrics.inc("updates.received")
+
+def build_application(tenant=TENANTS[0], updater: bool = True):
+    builder = ApplicationBuilder().token(tenant.token).request(_shared_send_request())
+    if updater:
+        builder = builder.get_updates_request(build_get_updates_request()).post_init(_post_init)
+    else:
+        # Fleet workers receive their updates from the ingress instead of polling.
+        builder = builder.updater(None)
+    app = builder.build()
+    app.bot_data["tenant_id"] = tenant.id
+
+    app.add_handler(TypeHandler(Update, count_update), group=-3)
+    # Suspended users are dropped first, then per-user rate limiting runs before every other handler.
+    app.add_handler(TypeHandler(Update, reject_suspended_users), group=-2)
+    app.add_handler(TypeHandler(Update, enforce_rate_limits), group=-1)
+
+    # Register command handlers. Each update runs inside its own database session.
+    app.add_handler(CommandHandler("start", per_update_session(start)))
+    app.add_handler(CommandHandler("order", per_update_session(start_order)))
+    app.add_handler(CommandHandler("vieworders", per_update_session(view_orders)))
+    app.add_handler(CommandHandler("search", per_update_session(handle_search)))
+    app.add_handler(CommandHandler("free", per_update_session(handle_free)))
+    app.add_handler(CommandHandler("claim", per_update_session(handle_claim)))
+    app.add_handler(CommandHandler("myorders", per_update_session(handle_my_orders)))
     app.add_handler(CommandHandler("help", help_command))
+    app.add_handler(CommandHandler("adminstats", per_update_session(admin_stats)))
+    app.add_handler(CommandHandler("moderation", per_update_session(moderation_queue)))
+    app.add_handler(CommandHandler("suspend", per_update_session(suspend_user)))
+    app.add_handler(CommandHandler("unsuspend", per_update_session(unsuspend_user)))
+    app.add_handler(CommandHandler("dismissreports", per_update_session(dismiss_user_reports)))
     
     # Register a message handler for the order conversation.
-    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_conversation))
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, per_update_session(handle_conversation)))
     
     # Register the callback query handler for inline buttons.
-    app.add_handler(CallbackQueryHandler(handle_button))
-    
-    # Set up the scheduler to run the expire_old_orders task every 5 minutes.
+    app.add_handler(CallbackQueryHandler(per_update_session(handle_button)))
+
+    # Register the inline query handler for "@bot <text>" order search.
+    app.add_handler(InlineQueryHandler(per_update_session(handle_inline_query)))
+    return app
+
+def start_scheduler(bots, leader_only=lambda job: job):
+    # One scheduler serves every tenant in `bots` ({tenant_id: bot}). Expiry and the outbox
+    # act on shared state and run on one worker only; the blocklist and metrics are per
+    # process and run everywhere.
     scheduler = AsyncIOScheduler()
-    scheduler.add_job(expire_old_orders, 'interval', minutes=5, args=[bot])
+    scheduler.add_job(leader_only(per_tenant(expire_old_orders)), 'interval', minutes=5, args=[bots])
+    scheduler.add_job(leader_only(per_tenant(drain_outbox)), 'interval', seconds=OUTBOX_DRAIN_SECONDS, args=[bots])
+    # Runs straight away as well so freshly started workers pick up the blocklist.
+    scheduler.add_job(refresh_blocklist, 'interval', minutes=1, next_run_time=datetime.now())
+    scheduler.add_job(report_metrics, 'interval', minutes=METRICS_INTERVAL_MINUTES)
     scheduler.start()
-    
-    # Start polling.
-    app.run_polling()
+    return scheduler
+
+async def _post_init(app):
+    # Jobs share the application's bot and with it its connection pool.
+    start_scheduler({app.bot_data["tenant_id"]: app.bot})
+
+def main():
+    app = build_application()
+
+    # Start polling. Everything the application runs inherits the tenant scope.
+    with tenant_scope(TENANTS[0].id):
+        app.run_polling()
+
+async def run_tenants():
+    """Serves the bot of every tenant from this process, with one shared scheduler."""
+    apps = [build_application(tenant) for tenant in TENANTS]
+    for tenant, app in zip(TENANTS, apps):
+        # Polling and update processing run in tasks started here, which inherit the scope.
+        with tenant_scope(tenant.id):
+            await app.initialize()
+            await app.updater.start_polling()
+            await app.start()
+    scheduler = start_scheduler({tenant.id: app.bot for tenant, app in zip(TENANTS, apps)})
+    try:
+        await asyncio.Event().wait()
+    finally:
+        scheduler.shutdown(wait=False)
+        for app in apps:
+            await app.updater.stop()
+            await app.stop()
+        for app in apps:
+            await app.shutdown()
 
 if __name__ == '__main__':
     create_tables()
-    main()
+    with session_scope() as session:
+        load_suspended_users(session)
+    if is_multi_tenant():
+        # Lets one noisy campus be told apart in the metrics.
+        metrics.set_context_labels(tenant_labels)
+    if WORKER_COUNT > 1:
+        if is_multi_tenant():
+            raise SystemExit("WORKER_COUNT > 1 serves a single tenant; run one fleet per entry of BOT_TENANTS")
+        run_fleet(TENANTS[0], WORKER_COUNT, build_application, start_scheduler)
+    elif is_multi_tenant():
+        try:
+            asyncio.run(run_tenants())
+        except KeyboardInterrupt:
+            pass
+    else:
+        main()
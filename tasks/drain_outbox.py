@@ -0,0 +1,143 @@
+import os
+import json
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from telegram import InlineKeyboardMarkup
+
+from models.database import session_scope, SGT
+from models.order_model import Order, OutboxMessage
+from utils.channel_sync import channel_sync
+from utils.rate_limit import TokenBucketLimiter
+from utils import metrics
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_MAX_BACKOFF_SECONDS = int(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "300"))
+
+# Outbound budget per channel as "<messages>/<seconds>", shared by posts and edits.
+# Telegram throttles bots at roughly 20 messages per minute in a single group or channel.
+_channel_messages, _, _channel_seconds = os.getenv("CHANNEL_SEND_BUDGET", "20/60").partition("/")
+channel_budget = TokenBucketLimiter(float(_channel_messages), float(_channel_messages) / float(_channel_seconds))
+CHANNEL_SEND_INTERVAL_SECONDS = float(_channel_seconds) / float(_channel_messages)
+
+class PostNotSentYet(Exception):
+    """An edit reached the head of the queue before the channel post it edits was sent."""
+
+async def drain_outbox(bot):
+    """
+    Sends pending outbox messages in batches, oldest first. A message is only marked
+    as sent after Telegram accepted it, so delivery is at-least-once. Failed sends are
+    retried with exponential backoff until OUTBOX_MAX_ATTEMPTS is reached. The batch is
+    claimed with FOR UPDATE SKIP LOCKED, so concurrent drainers never send the same row.
+    Orders are only written right before the commit, so no order row is locked (and on
+    SQLite no write lock is held) while messages are being sent.
+    """
+    now = datetime.now(SGT)
+    with session_scope() as session:
+        batch = session.query(OutboxMessage).filter(
+            OutboxMessage.status == 'pending',
+            OutboxMessage.next_attempt_at <= now
+        ).order_by(OutboxMessage.id.asc()).limit(OUTBOX_BATCH_SIZE).with_for_update(skip_locked=True).all()
+        if not batch:
+            return
+
+        # Newest pending edit per order; older edits of the same post are superseded.
+        edit_order_ids = {m.order_id for m in batch if m.kind == 'channel_edit'}
+        latest_edit_ids = dict(session.query(OutboxMessage.order_id, func.max(OutboxMessage.id)).filter(
+            OutboxMessage.kind == 'channel_edit',
+            OutboxMessage.status == 'pending',
+            OutboxMessage.order_id.in_(edit_order_ids)
+        ).group_by(OutboxMessage.order_id).all()) if edit_order_ids else {}
+        posted = {}  # order_id -> channel message id of posts sent in this batch
+
+        for outbox_message in batch:
+            if outbox_message.kind == 'channel_edit' and latest_edit_ids.get(outbox_message.order_id) != outbox_message.id:
+                outbox_message.status = 'superseded'
+                metrics.inc("channel_sync.calls_saved", reason="coalesced")
+                continue
+            if outbox_message.kind in ('channel_post', 'channel_edit') and not channel_budget.allow(outbox_message.chat_id):
+                # Over this channel's budget. Push it back by one refill interval so that a busy
+                # channel does not hold the head of the queue for the other channels.
+                outbox_message.next_attempt_at = now + timedelta(seconds=CHANNEL_SEND_INTERVAL_SECONDS)
+                metrics.inc("outbox.deferred", chat_id=outbox_message.chat_id)
+                continue
+            try:
+                await _deliver(session, bot, outbox_message, posted)
+            except Exception as e:
+                _schedule_retry(outbox_message, e, now)
+        _store_channel_message_ids(session, posted)
+        session.commit()
+
+def _store_channel_message_ids(session, posted: dict):
+    # Plain UPDATEs rather than ORM changes: they must not be tied to the orders' status,
+    # which a claim may have changed while the batch was being sent.
+    for order_id, message_id in posted.items():
+        session.query(Order).filter(Order.id == order_id).update(
+            {Order.channel_message_id: message_id}, synchronize_session=False
+        )
+
+async def _deliver(session, bot, outbox_message, posted: dict):
+    reply_markup = None
+    if outbox_message.reply_markup:
+        reply_markup = InlineKeyboardMarkup.de_json(json.loads(outbox_message.reply_markup), bot)
+
+    if outbox_message.kind == 'message':
+        await bot.send_message(
+            chat_id=outbox_message.chat_id,
+            text=outbox_message.text,
+            parse_mode=outbox_message.parse_mode,
+            reply_markup=reply_markup
+        )
+    elif outbox_message.kind == 'channel_post':
+        sent_message = await bot.send_message(
+            chat_id=outbox_message.chat_id,
+            text=outbox_message.text,
+            parse_mode=outbox_message.parse_mode,
+            reply_markup=reply_markup
+        )
+        posted[outbox_message.order_id] = sent_message.message_id
+        channel_sync.remember(outbox_message.chat_id, sent_message.message_id, outbox_message.text, reply_markup)
+    elif outbox_message.kind == 'channel_edit':
+        message_id = posted.get(outbox_message.order_id)
+        if message_id is None:
+            message_id = session.query(Order.channel_message_id).filter(Order.id == outbox_message.order_id).scalar()
+            if not message_id and _has_pending_post(session, outbox_message.order_id):
+                # Retried with the usual backoff, so a deferred post does not leave the
+                # edit at the head of the queue.
+                raise PostNotSentYet(f"channel post of order {outbox_message.order_id} is still pending")
+        if message_id:
+            await channel_sync.edit(
+                bot,
+                chat_id=outbox_message.chat_id,
+                message_id=message_id,
+                text=outbox_message.text,
+                parse_mode=outbox_message.parse_mode,
+                reply_markup=reply_markup
+            )
+    else:
+        logging.warning(f"Unknown outbox message kind {outbox_message.kind!r} (id {outbox_message.id})")
+
+    outbox_message.status = 'sent'
+    outbox_message.sent_at = datetime.now(SGT)
+    metrics.inc("outbox.sent", kind=outbox_message.kind)
+
+def _has_pending_post(session, order_id) -> bool:
+    return session.query(OutboxMessage.id).filter(
+        OutboxMessage.kind == 'channel_post',
+        OutboxMessage.status == 'pending',
+        OutboxMessage.order_id == order_id
+    ).first() is not None
+
+def _schedule_retry(outbox_message, error, now):
+    outbox_message.attempts += 1
+    outbox_message.last_error = str(error)[:500]
+    if outbox_message.attempts >= OUTBOX_MAX_ATTEMPTS:
+        outbox_message.status = 'failed'
+        metrics.inc("outbox.failed", kind=outbox_message.kind)
+        logging.warning(f"Giving up on outbox message {outbox_message.id} after {outbox_message.attempts} attempts: {error}")
+        return
+    backoff = min(2 ** outbox_message.attempts, OUTBOX_MAX_BACKOFF_SECONDS)
+    outbox_message.next_attempt_at = now + timedelta(seconds=backoff)
+    metrics.inc("outbox.retried", kind=outbox_message.kind)
+    logging.warning(f"Failed to deliver outbox message {outbox_message.id}, retrying in {backoff}s: {error}")
@@ -0,0 +1,127 @@
+"""
+Streams tables to CSV or Parquet in constant memory.
+
+Usage:
+    python -m tasks.export_data orders --format csv --since 2025-01-01 --until 2025-02-01 -o orders.csv
+    python -m tasks.export_data report_user --format parquet -o reports.parquet
+
+Rows are read with a server-side cursor (`yield_per`) and written batch by batch,
+so memory use does not grow with the size of the table. On databases created before
+the timestamp columns were indexed, run tasks/migrate_export_indexes.py first, or
+--since/--until scans the whole table.
+"""
+import argparse
+import csv
+import sys
+import time
+from datetime import datetime
+from sqlalchemy import select, Integer, BigInteger, Float, Boolean, DateTime
+from sqlalchemy.types import TypeDecorator
+
+from models.database import session_scope, SGT
+from models.order_model import Order, ReportUser, RunnerReview
+
+EXPORT_BATCH_SIZE = 5000
+
+# table name -> (model, indexed timestamp column used for --since/--until)
+EXPORTABLE_TABLES = {
+    'orders': (Order, Order.order_placed_time),
+    'report_user': (ReportUser, ReportUser.timestamp),
+    'runner_reviews': (RunnerReview, RunnerReview.created_at),
+}
+
+def _parse_date(value: str) -> datetime:
+    return SGT.localize(datetime.fromisoformat(value))
+
+def iter_batches(session, table: str, since: datetime = None, until: datetime = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yields lists of row tuples for the table, filtered on its timestamp column."""
+    model, timestamp_column = EXPORTABLE_TABLES[table]
+    statement = select(*model.__table__.columns)
+    if since:
+        statement = statement.where(timestamp_column >= since)
+    if until:
+        statement = statement.where(timestamp_column < until)
+    statement = statement.order_by(timestamp_column, model.__table__.primary_key.columns.values()[0])
+
+    result = session.execute(statement.execution_options(yield_per=batch_size, stream_results=True))
+    for partition in result.partitions():
+        yield partition
+
+def table_columns(table: str):
+    model, _ = EXPORTABLE_TABLES[table]
+    return list(model.__table__.columns)
+
+def write_csv(batches, columns, output):
+    writer = csv.writer(output)
+    writer.writerow(columns)
+    rows = 0
+    for batch in batches:
+        writer.writerows(batch)
+        rows += len(batch)
+    return rows
+
+def write_parquet(batches, columns, path):
+    """Writes each batch as a row group. `columns` are the table's SQLAlchemy columns."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet export needs pyarrow: pip install pyarrow")
+
+    schema = pa.schema([(column.name, _arrow_type(pa, column.type)) for column in columns])
+    names = [column.name for column in columns]
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist([dict(zip(names, row)) for row in batch], schema=schema))
+            rows += len(batch)
+    return rows
+
+def _arrow_type(pa, column_type):
+    # Declared up front so that batches full of NULLs do not change the schema.
+    if isinstance(column_type, TypeDecorator):
+        column_type = column_type.impl
+    if isinstance(column_type, (Integer, BigInteger)):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us', tz=str(SGT) if column_type.timezone else None)
+    return pa.string()
+
+def export(table: str, fmt: str, output_path: str, since: datetime = None, until: datetime = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """Exports one table and returns (rows, seconds)."""
+    start = time.perf_counter()
+    columns = table_columns(table)
+    with session_scope() as session:
+        batches = iter_batches(session, table, since, until, batch_size)
+        if fmt == 'parquet':
+            rows = write_parquet(batches, columns, output_path)
+        elif output_path == '-':
+            rows = write_csv(batches, [column.name for column in columns], sys.stdout)
+        else:
+            with open(output_path, 'w', newline='', encoding='utf-8') as output:
+                rows = write_csv(batches, [column.name for column in columns], output)
+    return rows, time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export orders, reports and reviews.")
+    parser.add_argument('table', choices=sorted(EXPORTABLE_TABLES))
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('-o', '--output', default='-', help="Output file, '-' for stdout (CSV only)")
+    parser.add_argument('--since', type=_parse_date, help="Inclusive start date, e.g. 2025-01-01")
+    parser.add_argument('--until', type=_parse_date, help="Exclusive end date")
+    parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.format == 'parquet' and args.output == '-':
+        parser.error("Parquet output needs a file path")
+
+    rows, seconds = export(args.table, args.format, args.output, args.since, args.until, args.batch_size)
+    rate = rows / seconds if seconds else 0
+    print(f"Exported {rows} rows from {args.table} in {seconds:.1f}s ({rate:,.0f} rows/s)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
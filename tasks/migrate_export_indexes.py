@@ -0,0 +1,29 @@
+"""
+Creates the indexes on the timestamp columns that `tasks.export_data --since/--until`
+filters on: orders.order_placed_time and report_user.timestamp. Without them a date-range
+export scans the whole table. (runner_reviews.created_at is indexed by
+tasks/migrate_reviews.py, which also adds the column.) Safe to run more than once.
+
+Usage:
+    python -m tasks.migrate_export_indexes
+"""
+import sys
+from sqlalchemy import text
+
+from models.database import engine
+
+EXPORT_INDEXES = [
+    ('ix_orders_order_placed_time', 'orders', 'order_placed_time'),
+    ('ix_report_user_timestamp', 'report_user', 'timestamp'),
+]
+
+def migrate(bind=engine) -> list:
+    """Returns the names of the indexes ensured."""
+    with bind.begin() as connection:
+        for name, table, column in EXPORT_INDEXES:
+            connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})"))
+    return [name for name, _, _ in EXPORT_INDEXES]
+
+if __name__ == '__main__':
+    migrate()
+    print(f"export indexes ready: {', '.join(name for name, _, _ in EXPORT_INDEXES)}", file=sys.stderr)
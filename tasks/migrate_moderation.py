@@ -0,0 +1,31 @@
+"""
+Adds `report_user.status` and the index on `report_user.reported_user_id` used by the
+moderation queue. Existing reports start out 'pending', so they count towards automatic
+suspension and show up in /moderation. Safe to run more than once.
+
+Usage:
+    python -m tasks.migrate_moderation
+"""
+import sys
+from sqlalchemy import inspect, text
+
+from models.database import engine
+from models.order_model import ReportUser
+
+MODERATION_INDEXES = ['ix_report_user_reported_user_id']
+
+def migrate(bind=engine) -> bool:
+    """Returns whether the status column was added."""
+    with bind.begin() as connection:
+        columns = {column['name'] for column in inspect(connection).get_columns('report_user')}
+        added = 'status' not in columns
+        if added:
+            connection.execute(text("ALTER TABLE report_user ADD COLUMN status VARCHAR NOT NULL DEFAULT 'pending'"))
+        for index in ReportUser.__table__.indexes:
+            if index.name in MODERATION_INDEXES:
+                index.create(connection, checkfirst=True)
+    return added
+
+if __name__ == '__main__':
+    added = migrate()
+    print(f"report_user.status ready ({'added' if added else 'already present'})", file=sys.stderr)
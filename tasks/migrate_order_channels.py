@@ -0,0 +1,38 @@
+"""
+Adds `orders.channel_id` and backfills it with the channel of each order's tenant,
+which is where orders were posted before zoning. Safe to run more than once.
+
+Usage:
+    python -m tasks.migrate_order_channels
+
+Run it before starting a version of the bot that routes orders to zone channels.
+"""
+import sys
+from sqlalchemy import inspect, text
+
+from models.database import engine
+from utils.tenants import TENANTS
+
+def migrate(bind=engine) -> int:
+    """Returns the number of orders backfilled."""
+    with bind.begin() as connection:
+        columns = {column['name'] for column in inspect(connection).get_columns('orders')}
+        if 'channel_id' not in columns:
+            connection.execute(text("ALTER TABLE orders ADD COLUMN channel_id VARCHAR"))
+        backfilled = 0
+        for tenant in TENANTS:
+            if not tenant.channel_id:
+                continue
+            if 'tenant_id' in columns:
+                statement = text("UPDATE orders SET channel_id = :channel_id WHERE channel_id IS NULL AND tenant_id = :tenant_id")
+                backfilled += connection.execute(statement, {"channel_id": tenant.channel_id, "tenant_id": tenant.id}).rowcount
+            else:
+                # Orders from before tenants all belong to the first one (see tasks/migrate_tenants.py).
+                statement = text("UPDATE orders SET channel_id = :channel_id WHERE channel_id IS NULL")
+                backfilled += connection.execute(statement, {"channel_id": tenant.channel_id}).rowcount
+                break
+    return backfilled
+
+if __name__ == '__main__':
+    backfilled = migrate()
+    print(f"orders.channel_id ready ({backfilled} orders backfilled)", file=sys.stderr)
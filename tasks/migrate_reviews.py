@@ -0,0 +1,58 @@
+"""
+Adds `runner_reviews.created_at` and the review indexes, and builds `runner_reputation`
+from the existing reviews if it is empty. Safe to run more than once.
+
+Usage:
+    python -m tasks.migrate_reviews
+
+The unique index on `runner_reviews.order_id` cannot be created while an order has
+more than one review; the migration stops with an error naming those orders.
+"""
+import sys
+from sqlalchemy import inspect, text, func
+from sqlalchemy.orm import Session
+
+from models.database import engine
+from models.order_model import RunnerReview, RunnerReputation
+from models.reviews import RECENT_REVIEW_WINDOW
+
+def _rebuild_reputation(session) -> int:
+    reputations = {}  # runner_id -> RunnerReputation
+    for runner_id, rating in session.query(RunnerReview.runner_id, RunnerReview.rating).order_by(RunnerReview.id).yield_per(1000):
+        reputation = reputations.get(runner_id)
+        if reputation is None:
+            reputation = reputations[runner_id] = RunnerReputation(
+                runner_id=runner_id, review_count=0, rating_sum=0.0, recent_ratings='', recent_sum=0.0
+            )
+        reputation.review_count += 1
+        reputation.rating_sum += rating
+        recent = (reputation.recent_ratings.split(',') if reputation.recent_ratings else []) + [f"{rating:g}"]
+        reputation.recent_ratings = ','.join(recent[-RECENT_REVIEW_WINDOW:])
+    for reputation in reputations.values():
+        reputation.recent_sum = sum(float(rating) for rating in reputation.recent_ratings.split(','))
+    session.add_all(reputations.values())
+    return len(reputations)
+
+def migrate(bind=engine) -> int:
+    """Returns the number of runner reputations built."""
+    with bind.begin() as connection:
+        columns = {column['name'] for column in inspect(connection).get_columns('runner_reviews')}
+        if 'created_at' not in columns:
+            connection.execute(text("ALTER TABLE runner_reviews ADD COLUMN created_at TIMESTAMP"))
+        duplicates = connection.execute(
+            text("SELECT order_id FROM runner_reviews GROUP BY order_id HAVING COUNT(*) > 1")
+        ).scalars().all()
+        if duplicates:
+            raise SystemExit(f"Orders with more than one review, keep one each and rerun: {duplicates}")
+        for index in RunnerReview.__table__.indexes:
+            index.create(connection, checkfirst=True)
+
+    RunnerReputation.__table__.create(bind, checkfirst=True)
+    with Session(bind) as session, session.begin():
+        if session.query(func.count(RunnerReputation.runner_id)).scalar():
+            return 0
+        return _rebuild_reputation(session)
+
+if __name__ == '__main__':
+    built = migrate()
+    print(f"runner_reviews ready ({built} runner reputations built)", file=sys.stderr)
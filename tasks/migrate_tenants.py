@@ -0,0 +1,78 @@
+"""
+Adds `tenant_id` to the per-tenant tables and indexes it. The hourly stats tables get it
+as the first column of their primary key instead. Existing rows are assigned to
+DEFAULT_TENANT_ID, so a deployment that moves to BOT_TENANTS should either call its
+existing campus "default" or update those rows. Safe to run more than once.
+
+Usage:
+    python -m tasks.migrate_tenants
+"""
+import sys
+from sqlalchemy import inspect, text
+
+from models.database import engine
+from models.order_model import Order, OrderEvent, OutboxMessage, OrderStatsHourly, ClaimLatencyHourly
+from utils.tenants import DEFAULT_TENANT_ID
+
+TENANT_SCOPED_MODELS = [Order, OrderEvent, OutboxMessage]
+# Keyed by tenant: their rows are counters upserted by primary key (see models/stats.py).
+TENANT_KEYED_MODELS = [OrderStatsHourly, ClaimLatencyHourly]
+
+def _add_tenant_to_key(connection, table) -> bool:
+    inspector = inspect(connection)
+    if not inspector.has_table(table.name):
+        return False
+    primary_key = inspector.get_pk_constraint(table.name)
+    if 'tenant_id' in primary_key['constrained_columns']:
+        return False
+    columns = [column['name'] for column in inspector.get_columns(table.name)]
+    if connection.dialect.name == 'sqlite':
+        # SQLite cannot change a primary key in place, so the rows are copied into a new table.
+        previous = f"{table.name}_before_tenants"
+        copied = ', '.join(column for column in columns if column != 'tenant_id')
+        tenant_id = 'tenant_id' if 'tenant_id' in columns else f"'{DEFAULT_TENANT_ID}'"
+        connection.execute(text(f"ALTER TABLE {table.name} RENAME TO {previous}"))
+        table.create(connection)
+        connection.execute(text(
+            f"INSERT INTO {table.name} ({copied}, tenant_id) SELECT {copied}, {tenant_id} FROM {previous}"
+        ))
+        connection.execute(text(f"DROP TABLE {previous}"))
+        return True
+    if 'tenant_id' not in columns:
+        connection.execute(text(
+            f"ALTER TABLE {table.name} ADD COLUMN tenant_id VARCHAR NOT NULL DEFAULT '{DEFAULT_TENANT_ID}'"
+        ))
+    key_columns = ', '.join(column.name for column in table.primary_key.columns)
+    connection.execute(text(
+        f"ALTER TABLE {table.name} DROP CONSTRAINT {primary_key['name']}, ADD PRIMARY KEY ({key_columns})"
+    ))
+    return True
+
+def migrate(bind=engine) -> list:
+    """Returns the names of the tables the column was added to."""
+    migrated = []
+    with bind.begin() as connection:
+        for model in TENANT_SCOPED_MODELS:
+            table = model.__table__
+            if not inspect(connection).has_table(table.name):
+                # Created with the column by create_tables() on the next start.
+                continue
+            columns = {column['name'] for column in inspect(connection).get_columns(table.name)}
+            if 'tenant_id' not in columns:
+                connection.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN tenant_id VARCHAR NOT NULL DEFAULT '{DEFAULT_TENANT_ID}'"
+                ))
+                migrated.append(table.name)
+            # Only the tenant_id index: the others belong to other migrations and may
+            # reference columns that do not exist yet.
+            for index in table.indexes:
+                if index.name == f"ix_{table.name}_tenant_id":
+                    index.create(connection, checkfirst=True)
+        for model in TENANT_KEYED_MODELS:
+            if _add_tenant_to_key(connection, model.__table__):
+                migrated.append(model.__tablename__)
+    return migrated
+
+if __name__ == '__main__':
+    migrated = migrate()
+    print(f"tenant_id ready (added to: {', '.join(migrated) or 'none'})", file=sys.stderr)
@@ -0,0 +1,7 @@
+from models.database import session_scope
+from models.moderation import load_suspended_users
+
+async def refresh_blocklist():
+    """Reloads the suspended users so changes made by other instances are picked up."""
+    with session_scope() as session:
+        load_suspended_users(session)
@@ -0,0 +1,7 @@
+from models.database import session_scope
+from utils.user_view_cache import user_view_cache
+
+async def refresh_user_views():
+    """Drops the cached listings that orders changed by other workers have made stale."""
+    with session_scope() as session:
+        user_view_cache.sync(session)
@@ -0,0 +1,6 @@
+import logging
+from utils import metrics
+
+async def report_metrics():
+    """Logs a snapshot of the in-process metrics (pool usage, checkout wait, leaked sessions, ...)."""
+    logging.info(f"[METRICS]\n{metrics.format_snapshot()}")
@@ -0,0 +1,64 @@
+import os
+import tempfile
+
+# models.database builds its engines at import time, so the test database has to be
+# chosen before anything imports it. TEST_DATABASE_URL runs the suite against another
+# backend (e.g. PostgreSQL); tests that need a specific backend skip themselves.
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.pop("REPLICA_DATABASE_URL", None)
+os.environ.pop("BOT_TENANTS", None)
+os.environ["CHANNEL_ID"] = "-100"
+os.environ.setdefault("SQLITE_BUSY_TIMEOUT_MS", "500")
+
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+from models.database import Base, engine, session_local, SGT, create_tables
+import models.order_model  # noqa: F401  (registers the tables)
+import models.order_search  # noqa: F401  (registers the search index DDL)
+
+def _empty_tables():
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+        if connection.dialect.name == "sqlite":
+            connection.execute(text("INSERT INTO orders_fts(orders_fts) VALUES ('delete-all')"))
+
+@pytest.fixture
+def db():
+    """Empty tables for every test, also when TEST_DATABASE_URL still holds rows from elsewhere."""
+    create_tables()
+    _empty_tables()
+    yield engine
+    _empty_tables()
+
+def make_order(session, **fields):
+    from models.order_model import Order
+    now = datetime.now(SGT)
+    values = dict(
+        order_text="chicken rice",
+        location="SCIS",
+        earliest_pickup_time=now + timedelta(minutes=30),
+        latest_pickup_time=now + timedelta(hours=1),
+        details="no spicy",
+        delivery_fee="2",
+        user_id=1,
+    )
+    values.update(fields)
+    order = Order(**values)
+    session.add(order)
+    session.flush()
+    return order
+
+@pytest.fixture
+def new_session():
+    """Opens sessions outside of any update scope, closing them afterwards."""
+    sessions = []
+    def factory():
+        session = session_local()
+        sessions.append(session)
+        return session
+    yield factory
+    for session in sessions:
+        session.close()
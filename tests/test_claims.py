@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from models.database import engine, session_scope
+from models.order_model import Order, OrderEvent
+from models.order_queries import claimable_order
+from models.order_status import CLAIMED
+from controllers.claim_steps.perform_claim import perform_claim
+from views import messages
+from tests.conftest import make_order
+
+class RecordingMessage:
+    def __init__(self):
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+def fake_update(user_id):
+    message = RecordingMessage()
+    update = SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id, username=f"runner{user_id}"),
+        message=message,
+        callback_query=None
+    )
+    return update, SimpleNamespace(bot=SimpleNamespace(username="bot"))
+
+@pytest.mark.skipif(
+    engine.dialect.name != "sqlite",
+    reason="On PostgreSQL the second claimable_order() waits for the first claim's row lock"
+)
+def test_racing_claims_on_sqlite_let_exactly_one_through(db, new_session):
+    with session_scope() as session:
+        order_id = make_order(session).id
+
+    # Both runners read the order as open before either commits. SQLite ignores
+    # FOR UPDATE, so only the status check on the UPDATE can stop the second claim.
+    first, second = new_session(), new_session()
+    first_order, second_order = claimable_order(first, order_id), claimable_order(second, order_id)
+    assert first_order is not None and second_order is not None
+
+    first_update, context = fake_update(2)
+    second_update, _ = fake_update(3)
+    asyncio.run(perform_claim(first, first_order, order_id, first_update, context))
+    asyncio.run(perform_claim(second, second_order, order_id, second_update, context))
+
+    assert first_update.message.replies[-1] != messages.CLAIM_FAILED.format(order_id=order_id)
+    assert second_update.message.replies == [messages.CLAIM_FAILED.format(order_id=order_id)]
+    with session_scope() as session:
+        order = session.get(Order, order_id)
+        assert (order.status, order.runner_id) == (CLAIMED, 2)
+        claims = session.query(OrderEvent).filter(OrderEvent.order_id == order_id, OrderEvent.to_status == CLAIMED).count()
+        assert claims == 1
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from models.database import SGT
+from models.order_model import Order, OutboxMessage
+from models.order_status import CLAIMED
+from models.outbox import enqueue_channel_post, enqueue_channel_edit
+from tasks import drain_outbox as drain_outbox_module
+from tasks.drain_outbox import drain_outbox
+from tests.conftest import make_order
+
+class SlowBot:
+    """Fake bot whose sends yield to the event loop and can run a callback mid-send."""
+
+    def __init__(self, during_send=None):
+        self.during_send = during_send
+        self.sent = []
+
+    async def send_message(self, chat_id, text, parse_mode=None, reply_markup=None):
+        await asyncio.sleep(0)
+        self.sent.append(chat_id)
+        if self.during_send:
+            self.during_send(len(self.sent))
+        return SimpleNamespace(message_id=100 + len(self.sent))
+
+def test_claim_commits_while_a_drain_is_sending(db, new_session):
+    with new_session() as session:
+        first = make_order(session)
+        second = make_order(session)
+        enqueue_channel_post(session, first, "first", parse_mode=None)
+        enqueue_channel_post(session, second, "second", parse_mode=None)
+        session.commit()
+        first_id = first.id
+
+    def claim_first_order(sent_count):
+        # Runs after the first post was sent and before the drainer commits. A write
+        # lock held by the drainer would make this fail with "database is locked".
+        if sent_count != 2:
+            return
+        with new_session() as claim_session:
+            order = claim_session.get(Order, first_id)
+            order.runner_id = 2
+            order.transition_to(CLAIMED, actor_id=2)
+            claim_session.commit()
+
+    bot = SlowBot(during_send=claim_first_order)
+    asyncio.run(drain_outbox(bot))
+
+    with new_session() as session:
+        order = session.get(Order, first_id)
+        assert order.status == CLAIMED
+        assert order.channel_message_id == 101
+        assert session.query(OutboxMessage).filter(OutboxMessage.status == 'sent').count() == 2
+
+def test_edit_of_an_unsent_post_backs_off(db, new_session, monkeypatch):
+    monkeypatch.setattr(drain_outbox_module.channel_budget, "allow", lambda key: True)
+    now = datetime.now(SGT)
+    with new_session() as session:
+        order = make_order(session)
+        enqueue_channel_post(session, order, "post", parse_mode=None)
+        enqueue_channel_edit(session, order, "edit", parse_mode=None)
+        session.flush()
+        post, edit = session.query(OutboxMessage).order_by(OutboxMessage.id).all()
+        # The post was deferred (e.g. by the channel budget); the edit is due.
+        post.next_attempt_at = now + timedelta(minutes=5)
+        edit.next_attempt_at = now - timedelta(seconds=1)
+        session.commit()
+        edit_id = edit.id
+
+    bot = SlowBot()
+    asyncio.run(drain_outbox(bot))
+    # Pushed back like a failed send, so the next run does not pick it up again.
+    asyncio.run(drain_outbox(bot))
+
+    with new_session() as session:
+        edit = session.get(OutboxMessage, edit_id)
+        assert (edit.status, edit.attempts) == ('pending', 1)
+    assert bot.sent == []
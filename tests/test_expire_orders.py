@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from models.database import engine, session_scope, SGT
+from models.order_model import OrderEvent, OutboxMessage
+from models.order_status import EXPIRED
+from tasks import expire_orders
+from tests.conftest import make_order
+
+SWEEPERS = 4
+ORDERS = 200
+
+class FakeBot:
+    async def get_me(self):
+        return SimpleNamespace(username="bot")
+
+@pytest.mark.skipif(
+    engine.dialect.name != "postgresql",
+    reason="needs row locks with SKIP LOCKED; set TEST_DATABASE_URL to a PostgreSQL database"
+)
+def test_concurrent_sweepers_expire_each_order_once(db, monkeypatch):
+    monkeypatch.setattr(expire_orders, "EXPIRE_CHUNK_SIZE", 5)
+    now = datetime.now(SGT)
+    with session_scope() as session:
+        for _ in range(ORDERS):
+            make_order(session, earliest_pickup_time=now - timedelta(hours=2), latest_pickup_time=now - timedelta(hours=1))
+
+    start = threading.Barrier(SWEEPERS)
+    errors = []
+
+    def sweep():
+        start.wait()
+        try:
+            asyncio.run(expire_orders.expire_old_orders(FakeBot()))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=sweep) for _ in range(SWEEPERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    with session_scope() as session:
+        expired_events = Counter(
+            order_id for order_id, in session.query(OrderEvent.order_id).filter(OrderEvent.to_status == EXPIRED)
+        )
+        notifications = Counter(
+            text for text, in session.query(OutboxMessage.text).filter(OutboxMessage.kind == 'message')
+        )
+    assert len(expired_events) == ORDERS
+    assert set(expired_events.values()) == {1}
+    assert len(notifications) == ORDERS
+    assert set(notifications.values()) == {1}
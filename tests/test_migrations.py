@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import text, inspect
+from sqlalchemy.orm import Session
+
+from models.database import build_engine
+from models.order_model import Order, ReportUser, RunnerReview, OrderStatsHourly, ClaimLatencyHourly
+from models.reviews import get_reputation
+from models.moderation import pending_report_summary
+from tasks import (
+    migrate_order_status, migrate_tenants, migrate_order_channels, migrate_moderation, migrate_reviews,
+    migrate_export_indexes
+)
+
+# Tables as they exist on deployments from before the migrations in tasks/.
+BASELINE_SCHEMA = [
+    """CREATE TABLE orders (
+        id INTEGER NOT NULL PRIMARY KEY, order_text VARCHAR NOT NULL, location VARCHAR, time VARCHAR,
+        earliest_pickup_time DATETIME, latest_pickup_time DATETIME, details VARCHAR, delivery_fee VARCHAR,
+        claimed BOOLEAN, expired BOOLEAN, user_id BIGINT NOT NULL, runner_id BIGINT, user_handle VARCHAR,
+        runner_handle VARCHAR, completed BOOLEAN NOT NULL, order_placed_time DATETIME,
+        order_claimed_time DATETIME, channel_message_id INTEGER
+    )""",
+    """CREATE TABLE stripe_accounts (telegram_id BIGINT NOT NULL PRIMARY KEY, stripe_account_id VARCHAR NOT NULL)""",
+    """CREATE TABLE report_user (
+        id INTEGER NOT NULL PRIMARY KEY, reporter_id BIGINT NOT NULL, order_id INTEGER NOT NULL,
+        reported_user_id BIGINT NOT NULL, reason VARCHAR NOT NULL, timestamp DATETIME
+    )""",
+    """CREATE TABLE runner_reviews (
+        id INTEGER NOT NULL PRIMARY KEY, runner_id BIGINT NOT NULL, user_id BIGINT NOT NULL,
+        order_id INTEGER NOT NULL REFERENCES orders (id), rating FLOAT NOT NULL, comment VARCHAR
+    )""",
+    """CREATE TABLE order_stats_hourly (
+        hour DATETIME NOT NULL, location VARCHAR NOT NULL, placed INTEGER NOT NULL, claimed INTEGER NOT NULL,
+        expired INTEGER NOT NULL, claim_seconds_sum FLOAT NOT NULL, PRIMARY KEY (hour, location)
+    )""",
+    """CREATE TABLE claim_latency_hourly (
+        hour DATETIME NOT NULL, bucket_seconds INTEGER NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (hour, bucket_seconds)
+    )""",
+    """INSERT INTO orders (id, order_text, location, claimed, expired, user_id, completed, channel_message_id)
+       VALUES (1, 'chicken rice', 'SCIS', 1, 0, 1, 0, 10), (2, 'kaya toast', 'SOE', 0, 0, 2, 0, 11)""",
+    """INSERT INTO report_user (id, reporter_id, order_id, reported_user_id, reason) VALUES (1, 1, 1, 3, 'no show')""",
+    """INSERT INTO runner_reviews (id, runner_id, user_id, order_id, rating) VALUES (1, 5, 1, 1, 4), (2, 5, 2, 2, 5)""",
+    """INSERT INTO order_stats_hourly VALUES ('2024-03-27 12:00:00', 'scis', 2, 1, 0, 300.0)""",
+    """INSERT INTO claim_latency_hourly VALUES ('2024-03-27 12:00:00', 300, 1)""",
+]
+
+MIGRATIONS = [
+    migrate_order_status, migrate_tenants, migrate_order_channels, migrate_moderation, migrate_reviews,
+    migrate_export_indexes
+]
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as connection:
+        for statement in BASELINE_SCHEMA:
+            connection.execute(text(statement))
+    yield engine
+    engine.dispose()
+
+@pytest.mark.parametrize("migrations", [MIGRATIONS, MIGRATIONS[::-1]], ids=["forward", "reverse"])
+def test_migrations_run_in_either_order_and_twice(baseline_engine, migrations):
+    for migration in migrations + migrations:
+        migration.migrate(bind=baseline_engine)
+
+    with Session(baseline_engine) as session:
+        orders = session.query(Order).order_by(Order.id).all()
+        assert [(order.status, order.tenant_id, order.channel_id) for order in orders] == [
+            ('claimed', 'default', '-100'), ('open', 'default', '-100')
+        ]
+        assert [report.status for report in session.query(ReportUser)] == ['pending']
+        assert [user_id for user_id, *_ in pending_report_summary(session)] == [3]
+        assert session.query(RunnerReview).count() == 2
+        reputation = get_reputation(session, 5)
+        assert (reputation.review_count, reputation.mean_rating, reputation.recent_ratings) == (2, 4.5, '4,5')
+
+    for model in (OrderStatsHourly, ClaimLatencyHourly):
+        assert inspect(baseline_engine).get_pk_constraint(model.__tablename__)['constrained_columns'][0] == 'tenant_id'
+    with Session(baseline_engine) as session:
+        assert session.query(OrderStatsHourly.tenant_id, OrderStatsHourly.placed).all() == [('default', 2)]
+        assert session.query(ClaimLatencyHourly.tenant_id, ClaimLatencyHourly.count).all() == [('default', 1)]
+
+def test_export_indexes_are_created_on_existing_tables(baseline_engine):
+    migrate_export_indexes.migrate(bind=baseline_engine)
+    migrate_export_indexes.migrate(bind=baseline_engine)
+    inspector = inspect(baseline_engine)
+    assert 'ix_orders_order_placed_time' in {index['name'] for index in inspector.get_indexes('orders')}
+    assert 'ix_report_user_timestamp' in {index['name'] for index in inspector.get_indexes('report_user')}
+    with baseline_engine.connect() as connection:
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM orders WHERE order_placed_time >= '2024-01-01'"
+        )).all()
+    assert any('ix_orders_order_placed_time' in row[-1] for row in plan)
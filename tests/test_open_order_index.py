@@ -0,0 +1,39 @@
+import random
+from datetime import datetime, timedelta
+
+from models.database import SGT
+from models.order_queries import OpenOrder
+from utils.open_order_index import OpenOrderIndex
+
+def build_index(rng, count, now):
+    orders = []
+    for order_id in range(count):
+        earliest = now + timedelta(minutes=rng.randint(-120, 48 * 60))
+        latest = earliest + timedelta(minutes=rng.choice([15, 30, 60, 240]))
+        orders.append(OpenOrder(order_id, "laksa", "SCIS", earliest, latest, "", "2"))
+    orders.sort(key=lambda order: order.earliest_pickup_time)
+    index = OpenOrderIndex()
+    index._build(orders)
+    return index, orders
+
+def test_overlapping_matches_a_full_scan():
+    rng = random.Random(7)
+    now = datetime.now(SGT)
+    index, orders = build_index(rng, 2000, now)
+    for _ in range(200):
+        start = now + timedelta(minutes=rng.randint(-60, 48 * 60))
+        end = start + timedelta(minutes=rng.randint(1, 180))
+        expected = [
+            order for order in orders
+            if order.earliest_pickup_time <= end and order.latest_pickup_time >= start and order.latest_pickup_time > now
+        ]
+        assert index.overlapping(None, start, end) == expected
+
+def test_overlapping_includes_windows_that_only_touch():
+    now = datetime.now(SGT)
+    index = OpenOrderIndex()
+    start = now + timedelta(hours=1)
+    touching_end = OpenOrder(1, "laksa", "SCIS", start - timedelta(hours=4), start, "", "2")
+    touching_start = OpenOrder(2, "laksa", "SCIS", start + timedelta(minutes=30), start + timedelta(hours=1), "", "2")
+    index._build([touching_end, touching_start])
+    assert index.overlapping(None, start, start + timedelta(minutes=30)) == [touching_end, touching_start]
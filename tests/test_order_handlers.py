@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from models.database import session_scope, get_session, SGT
+from models.order_status import CLAIMED, COMPLETED
+from controllers.order_state import user_states
+from controllers.order_steps.handle_deletion import handle_deletion
+from controllers.order_management.cancel_claim import cancel_claim
+from controllers.review_steps.complete_order import complete_order
+from tests.conftest import make_order
+
+class FakeMessage:
+    """Records, for every reply, whether the update's session still had a transaction open."""
+
+    def __init__(self, text=""):
+        self.text = text
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append((text, get_session().in_transaction()))
+
+def fake_update(user_id, text=""):
+    message = FakeMessage(text)
+    update = SimpleNamespace(
+        effective_user=SimpleNamespace(id=user_id, username="user"),
+        message=message,
+        callback_query=SimpleNamespace(message=message)
+    )
+    return update, SimpleNamespace(bot=SimpleNamespace(username="bot"))
+
+def run_in_update(handler, *args):
+    async def run():
+        with session_scope():
+            await handler(*args)
+    asyncio.run(run())
+
+def seed(**fields):
+    with session_scope() as session:
+        return make_order(session, **fields).id
+
+def assert_replied_outside_transaction(update):
+    assert update.message.replies
+    assert not any(in_transaction for _, in_transaction in update.message.replies)
+
+@pytest.mark.parametrize("response, claimed", [("yes", True), ("no", False)])
+def test_deletion_replies_after_releasing_the_order(db, response, claimed):
+    order_id = seed(status=CLAIMED if claimed else "open", runner_id=2 if claimed else None)
+    update, context = fake_update(1, response)
+    user_states[1] = {"state": "deleting_order", "selected_order": order_id}
+    run_in_update(handle_deletion, update, context)
+    assert_replied_outside_transaction(update)
+
+def test_deletion_of_unknown_order_replies_after_releasing(db):
+    update, context = fake_update(1, "yes")
+    user_states[1] = {"state": "deleting_order", "selected_order": 12345}
+    run_in_update(handle_deletion, update, context)
+    assert_replied_outside_transaction(update)
+
+def test_cancel_claim_after_pickup_replies_after_releasing(db):
+    now = datetime.now(SGT)
+    order_id = seed(
+        status=CLAIMED, runner_id=2,
+        earliest_pickup_time=now - timedelta(hours=2), latest_pickup_time=now - timedelta(hours=1)
+    )
+    update, context = fake_update(2)
+    user_states[2] = {"state": "canceling_claim", "selected_order": order_id}
+    run_in_update(cancel_claim, update, context)
+    assert_replied_outside_transaction(update)
+
+def test_cancel_claim_of_someone_elses_order_replies_after_releasing(db):
+    order_id = seed(status=CLAIMED, runner_id=3)
+    update, context = fake_update(2)
+    user_states[2] = {"state": "canceling_claim", "selected_order": order_id}
+    run_in_update(cancel_claim, update, context)
+    assert_replied_outside_transaction(update)
+
+@pytest.mark.parametrize("status", [COMPLETED, "open"])
+def test_complete_order_replies_after_releasing(db, status):
+    order_id = seed(status=status, runner_id=2)
+    update, context = fake_update(1)
+    run_in_update(complete_order, update, context, order_id)
+    assert_replied_outside_transaction(update)
+
+def test_cancel_claim_commits_before_replying(db):
+    order_id = seed(status=CLAIMED, runner_id=2)
+    update, context = fake_update(2)
+    user_states[2] = {"state": "canceling_claim", "selected_order": order_id}
+    run_in_update(cancel_claim, update, context)
+    assert update.message.replies[0][0] == f"You have canceled your claim on Order ID {order_id}."
+    assert_replied_outside_transaction(update)
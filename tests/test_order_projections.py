@@ -0,0 +1,50 @@
+from models.database import session_scope
+from models.order_model import Order, OrderEvent
+from models.order_projections import BoardProjection, replay
+from models.order_status import OPEN, CLAIMED, COMPLETED, CANCELLED, EXPIRED
+from tests.conftest import make_order
+
+def place(session, *transitions):
+    order = make_order(session)
+    session.add(OrderEvent.for_order(order, None))
+    for status in transitions:
+        if status == CLAIMED:
+            order.runner_id = 2
+        order.transition_to(status)
+    session.flush()
+    return order.id
+
+def test_board_keeps_only_live_orders(db):
+    with session_scope() as session:
+        open_id = place(session)
+        claimed_id = place(session, CLAIMED)
+        reopened_id = place(session, CLAIMED, OPEN)
+        for transitions in ([CLAIMED, COMPLETED], [CANCELLED], [EXPIRED]):
+            place(session, *transitions)
+        session.commit()
+
+        board = BoardProjection()
+        replay(session, [board])
+    assert board.statuses == {open_id: OPEN, claimed_id: CLAIMED, reopened_id: OPEN}
+    assert board.open_order_ids == {open_id, reopened_id}
+
+def test_board_write_restores_every_status_from_the_log(db):
+    with session_scope() as session:
+        order_ids = {
+            OPEN: place(session),
+            CLAIMED: place(session, CLAIMED),
+            COMPLETED: place(session, CLAIMED, COMPLETED),
+            CANCELLED: place(session, CANCELLED),
+            EXPIRED: place(session, EXPIRED),
+        }
+        session.commit()
+        # Out of line with the log, e.g. after a bad manual fix.
+        session.query(Order).update({Order.status: "corrupt"}, synchronize_session=False)
+        session.commit()
+
+        board = BoardProjection()
+        replay(session, [board])
+        assert board.write(session) == len(order_ids)
+        session.commit()
+        statuses = dict(session.query(Order.id, Order.status).all())
+    assert statuses == {order_id: status for status, order_id in order_ids.items()}
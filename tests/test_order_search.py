@@ -0,0 +1,37 @@
+from models.database import session_scope
+from models.order_model import Order
+from models.order_search import search_orders
+from models.order_status import OPEN, CLAIMED, COMPLETED
+from tests.conftest import make_order
+
+def found(query):
+    with session_scope() as session:
+        return [order.id for order in search_orders(session, query)]
+
+def test_search_matches_open_orders_only(db):
+    with session_scope() as session:
+        open_id = make_order(session, order_text="chicken rice").id
+        make_order(session, order_text="chicken rice", status=COMPLETED)
+    assert found("chicken rice") == [open_id]
+
+def test_search_follows_status_and_text_changes(db):
+    with session_scope() as session:
+        order_id = make_order(session, order_text="chicken rice", details="no spicy").id
+    assert found("spicy") == [order_id]
+
+    with session_scope() as session:
+        order = session.get(Order, order_id)
+        order.runner_id = 2
+        order.transition_to(CLAIMED)
+    assert found("spicy") == []
+
+    with session_scope() as session:
+        order = session.get(Order, order_id)
+        order.transition_to(OPEN)
+        order.runner_id = None
+    assert found("spicy") == [order_id]
+
+    with session_scope() as session:
+        session.get(Order, order_id).details = "extra chilli"
+    assert found("spicy") == []
+    assert found("chilli") == [order_id]
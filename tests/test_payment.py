@@ -0,0 +1,75 @@
+import time
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import payment
+from models.database import session_scope, SGT
+from models.order_model import CheckoutSession
+from utils.tenants import tenant_scope, current_tenant_id, DEFAULT_TENANT_ID
+
+class FakeStripe:
+    """Stands in for create_checkout_session; slow enough for concurrent callers to overlap."""
+
+    def __init__(self, valid_for=timedelta(hours=24)):
+        self.valid_for = valid_for
+        self.calls = []
+
+    def __call__(self, amount, currency, user_id, order_id=None):
+        self.calls.append(current_tenant_id())
+        time.sleep(0.05)
+        number = len(self.calls)
+        return SimpleNamespace(
+            id=f"cs_{number}", url=f"https://checkout.test/{number}",
+            expires_at=(datetime.now(SGT) + self.valid_for).timestamp()
+        )
+
+@pytest.fixture
+def stripe(monkeypatch):
+    fake = FakeStripe()
+    monkeypatch.setattr(payment, "create_checkout_session", fake)
+    return fake
+
+class RecordingMessage:
+    def __init__(self):
+        self.links = []
+
+    async def reply_text(self, text, reply_markup=None, **kwargs):
+        self.links.append(reply_markup.inline_keyboard[0][0].url if reply_markup else text)
+
+async def pay(order_id, amount="2.50"):
+    """One update asking for a payment link, with its own session like a real handler."""
+    message = RecordingMessage()
+    update = SimpleNamespace(message=SimpleNamespace(from_user=SimpleNamespace(id=1), reply_text=message.reply_text))
+    with tenant_scope(DEFAULT_TENANT_ID), session_scope() as session:
+        await payment.send_payment_link(update, None, order_id, amount)
+        # The shared task wrote through its own session, not this update's.
+        assert not session.new and not session.in_transaction()
+    return message.links
+
+def test_concurrent_requests_share_one_checkout_session(db, stripe):
+    async def run():
+        return await asyncio.gather(pay(1), pay(1), pay(1))
+    links = asyncio.run(run())
+    assert links == [["https://checkout.test/1"]] * 3
+    assert stripe.calls == [DEFAULT_TENANT_ID]
+    with session_scope() as session:
+        assert session.query(CheckoutSession.url).all() == [("https://checkout.test/1",)]
+
+def test_stored_session_is_reused_until_close_to_expiry(db, stripe):
+    assert asyncio.run(pay(1)) == ["https://checkout.test/1"]
+    assert asyncio.run(pay(1)) == ["https://checkout.test/1"]
+    # A different amount is a different checkout.
+    assert asyncio.run(pay(1, "3")) == ["https://checkout.test/2"]
+
+    with session_scope() as session:
+        stored = session.get(CheckoutSession, (1, 250, "sgd"))
+        stored.expires_at = datetime.now(SGT) + timedelta(seconds=payment.CHECKOUT_REUSE_MARGIN_SECONDS - 1)
+    assert asyncio.run(pay(1)) == ["https://checkout.test/3"]
+    assert len(stripe.calls) == 3
+
+def test_invalid_amount_is_rejected_without_a_checkout(db, stripe):
+    assert asyncio.run(pay(1, "0.50")) == ["❌ Please enter a valid amount of at least $1.00."]
+    assert stripe.calls == []
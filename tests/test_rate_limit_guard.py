@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from telegram.ext import ApplicationHandlerStop
+
+from controllers import rate_limit_guard
+from controllers.order_state import user_states
+from controllers.rate_limit_guard import classify_update, enforce_rate_limits
+from utils.rate_limit import TokenBucketLimiter
+
+def message_update(text, user_id=1):
+    return SimpleNamespace(
+        inline_query=None,
+        callback_query=None,
+        message=SimpleNamespace(text=text),
+        effective_user=SimpleNamespace(id=user_id)
+    )
+
+@pytest.mark.parametrize("text, budget", [
+    ("/vieworders", "vieworders"),
+    ("/claim@smuth_bot 12", "claim"),
+    ("/start claim_12", "claim"),
+    ("/start", None),
+    ("hello", None),
+])
+def test_commands_and_deep_links_are_classified(text, budget):
+    user_states.pop(1, None)
+    assert classify_update(message_update(text)) == budget
+
+def test_order_id_reply_is_charged_as_a_claim():
+    user_states[1] = {"state": "awaiting_order_id"}
+    try:
+        assert classify_update(message_update("12")) == "claim"
+        user_states[1] = {"state": "awaiting_order_meal"}
+        assert classify_update(message_update("chicken rice")) is None
+    finally:
+        user_states.pop(1, None)
+
+def test_rejected_inline_query_is_answered_personally(monkeypatch):
+    monkeypatch.setitem(rate_limit_guard.limiters, "inline", TokenBucketLimiter(0, 0))
+    answers = []
+
+    async def answer(results, **kwargs):
+        answers.append(kwargs)
+
+    update = SimpleNamespace(
+        inline_query=SimpleNamespace(answer=answer),
+        callback_query=None,
+        message=None,
+        effective_user=SimpleNamespace(id=1)
+    )
+    with pytest.raises(ApplicationHandlerStop):
+        asyncio.run(enforce_rate_limits(update, None))
+    assert answers == [{"cache_time": 5, "is_personal": True}]
@@ -0,0 +1,53 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from models import database
+from models.database import Base, build_engine, session_scope, get_session, get_read_session
+from models.order_model import Order
+from tests.conftest import make_order
+
+@pytest.fixture
+def replica(db, monkeypatch):
+    """A second database standing in for the replica, holding different rows than the primary."""
+    replica_engine = build_engine("sqlite:///" + os.path.join(tempfile.mkdtemp(), "replica.db"))
+    Base.metadata.create_all(bind=replica_engine)
+    monkeypatch.setattr(database, "replica_engine", replica_engine)
+    monkeypatch.setattr(database, "_last_write_at", {})
+    with Session(replica_engine) as session:
+        make_order(session, order_text="from replica")
+        session.commit()
+    with session_scope() as session:
+        make_order(session, order_text="from primary")
+    yield replica_engine
+    replica_engine.dispose()
+
+def order_texts(session):
+    return session.execute(select(Order.order_text)).scalars().all()
+
+def test_reads_go_to_the_replica_without_rerouting_the_update_session(replica):
+    with session_scope(user_id=1):
+        read_session = get_read_session(1)
+        assert read_session is not get_session()
+        assert order_texts(read_session) == ["from replica"]
+        # The update's own session, used for writes, stays on the primary.
+        assert order_texts(get_session()) == ["from primary"]
+    assert not read_session.in_transaction()
+
+def test_replica_session_sends_anything_but_plain_selects_to_the_primary(replica):
+    with session_scope(user_id=1):
+        read_session = get_read_session(1)
+        assert read_session.get_bind(clause=select(Order)) is replica
+        assert read_session.get_bind(clause=select(Order).with_for_update()) is database.engine
+        assert read_session.get_bind(clause=update(Order).values(details="")) is database.engine
+        assert read_session.get_bind(mapper=Order.__mapper__) is database.engine
+
+def test_users_who_just_wrote_read_from_the_primary(replica):
+    with session_scope(user_id=1) as session:
+        make_order(session, order_text="just placed")
+    with session_scope(user_id=1):
+        assert get_read_session(1) is get_session()
+        assert sorted(order_texts(get_read_session(1))) == ["from primary", "just placed"]
@@ -0,0 +1,85 @@
+import time
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from models.database import session_scope
+from models.order_model import Order, RunnerReview
+from models.order_status import COMPLETED
+from models.reviews import record_review, get_reputation
+from controllers.review_steps import handle_rating as handle_rating_module
+from controllers.review_steps.handle_rating import handle_rating
+from views import messages
+from tests.conftest import make_order
+
+RUNNER_ID = 5
+
+class RecordingMessage:
+    def __init__(self):
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+    async def edit_text(self, text, **kwargs):
+        self.replies.append(text)
+
+def seed_completed_orders(count):
+    with session_scope() as session:
+        return [make_order(session, status=COMPLETED, runner_id=RUNNER_ID).id for _ in range(count)]
+
+def test_double_tap_on_a_rating_is_answered_as_already_rated(db, new_session, monkeypatch):
+    order_id, = seed_completed_orders(1)
+
+    def other_tap_commits_first(session, order, rating):
+        # The other tap passed the same "already rated" check and commits in between.
+        other = new_session()
+        record_review(other, other.get(Order, order.id), 4.0)
+        other.commit()
+        return record_review(session, order, rating)
+    monkeypatch.setattr(handle_rating_module, "record_review", other_tap_commits_first)
+
+    message = RecordingMessage()
+    update = SimpleNamespace(effective_user=SimpleNamespace(id=1), callback_query=SimpleNamespace(message=message))
+
+    async def tap():
+        with session_scope():
+            await handle_rating(update, None, order_id, 5)
+    asyncio.run(tap())
+
+    assert message.replies == [messages.ALREADY_RATED]
+    with session_scope() as session:
+        assert [review.rating for review in session.query(RunnerReview)] == [4.0]
+        assert get_reputation(session, RUNNER_ID).review_count == 1
+
+def test_a_runners_first_two_reviews_can_land_together(db, new_session):
+    first_order_id, second_order_id = seed_completed_orders(2)
+    first_recorded = threading.Event()
+    errors = []
+
+    def review(order_id, rating, hold_seconds=0.0):
+        session = new_session()
+        try:
+            record_review(session, session.get(Order, order_id), rating)
+            session.flush()
+            if hold_seconds:
+                first_recorded.set()
+                time.sleep(hold_seconds)
+            session.commit()
+        except Exception as e:
+            errors.append(e)
+            first_recorded.set()
+
+    first = threading.Thread(target=review, args=(first_order_id, 4.0, 0.2))
+    first.start()
+    first_recorded.wait()
+    # Starts while the first transaction has created, but not committed, the reputation row.
+    second = threading.Thread(target=review, args=(second_order_id, 5.0))
+    second.start()
+    first.join()
+    second.join()
+
+    assert errors == []
+    with session_scope() as session:
+        reputation = get_reputation(session, RUNNER_ID)
+        assert (reputation.review_count, reputation.rating_sum) == (2, 9.0)
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.database import session_scope, SGT
+from models.order_model import OrderEvent, OrderStatsHourly
+from models.order_projections import RollupProjection, replay
+from models.order_status import CLAIMED
+from models.stats import record_order_placed, record_order_claimed, get_stats
+from utils import tenants
+from utils.tenants import Tenant, tenant_scope
+from tests.conftest import make_order
+
+@pytest.fixture
+def campuses(monkeypatch):
+    for tenant_id in ("smu", "ntu"):
+        monkeypatch.setitem(tenants._TENANTS_BY_ID, tenant_id, Tenant(tenant_id, None, "-100", ""))
+
+def place_and_claim(tenant_id, count):
+    with tenant_scope(tenant_id), session_scope() as session:
+        now = datetime.now(SGT)
+        for _ in range(count):
+            order = make_order(session, order_placed_time=now - timedelta(minutes=5))
+            session.add(OrderEvent.for_order(order, None, at=order.order_placed_time))
+            record_order_placed(session, order)
+            order.runner_id = 2
+            order.order_claimed_time = now
+            order.transition_to(CLAIMED, at=now)
+            record_order_claimed(session, order)
+
+def stats_of(tenant_id):
+    with tenant_scope(tenant_id), session_scope() as session:
+        # Two hourly buckets, so orders placed just before the hour are still counted.
+        stats = get_stats(session, hours=2)
+        return stats["placed"], stats["claimed"], stats["claim_p50_seconds"]
+
+def test_each_campus_only_sees_its_own_stats(db, campuses):
+    place_and_claim("smu", 3)
+    place_and_claim("ntu", 1)
+    assert stats_of("smu") == (3, 3, 300)
+    assert stats_of("ntu") == (1, 1, 300)
+
+def test_replayed_rollups_stay_per_campus(db, campuses):
+    place_and_claim("smu", 3)
+    place_and_claim("ntu", 1)
+    with session_scope() as session:
+        session.query(OrderStatsHourly).delete()
+        rollups = RollupProjection()
+        replay(session, [rollups])
+        rollups.write(session)
+    assert stats_of("smu") == (3, 3, 300)
+    assert stats_of("ntu") == (1, 1, 300)
+
+def test_scoped_replay_leaves_other_campuses_alone(db, campuses):
+    place_and_claim("smu", 3)
+    place_and_claim("ntu", 1)
+    with tenant_scope("ntu"), session_scope() as session:
+        rollups = RollupProjection()
+        replay(session, [rollups])
+        rollups.write(session)
+    assert stats_of("smu") == (3, 3, 300)
+    assert stats_of("ntu") == (1, 1, 300)
@@ -0,0 +1,33 @@
+from models.database import session_scope
+from models.order_model import Order
+from models.order_status import OPEN, CLAIMED, EXPIRED
+from utils.user_view_cache import UserViewCache
+from tests.conftest import make_order
+
+def test_sync_picks_up_changes_made_by_other_workers(db):
+    cache = UserViewCache()
+    with session_scope() as session:
+        expiring_id = make_order(session, user_id=1).id
+        claimed = make_order(session, user_id=1, runner_id=2)
+        claimed.transition_to(CLAIMED, actor_id=2)
+        claimed_id = claimed.id
+        session.commit()
+        cache.sync(session)
+        assert [row.id for row in cache.orders(session, 1)] == [expiring_id, claimed_id]
+        assert [row.id for row in cache.claims(session, 2)] == [claimed_id]
+
+    # Another worker expires one order and the runner gives up the other claim there;
+    # neither invalidates this worker's cache directly.
+    with session_scope() as session:
+        session.get(Order, expiring_id).transition_to(EXPIRED)
+        order = session.get(Order, claimed_id)
+        order.runner_id = None
+        order.transition_to(OPEN, actor_id=2)
+        session.commit()
+
+    with session_scope() as session:
+        assert [row.id for row in cache.orders(session, 1)] == [expiring_id, claimed_id]
+        assert cache.sync(session) == 2
+        assert [row.id for row in cache.orders(session, 1)] == [claimed_id]
+        assert cache.claims(session, 2) == ()
+        assert cache.sync(session) == 0
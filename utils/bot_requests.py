@@ -0,0 +1,29 @@
+import os
+from telegram.request import HTTPXRequest
+
+# Outgoing Bot API calls (sends, edits, answers) and long-polling use separate
+# connection pools so a pending get_updates never holds a connection a send needs.
+BOT_CONNECTION_POOL_SIZE = int(os.getenv("BOT_CONNECTION_POOL_SIZE", "32"))
+BOT_POOL_TIMEOUT = float(os.getenv("BOT_POOL_TIMEOUT", "5"))
+BOT_CONNECT_TIMEOUT = float(os.getenv("BOT_CONNECT_TIMEOUT", "5"))
+BOT_READ_TIMEOUT = float(os.getenv("BOT_READ_TIMEOUT", "10"))
+BOT_WRITE_TIMEOUT = float(os.getenv("BOT_WRITE_TIMEOUT", "10"))
+
+def build_send_request() -> HTTPXRequest:
+    return HTTPXRequest(
+        connection_pool_size=BOT_CONNECTION_POOL_SIZE,
+        connect_timeout=BOT_CONNECT_TIMEOUT,
+        read_timeout=BOT_READ_TIMEOUT,
+        write_timeout=BOT_WRITE_TIMEOUT,
+        pool_timeout=BOT_POOL_TIMEOUT
+    )
+
+def build_get_updates_request() -> HTTPXRequest:
+    # Only one get_updates call is ever in flight. Its read timeout is set per call
+    # by Bot.get_updates from the long-polling timeout.
+    return HTTPXRequest(
+        connection_pool_size=1,
+        connect_timeout=BOT_CONNECT_TIMEOUT,
+        write_timeout=BOT_WRITE_TIMEOUT,
+        pool_timeout=BOT_POOL_TIMEOUT
+    )
@@ -0,0 +1,60 @@
+import os
+from collections import OrderedDict
+from telegram.error import BadRequest
+
+from utils import metrics
+
+# Number of channel posts whose last rendered text is remembered.
+CHANNEL_SYNC_MAX_MESSAGES = int(os.getenv("CHANNEL_SYNC_MAX_MESSAGES", "5000"))
+
+class ChannelSync:
+    """
+    Keeps the last rendered text of every channel post so that edits which would
+    not change the post are skipped. Coalescing of edits to the same post happens
+    in the outbox drainer (see tasks/drain_outbox.py).
+    """
+
+    def __init__(self, max_messages: int = CHANNEL_SYNC_MAX_MESSAGES):
+        self.max_messages = max_messages
+        self._rendered = OrderedDict()  # (chat_id, message_id) -> (text, markup)
+
+    @staticmethod
+    def _render_key(text, reply_markup):
+        return text, reply_markup.to_json() if reply_markup else None
+
+    def remember(self, chat_id, message_id, text, reply_markup=None):
+        """Records the text of a freshly sent or edited post."""
+        key = (str(chat_id), message_id)
+        self._rendered[key] = self._render_key(text, reply_markup)
+        self._rendered.move_to_end(key)
+        while len(self._rendered) > self.max_messages:
+            self._rendered.popitem(last=False)
+
+    def is_rendered(self, chat_id, message_id, text, reply_markup=None) -> bool:
+        return self._rendered.get((str(chat_id), message_id)) == self._render_key(text, reply_markup)
+
+    async def edit(self, bot, chat_id, message_id, text, parse_mode=None, reply_markup=None) -> bool:
+        """
+        Edits a post unless it already shows this text. Returns True if an API call was made.
+        Errors other than "message is not modified" are raised to the caller.
+        """
+        if self.is_rendered(chat_id, message_id, text, reply_markup):
+            metrics.inc("channel_sync.calls_saved", reason="unchanged")
+            return False
+        try:
+            await bot.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=text,
+                parse_mode=parse_mode,
+                reply_markup=reply_markup
+            )
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                metrics.inc("channel_sync.edits_failed")
+                raise
+        metrics.inc("channel_sync.edits_sent")
+        self.remember(chat_id, message_id, text, reply_markup)
+        return True
+
+channel_sync = ChannelSync()
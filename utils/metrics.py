@@ -0,0 +1,70 @@
+import logging
+import threading
+from collections import defaultdict
+
+# In-process metrics registry. Counters and timings are keyed by name plus
+# optional labels, e.g. inc("db.sessions.leaked") or inc("ratelimit.rejected", command="order").
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_timings = {}
+_gauges = {}
+_context_labels = None
+
+def set_context_labels(fn):
+    """
+    Registers a callable returning labels added to every counter and timing recorded
+    afterwards, e.g. the tenant of the update being processed.
+    """
+    global _context_labels
+    _context_labels = fn
+
+def _with_context(labels: dict) -> dict:
+    return {**_context_labels(), **labels} if _context_labels else labels
+
+def _key(name: str, labels: dict) -> str:
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+def inc(name: str, amount: float = 1, **labels):
+    """Increments a counter."""
+    key = _key(name, _with_context(labels))
+    with _lock:
+        _counters[key] += amount
+
+def observe(name: str, value: float, **labels):
+    """Records a timing/size observation as count, sum and max."""
+    key = _key(name, _with_context(labels))
+    with _lock:
+        stats = _timings.setdefault(key, {"count": 0, "sum": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["sum"] += value
+        stats["max"] = max(stats["max"], value)
+
+def register_gauge(name: str, fn, **labels):
+    """Registers a callable whose value is read every time a snapshot is taken."""
+    with _lock:
+        _gauges[_key(name, labels)] = fn
+
+def snapshot() -> dict:
+    """Returns the current value of every counter, timing and gauge."""
+    with _lock:
+        result = dict(_counters)
+        for key, stats in _timings.items():
+            result[f"{key}.count"] = stats["count"]
+            result[f"{key}.avg"] = stats["sum"] / stats["count"] if stats["count"] else 0.0
+            result[f"{key}.max"] = stats["max"]
+        gauges = list(_gauges.items())
+    for key, fn in gauges:
+        try:
+            result[key] = fn()
+        except Exception as e:
+            logging.warning(f"Failed to read gauge {key}: {e}")
+    return result
+
+def format_snapshot(values: dict = None) -> str:
+    values = snapshot() if values is None else values
+    return "\n".join(f"{key} = {value:g}" if isinstance(value, (int, float)) else f"{key} = {value}"
+                     for key, value in sorted(values.items()))
@@ -0,0 +1,112 @@
+import os
+import time
+import bisect
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from models.database import SGT
+from models.order_queries import open_orders
+from utils import metrics
+from utils.tenants import TenantLocal
+
+OPEN_ORDER_INDEX_TTL_SECONDS = float(os.getenv("OPEN_ORDER_INDEX_TTL_SECONDS", "30"))
+OPEN_ORDER_QUERY_CACHE_SIZE = int(os.getenv("OPEN_ORDER_QUERY_CACHE_SIZE", "256"))
+
+class OpenOrderIndex:
+    """
+    In-memory copy of the open orders for fast lookups. The index is reloaded when it
+    is older than its TTL or after `invalidate()` is called by a write path, and search
+    results are cached per query until the next reload.
+    """
+
+    def __init__(self, ttl_seconds: float = OPEN_ORDER_INDEX_TTL_SECONDS, cache_size: int = OPEN_ORDER_QUERY_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.cache_size = cache_size
+        self._orders = []
+        self._search_text = []  # (meal, location) lowercased, parallel to _orders
+        self._earliest = []  # earliest pickup times, parallel to _orders (which are sorted by it)
+        self._max_span = timedelta(0)  # longest pickup window among the indexed orders
+        self._loaded_at = None
+        self._query_cache = OrderedDict()
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def load(self, session):
+        self._build(open_orders(session))
+        metrics.inc("open_order_index.reloads")
+
+    def _build(self, orders):
+        self._orders = list(orders)
+        self._search_text = [((o.order_text or "").lower(), (o.location or "").lower()) for o in self._orders]
+        self._earliest = [o.earliest_pickup_time for o in self._orders]
+        self._max_span = max((o.latest_pickup_time - o.earliest_pickup_time for o in self._orders), default=timedelta(0))
+        self._query_cache.clear()
+        self._loaded_at = time.monotonic()
+
+    def orders(self, session):
+        """Returns the open orders sorted by earliest pickup time, reloading if stale."""
+        if self._is_stale():
+            self.load(session)
+        now = datetime.now(SGT)
+        return [o for o in self._orders if o.latest_pickup_time > now]
+
+    def search(self, session, query: str, limit: int = 20):
+        """
+        Returns open orders whose meal or location matches every word of the query.
+        Orders where a word prefix matches rank before plain substring matches.
+        """
+        if self._is_stale():
+            self.load(session)
+        key = " ".join(query.lower().split())
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            metrics.inc("open_order_index.query_cache", result="hit")
+            now = datetime.now(SGT)
+            return [o for o in cached if o.latest_pickup_time > now][:limit]
+        metrics.inc("open_order_index.query_cache", result="miss")
+
+        terms = key.split()
+        now = datetime.now(SGT)
+        prefix_matches, substring_matches = [], []
+        for order, (meal, location) in zip(self._orders, self._search_text):
+            if order.latest_pickup_time <= now:
+                continue
+            if not terms:
+                prefix_matches.append(order)
+                continue
+            words = meal.split() + location.split()
+            if all(any(word.startswith(term) for word in words) for term in terms):
+                prefix_matches.append(order)
+            elif all(term in meal or term in location for term in terms):
+                substring_matches.append(order)
+
+        results = prefix_matches + substring_matches
+        self._query_cache[key] = results
+        while len(self._query_cache) > self.cache_size:
+            self._query_cache.popitem(last=False)
+        return results[:limit]
+
+    def overlapping(self, session, start: datetime, end: datetime):
+        """
+        Returns open orders whose pickup window overlaps [start, end], soonest first.
+        An overlapping order starts no later than `end` and, since no window is longer
+        than the longest indexed one, no earlier than `start - max_span`; only that
+        slice of the sorted earliest times is scanned.
+        """
+        if self._is_stale():
+            self.load(session)
+        low = bisect.bisect_left(self._earliest, start - self._max_span)
+        high = bisect.bisect_right(self._earliest, end)
+        now = datetime.now(SGT)
+        return [
+            order for order in self._orders[low:high]
+            if order.latest_pickup_time >= start and order.latest_pickup_time > now
+        ]
+
+# Each tenant's open orders are indexed separately.
+open_order_index = TenantLocal(OpenOrderIndex)
@@ -0,0 +1,30 @@
+import time
+from collections import OrderedDict
+
+class TokenBucketLimiter:
+    """
+    One token bucket per key (e.g. per user), refilled continuously. `allow` is O(1);
+    the least recently seen keys are evicted once `max_keys` is exceeded, which is
+    safe because an evicted key simply starts again with a full bucket.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int = 10000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, last_refill)
+
+    def allow(self, key, cost: float = 1.0) -> bool:
+        now = time.monotonic()
+        tokens, last_refill = self._buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last_refill) * self.refill_per_second)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed
+
+    def __len__(self):
+        return len(self._buckets)
@@ -0,0 +1,133 @@
+import os
+import json
+import logging
+import functools
+from collections import namedtuple, defaultdict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Several campus bots can be served by one process, e.g.
+# BOT_TENANTS='[{"id": "smu", "token": "123:abc", "channel_id": "-1001", "zones": [...]},
+#               {"id": "ntu", "token": "456:def", "channel_id": "-1002"}]'
+# "zones" takes the same entries as ORDER_ZONES. Without BOT_TENANTS the process serves
+# a single tenant, DEFAULT_TENANT_ID, configured by TELEGRAM_TOKEN, CHANNEL_ID and ORDER_ZONES.
+DEFAULT_TENANT_ID = "default"
+
+Tenant = namedtuple("Tenant", ["id", "token", "channel_id", "zones"])
+
+def _load_tenants(raw: str):
+    if not raw:
+        return [Tenant(DEFAULT_TENANT_ID, os.getenv("TELEGRAM_TOKEN"), os.getenv("CHANNEL_ID"), os.getenv("ORDER_ZONES", ""))]
+    try:
+        tenants = [
+            Tenant(str(tenant["id"]), tenant["token"], str(tenant["channel_id"]), tenant.get("zones", []))
+            for tenant in json.loads(raw)
+        ]
+    except (ValueError, KeyError, TypeError) as e:
+        # Unlike a bad zone list, there is no sensible fallback for bot tokens.
+        raise ValueError(f"Invalid BOT_TENANTS: {e}") from e
+    if not tenants or len({tenant.id for tenant in tenants}) != len(tenants):
+        raise ValueError("BOT_TENANTS must list at least one tenant, each with a unique id")
+    return tenants
+
+TENANTS = _load_tenants(os.getenv("BOT_TENANTS", ""))
+_TENANTS_BY_ID = {tenant.id: tenant for tenant in TENANTS}
+
+# Tenant of the update or job currently being processed.
+_current_tenant = ContextVar("current_tenant", default=None)
+
+@contextmanager
+def tenant_scope(tenant_id: str):
+    """
+    Runs the block, and every task started from it, as `tenant_id`. Inside a scope,
+    queries only see that tenant's rows and in-memory state is the tenant's own.
+    """
+    if tenant_id not in _TENANTS_BY_ID:
+        raise KeyError(f"Unknown tenant {tenant_id!r}")
+    token = _current_tenant.set(tenant_id)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+def current_tenant_id():
+    """The scoped tenant's id, or None outside of any scope (e.g. maintenance scripts)."""
+    return _current_tenant.get()
+
+def current_tenant() -> Tenant:
+    """The scoped tenant. Unscoped code acts as the first configured tenant."""
+    return _TENANTS_BY_ID[_current_tenant.get() or TENANTS[0].id]
+
+def is_multi_tenant() -> bool:
+    return len(TENANTS) > 1
+
+def tenant_labels() -> dict:
+    """Metric labels of the scoped tenant."""
+    tenant_id = _current_tenant.get()
+    return {"tenant": tenant_id} if tenant_id else {}
+
+def per_tenant(job):
+    """
+    Wraps a scheduler job taking a bot so that one run covers every tenant in `bots`
+    ({tenant_id: bot}), each inside its own scope. A failing tenant does not stop the others.
+    """
+    @functools.wraps(job)
+    async def wrapper(bots, *args, **kwargs):
+        for tenant_id, bot in bots.items():
+            with tenant_scope(tenant_id):
+                try:
+                    await job(bot, *args, **kwargs)
+                except Exception:
+                    logging.exception(f"Job {job.__name__} failed for tenant {tenant_id}")
+    return wrapper
+
+class TenantDict(MutableMapping):
+    """Dict holding a separate set of keys per tenant; every access goes to the scoped tenant's."""
+
+    def __init__(self):
+        self._by_tenant = defaultdict(dict)
+
+    def _data(self) -> dict:
+        return self._by_tenant[current_tenant().id]
+
+    def __getitem__(self, key):
+        return self._data()[key]
+
+    def __setitem__(self, key, value):
+        self._data()[key] = value
+
+    def __delitem__(self, key):
+        del self._data()[key]
+
+    def __iter__(self):
+        return iter(self._data())
+
+    def __len__(self):
+        return len(self._data())
+
+class TenantLocal:
+    """
+    One instance of `factory()` per tenant, created on first use. Attribute access is
+    forwarded to the scoped tenant's instance, so callers use it like the instance itself.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instances = {}
+
+    def get(self):
+        tenant_id = current_tenant().id
+        instance = self._instances.get(tenant_id)
+        if instance is None:
+            instance = self._instances.setdefault(tenant_id, self._factory())
+        return instance
+
+    def instances(self):
+        return list(self._instances.values())
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
@@ -0,0 +1,97 @@
+import os
+import time
+from collections import OrderedDict
+from sqlalchemy import select, func
+
+from models.order_model import Order, OrderEvent
+from models.order_queries import orders_placed_by, orders_claimed_by
+from utils import metrics
+from utils.tenants import TenantLocal
+
+USER_VIEW_CACHE_SIZE = int(os.getenv("USER_VIEW_CACHE_SIZE", "5000"))
+# Writes made by other processes (e.g. expiry on the scheduler worker) are only
+# seen once an entry is this old, unless `sync` picks them up first.
+USER_VIEW_CACHE_TTL_SECONDS = float(os.getenv("USER_VIEW_CACHE_TTL_SECONDS", "60"))
+# How often fleet workers apply the order events logged by the other workers (see fleet.py).
+USER_VIEW_CACHE_SYNC_SECONDS = float(os.getenv("USER_VIEW_CACHE_SYNC_SECONDS", "2"))
+
+_LOADERS = {
+    "orders": orders_placed_by,
+    "claims": orders_claimed_by,
+}
+
+class UserViewCache:
+    """
+    Per-user copies of the "my orders" and "my claims" listings. Write paths call
+    `invalidate` for every user whose listing they change, after committing; repeat
+    views in between are served without touching the database.
+    """
+
+    def __init__(self, max_entries: int = USER_VIEW_CACHE_SIZE, ttl_seconds: float = USER_VIEW_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # (kind, user_id) -> (rows, loaded_at)
+        self._synced_event_id = None  # last order event applied by `sync`
+
+    def _get(self, kind: str, session, user_id):
+        key = (kind, user_id)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] <= self.ttl_seconds:
+            self._entries.move_to_end(key)
+            metrics.inc("user_view_cache.hits", kind=kind)
+            return entry[0]
+
+        metrics.inc("user_view_cache.misses", kind=kind)
+        rows = tuple(_LOADERS[kind](session, user_id))
+        self._entries[key] = (rows, time.monotonic())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return rows
+
+    def orders(self, session, user_id):
+        """Unexpired orders placed by the user."""
+        return self._get("orders", session, user_id)
+
+    def claims(self, session, user_id):
+        """Unexpired orders the user has claimed."""
+        return self._get("claims", session, user_id)
+
+    def invalidate(self, kind: str, *user_ids):
+        for user_id in user_ids:
+            if user_id is not None:
+                self._entries.pop((kind, user_id), None)
+
+    def sync(self, session) -> int:
+        """
+        Invalidates the listings touched by order events logged since the last call,
+        whichever process wrote them. Every status change logs an event, so this carries
+        invalidations between processes. An event that commits after a later-numbered
+        one has been synced is missed; the TTL still bounds how long that stays stale.
+        Returns the number of events applied.
+        """
+        if self._synced_event_id is None:
+            # Nothing cached can be trusted to predate the first sync, so start empty.
+            self._synced_event_id = session.execute(select(func.coalesce(func.max(OrderEvent.id), 0))).scalar_one()
+            self._entries.clear()
+            return 0
+        rows = session.execute(
+            select(OrderEvent.id, OrderEvent.actor_id, OrderEvent.runner_id, Order.user_id, Order.runner_id)
+            .join(Order, Order.id == OrderEvent.order_id)
+            .where(OrderEvent.id > self._synced_event_id)
+            .order_by(OrderEvent.id)
+        ).all()
+        for event_id, actor_id, event_runner_id, orderer_id, runner_id in rows:
+            self.invalidate("orders", orderer_id)
+            # A given-up claim has no runner left on the order; the runner is the actor.
+            self.invalidate("claims", event_runner_id, runner_id, actor_id)
+            self._synced_event_id = event_id
+        metrics.inc("user_view_cache.synced_events", len(rows))
+        return len(rows)
+
+    def __len__(self):
+        return len(self._entries)
+
+# A user of several campus bots has separate listings in each.
+user_view_cache = TenantLocal(UserViewCache)
+metrics.register_gauge("user_view_cache.entries", lambda: sum(len(cache) for cache in user_view_cache.instances()))
@@ -1,5 +1,14 @@
+import os
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
+# Telegram IDs allowed to use admin commands, e.g. ADMIN_IDS=12345,67890.
+# Shared across tenants: with BOT_TENANTS, these admins moderate every campus bot, while
+# /adminstats only shows the stats of the bot it is sent to.
+ADMIN_IDS = {int(admin_id) for admin_id in os.getenv("ADMIN_IDS", "").split(",") if admin_id.strip()}
+
+def is_admin(user_id) -> bool:
+    return user_id in ADMIN_IDS
+
 def get_main_menu():
     """Generates the main menu keyboard."""
     return InlineKeyboardMarkup([
@@ -12,6 +21,18 @@ def get_main_menu():
         [InlineKeyboardButton("Help", callback_data='help')]
     ])
 
+def get_order_received_keyboard(order_id):
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("✅ Order Received", callback_data=f"complete_order_{order_id}")],
+        [InlineKeyboardButton("Back", callback_data="start")]
+    ])
+
+def get_rating_keyboard(order_id):
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("⭐" * rating, callback_data=f"rate_runner_{order_id}_{rating}") for rating in range(1, 4)],
+        [InlineKeyboardButton("⭐" * rating, callback_data=f"rate_runner_{order_id}_{rating}") for rating in range(4, 6)]
+    ])
+
 def get_cancel_keyboard(user_id):
     return InlineKeyboardMarkup([
         [InlineKeyboardButton("Cancel Order", callback_data=f"cancel_order_{user_id}")]
@@ -0,0 +1,46 @@
+import json
+import logging
+
+from utils.tenants import TENANTS, current_tenant
+
+# Zones map pickup locations to the channel their orders are posted in, e.g.
+# ORDER_ZONES='[{"name": "SCIS", "channel_id": "-1001", "keywords": ["scis", "soe"]},
+#               {"name": "LKCSB", "channel_id": "-1002", "keywords": ["lkcsb", "business"]}]'
+# Locations that match no zone go to CHANNEL_ID. With BOT_TENANTS, each tenant has its
+# own zones and channel (see utils/tenants.py).
+
+def _load_zones(raw):
+    if not raw:
+        return []
+    try:
+        zones = json.loads(raw) if isinstance(raw, str) else raw
+    except ValueError as e:
+        logging.warning(f"Ignoring invalid ORDER_ZONES: {e}")
+        return []
+    return [
+        (zone["name"], str(zone["channel_id"]), [keyword.lower() for keyword in zone.get("keywords", [])])
+        for zone in zones
+    ]
+
+_ZONES_BY_TENANT = {tenant.id: _load_zones(tenant.zones) for tenant in TENANTS}
+
+def _zones():
+    return _ZONES_BY_TENANT[current_tenant().id]
+
+def default_channel_id():
+    return current_tenant().channel_id
+
+def zone_for_location(location: str):
+    """Returns (zone_name, channel_id) of the first zone with a keyword contained in the location."""
+    text = (location or "").lower()
+    for name, channel_id, keywords in _zones():
+        if any(keyword in text for keyword in keywords):
+            return name, channel_id
+    return None, default_channel_id()
+
+def order_channel_id(order):
+    """The channel an order was posted in. Orders from before zoning used CHANNEL_ID."""
+    return order.channel_id or default_channel_id()
+
+def all_channel_ids():
+    return {channel_id for _, channel_id, _ in _zones()} | {default_channel_id()}
@@ -7,6 +7,8 @@ WELCOME_TEXT = (
     "📌 /order - Place an order\n"
     "📌 /vieworders - See available food orders\n"
     "📌 /claim or /claim <order id> - Claim an order as a runner\n"
+    "📌 /search <words> - Search open orders by meal or details\n"
+    "📌 /free <from> <to> - Orders you can pick up in your free window\n"
     "📌 /help - Get assistance\n\n"
 
     "*Please ensure your Telegram chat is open to new contacts so that orderers/runners can communicate with you!*"
@@ -28,11 +30,25 @@ HELP_TEXT = (
         "📢 *Stay Updated:* Subscribe to our channel for real\-time updates on new orders: [Smuth Delivery](https://t\.me/smuth\_delivery)"
 )
 
+# Single-message order format
+QUICK_ORDER_FORMAT = (
+    "⚡ *Skip the steps:* send /order followed by all details in one message\n"
+    "```\n"
+    "Meal: Menu number 1 at King Kong Curry\n"
+    "Location: SCIS 1 SR 3-1\n"
+    "Earliest: 03-27 04:10pm\n"
+    "Latest: 03-27 05:00pm\n"
+    "Details: Extra cutlery please\n"
+    "Fee: 1.50\n"
+    "```"
+)
+
 # Order placement instructions
 ORDER_INSTRUCTIONS_MEAL = (
     "📝 *Placing an Order*. We will ask for delivery location, time, additional info and delivery fee next.\n\n"
     "📌 Enter: The *food* you want\n"
-    "✅ Example: *Menu number 1 at King Kong Curry*"
+    "✅ Example: *Menu number 1 at King Kong Curry*\n\n"
+    + QUICK_ORDER_FORMAT
 )
 
 ORDER_INSTRUCTIONS_LOCATION = (
@@ -72,7 +88,8 @@ ORDER_INSTRUCTIONS_FEE = (
 # Claim success notification
 CLAIM_SUCCESS_MESSAGE = (
     "✅ *Order {order_id} Successfully Claimed\!*\n\n"
-    "👤 *Orderer's Telegram Handle:* @{orderer_handle}\n\n"
+    "👤 *Orderer's Telegram Handle:* @{orderer_handle}\n"
+    "⭐ *Your Rating:* {runner_rating}\n\n"
     "📌 *Order Info:*\n"
     "🍽 *Meal:* {order_text}\n"
     "📍 *Location:* {order_location}\n"
@@ -95,7 +112,8 @@ ORDER_CLAIMED_NOTIFICATION = (
     "⏳ *Date/Time:* {order_time}\n"
     "ℹ️ *Details:* {order_details}\n"
     "💸 *Delivery Fee Offered:* ${delivery_fee}\n\n" 
-    "🚴 Claimed by: {claimed_by}\n\n"
+    "🚴 Claimed by: {claimed_by}\n"
+    "⭐ Runner rating: {runner_rating}\n\n"
     "📍 *Contact the runner for updates on delivery\!*"
 )
 
@@ -110,6 +128,15 @@ ORDER_COMPLETION_NOTIFICATION = (
     "*Order {order_id}* has been completed!"
 )
 
+# Rating prompt for the orderer after delivery
+RATE_RUNNER_PROMPT = (
+    "🎉 *Order {order_id}* has been marked as received!\n\n"
+    "⭐ How would you rate your runner?"
+)
+
+REVIEW_THANKS = "🙏 Thanks! You rated the runner for *Order {order_id}* {rating}/5."
+ALREADY_RATED = "You have already rated the runner for this order."
+
 # Order ID request prompt
 ORDER_ID_REQUEST = "🔍 Please enter the *Order ID* you want to claim:"
 
@@ -179,6 +206,17 @@ EDITED_ORDER = (
 )
 
 # No available orders message
+SEARCH_USAGE = "🔎 Usage: /search <words>, e.g. /search chicken rice"
+
+NO_SEARCH_RESULTS = "🔎 No open orders match *{query}*\\. Try fewer or different words\\."
+
+FREE_USAGE = (
+    "🕒 Usage: /free <from> <to> [location], e.g. /free 12:00pm 1:00pm SCIS\n"
+    "Times are today's; add a date (MM-DD 12:00pm) for another day."
+)
+
+NO_FREE_ORDERS = "🕒 No open orders fit your window right now\\. Try a wider window\\."
+
 NO_ORDERS_AVAILABLE = (
     "⏳ *No orders available right now!*\n\n"
     "💡 Check back later or place an order using /order."
@@ -19,6 +19,26 @@ def format_order_time(order) -> str:
         f"{order.latest_pickup_time.astimezone(SGT).strftime('%m-%d %I:%M%p')}"
     )
 
+def format_order_listing(order) -> str:
+    """One entry of an order list such as /vieworders or /search (MarkdownV2)."""
+    return (
+        f"📌 *Order ID:* {escape_markdown(str(order.id), version=2)}\n"
+        f"🍽 *Meal:* {escape_markdown(order.order_text, version=2)}\n"
+        f"📍 *Location:* {escape_markdown(order.location, version=2)}\n"
+        f"⏳ *Time:* {escape_markdown(format_order_time(order), version=2)}\n"
+        f"ℹ️ *Details:* {escape_markdown(order.details, version=2)}\n"
+        f"💸 *Delivery Fee:* ${escape_markdown(order.delivery_fee, version=2)}\n"
+    )
+
+def format_runner_rating(reputation) -> str:
+    if reputation is None or not reputation.review_count:
+        return "No reviews yet"
+    reviews = "review" if reputation.review_count == 1 else "reviews"
+    return (
+        f"{reputation.mean_rating:.1f}/5 ({reputation.review_count} {reviews}, "
+        f"recent {reputation.recent_mean_rating:.1f}/5)"
+    )
+
 def format_order_message(order, claim_status: str) -> str:
     return messages.NEW_ORDER.format(
         order_id=escape_markdown(str(order.id), version=2),